@@ -17,6 +17,9 @@ __email__           = 'team@projexsoftware.com'
 
 #------------------------------------------------------------------------------
 
+import bisect
+import math
+
 from projex.text import nativestring
 
 from projexui.qt.QtCore   import Qt,\
@@ -57,6 +60,83 @@ class XCalendarScene(QGraphicsScene):
         
         # create connections
     
+    def _gridIndex( self, grid ):
+        """
+        Generates a lookup index for the inputed date grid.  Each axis is 
+        stored as its start, cell size and count when the cells are evenly 
+        spaced, or as the sorted cell starts otherwise.
+        
+        :param      grid | {<int> key: ((<int> row, <int> col), <QRectF>), ..}
+        
+        :return     ({(<int> row, <int> col): <int> key, ..}, <axis>, <axis>)
+        """
+        cells = {}
+        cols  = {}
+        rows  = {}
+        
+        for key, ((row, col), rect) in grid.items():
+            cells[(row, col)] = key
+            cols[col] = (rect.left(), rect.width())
+            rows[row] = (rect.top(), rect.height())
+        
+        axes = []
+        for extents in (rows, cols):
+            extents = [extents[i] for i in sorted(extents)]
+            if not extents:
+                axes.append([])
+                continue
+            
+            start, size = extents[0]
+            regular = size > 0 and all(
+                abs(cell_start - (start + i * size)) < 1e-6 and
+                abs(cell_size - size) < 1e-6
+                for i, (cell_start, cell_size) in enumerate(extents))
+            
+            if regular:
+                axes.append((start, size, len(extents)))
+            else:
+                axes.append([cell_start for cell_start, _ in extents])
+        
+        return (cells, axes[0], axes[1])
+    
+    def _gridKeyAt( self, grid, index, point ):
+        """
+        Returns the grid key for the cell that contains the inputed point, \
+        calculating the row and column from the index rather than testing \
+        every cell.
+        
+        :param      grid  | {<int> key: ((<int>, <int>), <QRectF>), ..}
+                    index | <tuple> | from _gridIndex
+                    point | <QPoint> || <QPointF>
+        
+        :return     <int> || None
+        """
+        if not index:
+            return None
+        
+        cells, rows, cols = index
+        coords = []
+        for axis, value in ((rows, point.y()), (cols, point.x())):
+            # calculate the cell for an evenly spaced axis
+            if type(axis) == tuple:
+                start, size, count = axis
+                i = int(math.floor((value - start) / size))
+                i = min(i, count - 1)
+            
+            # lookup the cell for an irregular axis
+            else:
+                i = bisect.bisect_right(axis, value) - 1
+            
+            if i < 0:
+                return None
+            
+            coords.append(i)
+        
+        key = cells.get(tuple(coords))
+        if key is not None and grid[key][1].contains(point):
+            return key
+        return None
+    
     def addCalendarItem( self ):
         """
         Adds a new calendar item to the scene.
@@ -102,9 +182,10 @@ class XCalendarScene(QGraphicsScene):
         
         :param      point | <QPoint>
         """
-        for date, data in self._dateGrid.items():
-            if ( data[1].contains(point) ):
-                return QDate.fromJulianDay(date)
+        index = self._buildData.get('date_index')
+        date  = self._gridKeyAt(self._dateGrid, index, point)
+        if ( date is not None ):
+            return QDate.fromJulianDay(date)
         return QDate()
     
     def dateTimeAt( self, point ):
@@ -113,9 +194,10 @@ class XCalendarScene(QGraphicsScene):
         
         :param      point | <QPoint>
         """
-        for dtime, data in self._dateTimeGrid.items():
-            if ( data[1].contains(point) ):
-                return QDateTime.fromTime_t(dtime)
+        index = self._buildData.get('date_time_index')
+        dtime = self._gridKeyAt(self._dateTimeGrid, index, point)
+        if ( dtime is not None ):
+            return QDateTime.fromTime_t(dtime)
         return QDateTime()
     
     def dateRect( self, date ):
@@ -273,6 +355,11 @@ class XCalendarScene(QGraphicsScene):
                                       XCalendarScene.Mode.Day)):
             self.rebuildDays()
         
+        # index the grids for hit testing
+        self._buildData['date_index'] = self._gridIndex(self._dateGrid)
+        self._buildData['date_time_index'] = \
+                                        self._gridIndex(self._dateTimeGrid)
+        
         # rebuild the items in the scene
         items = sorted(self.items())
         for item in items:
@@ -14,9 +14,17 @@ __maintainer__      = 'Projex Software'
 __email__           = 'team@projexsoftware.com'
 
 import datetime
+import math
+
 from projexui.widgets.xchart.xchartaxis import XChartAxis
 
 class XDatetimeAxis(XChartAxis):
+    # the step sizes, in seconds, that a bounded range is aligned to
+    RangeSteps = (1, 5, 10, 15, 30,
+                  60, 300, 600, 900, 1800,
+                  3600, 10800, 21600, 43200,
+                  86400, 604800, 2592000, 31536000)
+    
     def __init__(self, *args, **kwds):
         super(XDatetimeAxis, self).__init__(*args, **kwds)
         
@@ -33,6 +41,40 @@ class XDatetimeAxis(XChartAxis):
         values.append(self.maximum())
         self.setValues(values)
     
+    def calculateBoundedRange(self, minimum, maximum):
+        """
+        Calculates the range of values for this axis based on the minimum \
+        and maximum dataset values.  The range is aligned outward to the \
+        closest step size for the label count, so appending values within \
+        the current range does not change the axis.
+        
+        :param      minimum | <datetime.datetime> || None
+                    maximum | <datetime.datetime> || None
+        """
+        if minimum is None or maximum is None:
+            self.reset()
+            return
+        
+        if isinstance(minimum, datetime.datetime):
+            epoch = datetime.datetime(1970, 1, 1, tzinfo=minimum.tzinfo)
+        else:
+            epoch = datetime.date(1970, 1, 1)
+        
+        count = self.maximumLabelCount() or 10
+        seconds = (maximum - minimum).total_seconds() / float(count)
+        for step in XDatetimeAxis.RangeSteps:
+            if seconds <= step:
+                break
+        
+        min_secs = math.floor((minimum - epoch).total_seconds() / step) * step
+        max_secs = math.ceil((maximum - epoch).total_seconds() / step) * step
+        if max_secs <= min_secs:
+            max_secs = min_secs + step
+        
+        self.setMinimum(epoch + datetime.timedelta(0, min_secs))
+        self.setMaximum(epoch + datetime.timedelta(0, max_secs))
+        self.reset()
+    
     def calculateValues(self):
         """
         Overloads the calculate values method to calculate the values for
@@ -47,6 +89,8 @@ class XDatetimeAxis(XChartAxis):
         max_labels = self.maximumLabelCount()
         seconds = (self.maximum() - self.minimum()).total_seconds()
         step = datetime.timedelta(0, int(round(float(seconds) / max_labels)))
+        if not step:
+            step = datetime.timedelta(0, 1)
         
         values = []
         value = self.minimum()
@@ -84,18 +128,53 @@ class XDatetimeAxis(XChartAxis):
         
         return perc
     
+    def percentsAt(self, values):
+        """
+        Returns the percentages for each of the inputed values between the \
+        minimum and maximum for this axis.
+        
+        :param      values | [<datetime.datetime>, ..]
+        
+        :return     [<float>, ..]
+        """
+        min_val = self.minimum()
+        max_val = self.maximum()
+        total_seconds = float((max_val - min_val).total_seconds())
+        
+        percs = []
+        for value in values:
+            if value < min_val:
+                percs.append(0.0)
+            elif max_val < value:
+                percs.append(1.0)
+            elif not total_seconds:
+                percs.append(0.0)
+            else:
+                value_seconds = (value - min_val).total_seconds()
+                percs.append(value_seconds / total_seconds)
+        
+        return percs
+    
     def sum(self, values):
         """
         Calculates the total values for the inputed values.
         
         :return     <int>
         """
-        values = sorted(values)
         try:
-            return (values[-1] - values[0]).total_seconds()
-        except IndexError, TypeError:
+            return (max(values) - min(values)).total_seconds()
+        except (ValueError, TypeError):
             return 0
     
+    def useBoundedRange(self):
+        """
+        Returns whether or not the dynamic range for this axis can be \
+        calculated from only the minimum and maximum dataset values.
+        
+        :return     <bool>
+        """
+        return True
+    
     def valueAt(self, percent):
         """
         Returns the value the percent represents between the minimum and
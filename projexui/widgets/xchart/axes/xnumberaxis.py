@@ -16,6 +16,11 @@ __email__           = 'team@projexsoftware.com'
 from projex.text import nativestring
 from projexui.widgets.xchart.xchartaxis import XChartAxis
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class XNumberAxis(XChartAxis):
     def __init__(self, *args, **kwds):
         # setup default numeric options
@@ -29,24 +34,20 @@ class XNumberAxis(XChartAxis):
         # define custom properties
         self._roundTo = kwds.get('roundTo', None)
     
-    def calculateRange(self, values):
+    def calculateBoundedRange(self, minimum, maximum):
         """
-        Calculates the range of values for this axis based on the dataset
-        value amount.
+        Calculates the range of values for this axis based on the minimum \
+        and maximum dataset values.
         
-        :param      values | [<variant>, ..]
+        :param      minimum | <int> || <float> || None
+                    maximum | <int> || <float> || None
         """
-        vals = filter(lambda x: x is not None, values)
-        
-        try:
-            min_val = min(min(vals), 0)
-        except ValueError:
+        if minimum is None or maximum is None:
             min_val = 0
-        
-        try:
-            max_val = max(max(vals), 0)
-        except ValueError:
             max_val = 10
+        else:
+            min_val = min(minimum, 0)
+            max_val = max(maximum, 0)
         
         ndigits  = max(len(nativestring(abs(int(min_val)))), len(nativestring(abs(int(max_val)))))
         rounding = 10 ** (ndigits - 1)
@@ -56,6 +57,29 @@ class XNumberAxis(XChartAxis):
         self.setMaximum(self.rounded(max_val, rounding))
         self.reset()
     
+    def calculateRange(self, values):
+        """
+        Calculates the range of values for this axis based on the dataset
+        value amount.
+        
+        :param      values | [<variant>, ..]
+        """
+        min_val = None
+        max_val = None
+        
+        # determine the bounds in a single pass
+        for value in values:
+            if value is None:
+                continue
+            elif min_val is None:
+                min_val = max_val = value
+            elif value < min_val:
+                min_val = value
+            elif max_val < value:
+                max_val = value
+        
+        self.calculateBoundedRange(min_val, max_val)
+    
     def calculateValues(self):
         """
         Overloads the calculate values method to calculate the values for
@@ -87,6 +111,18 @@ class XNumberAxis(XChartAxis):
         
         return values
     
+    def datasetPercents(self, dataset):
+        """
+        Returns the percentages for all of the values of the inputed \
+        dataset along this axis, using the dataset's numpy array when \
+        numpy is available.
+        
+        :param      dataset | <XChartDataset>
+        
+        :return     <numpy.ndarray> || [<float>, ..]
+        """
+        return self.percentsAt(dataset.array(self.name()))
+    
     def percentAt(self, value):
         """
         Returns the percentage the value represents between the minimum and
@@ -129,6 +165,77 @@ class XNumberAxis(XChartAxis):
         except (ZeroDivisionError, TypeError, ValueError):
             return 0.0
     
+    def percentsAt(self, values):
+        """
+        Returns the percentages for each of the inputed values between the \
+        minimum and maximum for this axis.  Numpy arrays are mapped in a \
+        single vectorized pass.
+        
+        :param      values | [<int> || <float>, ..] || <numpy.ndarray>
+        
+        :return     [<float>, ..] || <numpy.ndarray>
+        """
+        min_val = self.minimum()
+        max_val = self.maximum()
+        
+        # round the max value to sync with the values in the grid
+        try:
+            span = float(self.rounded(max_val) - min_val)
+        except TypeError:
+            return super(XNumberAxis, self).percentsAt(values)
+        
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            with numpy.errstate(invalid='ignore', divide='ignore'):
+                if span:
+                    percs = numpy.clip((values - min_val) / span, 0.0, 1.0)
+                else:
+                    percs = numpy.zeros(len(values))
+                
+                percs[max_val < values] = 1.0
+                percs[numpy.isnan(values)] = 0.0
+            return percs
+        
+        percs = []
+        try:
+            for value in values:
+                if value < min_val:
+                    percs.append(0.0)
+                elif max_val < value:
+                    percs.append(1.0)
+                elif not span:
+                    percs.append(0.0)
+                else:
+                    percs.append(max(min((value - min_val) / span, 1.0), 0.0))
+        except TypeError:
+            return super(XNumberAxis, self).percentsAt(values)
+        
+        return percs
+    
+    def percentsOfTotal(self, values):
+        """
+        Calculates the percent each of the inputed values is in relation \
+        to the total of all the values.
+        
+        :param      values | [<variant>, ..]
+        
+        :return     [<float>, ..]
+        """
+        try:
+            total = float(sum(values))
+        except (TypeError, ValueError):
+            total = 0
+        
+        if not total:
+            return [0.0] * len(values)
+        
+        percs = []
+        for value in values:
+            try:
+                percs.append(float(value) / total)
+            except (TypeError, ValueError):
+                percs.append(0.0)
+        return percs
+    
     def rounded(self, number, roundto=None):
         """
         Rounds the inputed number to the nearest value.
@@ -169,6 +276,15 @@ class XNumberAxis(XChartAxis):
         """
         self._roundTo = value
     
+    def useBoundedRange(self):
+        """
+        Returns whether or not the dynamic range for this axis can be \
+        calculated from only the minimum and maximum dataset values.
+        
+        :return     <bool>
+        """
+        return True
+    
     def sum(self, values):
         """
         Calculates the total values for the inputed values.
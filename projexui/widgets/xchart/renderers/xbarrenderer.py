@@ -53,13 +53,22 @@ class XBarRenderer(XChartRenderer):
         rect = self.buildData('axis_rect')
         half_size = self.maximumBarSize() / 2.0
         
+        # only keep the tallest bar per pixel for large datasets
+        if self.orientation() == Qt.Vertical:
+            decimation = self.Decimation.Minimum
+        else:
+            decimation = self.Decimation.Maximum
+        
         for dataset, item in items.items():
             path = QPainterPath()
             subpaths = []
             
-            for value in dataset.values():
-                pos = self.pointAt(axes, value)
-                
+            points = self.pointsAt(axes,
+                                   dataset,
+                                   decimation=decimation,
+                                   orientation=self.orientation())
+            
+            for pos in points:
                 radius = min(rect.bottom() - pos.y(), 8)
                 
                 subpath = QPainterPath()
@@ -89,6 +98,7 @@ class XBarRenderer(XChartRenderer):
             
             item.setPath(path)
             item.setBuildData('subpaths', subpaths)
+            item.setBuildData('orientation', self.orientation())
     
     def drawItem(self, item, painter, option):
         """
@@ -19,7 +19,11 @@ __email__           = 'team@projexsoftware.com'
 #------------------------------------------------------------------------------
 
 from projexui.qt.QtCore import Qt, QPointF
-from projexui.qt.QtGui import QPen, QApplication, QColor, QPainterPath
+from projexui.qt.QtGui import QPen,\
+                               QApplication,\
+                               QColor,\
+                               QPainterPath,\
+                               QPolygonF
 
 from ..xchartrenderer import XChartRenderer
 
@@ -46,27 +50,33 @@ class XLineRenderer(XChartRenderer):
             scene.clear()
             return
         
-        rect = self.buildData('axis_rect')
-        
         for dataset, item in items.items():
-            first = True
-            pos = None
-            home = None
-            ellipses = []
-            
-            path = QPainterPath()
-            for value in dataset.values():
-                pos = self.pointAt(axes, value)
-                ellipses.append(pos)
-                
-                if first:
-                    path.moveTo(pos)
-                    first = False
-                else:
-                    path.lineTo(pos)
-            
-            item.setPath(path)
-            item.setBuildData('ellipses', ellipses)
+            self.calculateDatasetItem(item, axes, dataset)
+    
+    def calculateDatasetItem(self, item, axes, dataset):
+        """
+        Rebuilds the path for the inputed dataset item.
+        
+        :param      item    | <XChartDatasetItem>
+                    axes    | [<XChartAxis>, ..]
+                    dataset | <XChartDataset>
+        """
+        ellipses = self.pointsAt(axes,
+                                 dataset,
+                                 decimation=self.Decimation.MinMax)
+        
+        path = QPainterPath()
+        if ellipses:
+            path.moveTo(ellipses[0])
+            for pos in ellipses[1:]:
+                path.lineTo(pos)
+        
+        item.setPath(path)
+        item.setBuildData('ellipses', ellipses)
+        item.setBuildData('count', dataset.count())
+        item.setBuildData('offset', dataset.offset())
+        item.setBuildData('decimated', len(ellipses) != dataset.count())
+        item.setBuildData('point_radius', self.pointRadius())
     
     def drawItem(self, item, painter, option):
         """
@@ -102,6 +112,57 @@ class XLineRenderer(XChartRenderer):
         
         painter.restore()
     
+    def extendDatasets(self, scene, axes, datasets):
+        """
+        Extends the paths for the inputed datasets with only the points \
+        that have been appended since they were last built.  Points dropped \
+        by a sliding window are removed from the head of the path without \
+        mapping the remaining values again.
+        
+        :param      scene    | <XChartScene>
+                    axes     | [<XChartAxis>, ..]
+                    datasets | [<XChartDataset>, ..]
+        """
+        items = scene.datasetItems()
+        
+        for dataset in datasets:
+            item = items.get(dataset)
+            if item is None:
+                super(XLineRenderer, self).extendDatasets(scene, axes, datasets)
+                return
+            
+            built = item.buildData('count', 0)
+            dropped = dataset.offset() - item.buildData('offset', 0)
+            start = built - dropped
+            ellipses = item.buildData('ellipses')
+            
+            if not built or ellipses is None or \
+               item.buildData('decimated') or \
+               dropped < 0 or not (0 <= start <= dataset.count()):
+                self.calculateDatasetItem(item, axes, dataset)
+                continue
+            
+            points = self.pointsAt(axes, dataset, start=start)
+            
+            # drop the head segments that left the sliding window
+            if dropped:
+                del ellipses[:dropped]
+                ellipses.extend(points)
+                
+                path = QPainterPath()
+                if ellipses:
+                    path.addPolygon(QPolygonF(ellipses))
+            else:
+                path = item.path()
+                for pos in points:
+                    path.lineTo(pos)
+                ellipses.extend(points)
+            
+            item.setPath(path)
+            item.setBuildData('ellipses', ellipses)
+            item.setBuildData('count', dataset.count())
+            item.setBuildData('offset', dataset.offset())
+    
     def pointRadius(self):
         """
         Returns the point radius for this renderer.
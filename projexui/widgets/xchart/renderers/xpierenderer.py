@@ -75,6 +75,8 @@ class XPieRenderer(XChartRenderer):
         if not per_dataset:
             all_values = [dataset.sum(data_axis) \
                           for dataset in datasets]
+            all_percs = dict(zip(datasets,
+                                 data_axis.percentsOfTotal(all_values)))
         
         # generate the build information
         rect = self.buildData('grid_rect')
@@ -120,11 +122,9 @@ class XPieRenderer(XChartRenderer):
             path = QPainterPath()
             if per_dataset:
                 data_values = dataset.values(yaxis.name())
-                andle = 0
-                for value in dataset.values():
-                    perc = yaxis.percentOfTotal(value.get(yaxis.name()),
-                                                data_values)
-                    
+                percs = yaxis.percentsOfTotal(data_values)
+                keys = dataset.values(xaxis.name())
+                for key, perc in zip(keys, percs):
                     # calculate the angle as the perc
                     item_angle = perc * 360
                     
@@ -134,7 +134,7 @@ class XPieRenderer(XChartRenderer):
                     subpath.lineTo(cx, cy)
                     
                     path.addPath(subpath)
-                    subpaths.append((value.get(xaxis.name()), subpath))
+                    subpaths.append((key, subpath))
                     
                     angle += item_angle
                     
@@ -145,7 +145,7 @@ class XPieRenderer(XChartRenderer):
                 y += deltay
             else:
                 value = dataset.sum(data_axis)
-                perc = data_axis.percentOfTotal(value, all_values)
+                perc = all_percs[dataset]
                 
                 # calculate the angle as the perc
                 item_angle = perc * 360
@@ -21,7 +21,7 @@ from xml.etree import ElementTree
 from projex.text import nativestring
 
 from projexui.qt import Property, wrapVariant, unwrapVariant, Signal
-from projexui.qt.QtCore import Qt, QSize, QPoint
+from projexui.qt.QtCore import Qt, QSize, QPoint, QTimer
 from projexui.qt.QtGui import QFrame,\
                               QPalette,\
                               QScrollBar,\
@@ -106,6 +106,12 @@ class XChart(QFrame):
         self._showColumns = True
         self._showXAxis = True
         self._showYAxis = True
+        self._appended = {}
+        
+        # coalesce appended points into one update per event loop
+        self._appendTimer = QTimer(self)
+        self._appendTimer.setSingleShot(True)
+        self._appendTimer.setInterval(0)
         
         # set default properties
         self.uiChartVIEW.setScene(XChartScene(self))
@@ -150,6 +156,7 @@ class XChart(QFrame):
         y_bar.valueChanged.connect(self.syncScrollbars)
         y_bar.rangeChanged.connect(self.syncScrollbars)
         self.uiTypeBTN.triggered.connect(self.assignRenderer)
+        self._appendTimer.timeout.connect(self._extendDatasets)
     
     def _addDatasetAction(self, dataset):
         """
@@ -203,6 +210,55 @@ class XChart(QFrame):
                                            self.showColumns(),
                                            self.showRows())
     
+    def _extendDatasets(self):
+        """
+        Updates the chart for the points appended since the last update.  \
+        The axes are recalculated from the cached dataset bounds and, when \
+        they are unchanged, the renderer only extends the appended datasets.
+        """
+        starts = self._appended
+        self._appended = {}
+        
+        appended = [dataset for dataset in self.datasets() \
+                    if dataset in starts]
+        
+        if not appended:
+            return
+        elif self._dataChanged or not (self.isVisible() and self.renderer()):
+            self._dataChanged = True
+            self.recalculate()
+            return
+        
+        changed = False
+        for axis in self.axes():
+            if not axis.useDynamicRange():
+                continue
+            
+            # recalculate bounded axes from the running dataset bounds
+            if axis.useBoundedRange():
+                before = (axis.minimum(), axis.maximum(), axis.values())
+                axis.calculateBoundedRange(*self.bounds(axis.name()))
+                if before != (axis.minimum(), axis.maximum(), axis.values()):
+                    changed = True
+                continue
+            
+            # other axes only change when a new value is appended, or when
+            # a sliding window drops values
+            for dataset in appended:
+                start = starts[dataset] - dataset.offset()
+                values = dataset.tail(axis.name(), max(start, 0))
+                if start < 0 or any(axis.indexOf(value) is None
+                                    for value in values):
+                    changed = True
+                    break
+        
+        if changed:
+            self.recalculate()
+        else:
+            chart_scene = self.uiChartVIEW.scene()
+            self.renderer().extendDatasets(chart_scene, self.axes(), appended)
+            chart_scene.invalidate()
+    
     def addAxis(self, axis):
         """
         Adds a new axis for this chart.  Axis can define X & Y data
@@ -232,6 +288,33 @@ class XChart(QFrame):
         """
         self.uiToolbarHBOX.addWidget(widget)
     
+    def appendPoint(self, dataset, **points):
+        """
+        Appends a point to the inputed dataset.  The chart will be updated \
+        incrementally once control returns to the event loop, so many \
+        points can be appended to several datasets at once.
+        
+        :param      dataset  | <XChartDataset>
+                    **points | axis_name=value
+        """
+        self.appendPoints(dataset, [points])
+    
+    def appendPoints(self, dataset, points):
+        """
+        Appends the inputed points to the dataset.  The chart will be \
+        updated incrementally once control returns to the event loop.
+        
+        :param      dataset | <XChartDataset>
+                    points  | [{<str> axis: <variant> value, ..}, ..]
+        """
+        self._appended.setdefault(dataset,
+                                  dataset.offset() + dataset.count())
+        
+        for point in points:
+            dataset.plot(**point)
+        
+        self._appendTimer.start()
+    
     def assignRenderer(self, action):
         """
         Assigns the renderer for this chart to the current selected
@@ -286,6 +369,29 @@ class XChart(QFrame):
         self.uiDatasetTBAR.clear()
         self.uiChartVIEW.scene().clear()
     
+    def bounds(self, axis):
+        """
+        Returns the minimum and maximum values of the given axis from all \
+        the datasets within this chart, using each dataset's cached bounds.
+        
+        :param      axis | <str>
+        
+        :return     (<variant> minimum, <variant> maximum)
+        """
+        min_val = None
+        max_val = None
+        for dataset in self.datasets():
+            dmin, dmax = dataset.bounds(axis)
+            if dmin is None:
+                continue
+            elif min_val is None:
+                min_val, max_val = dmin, dmax
+            else:
+                min_val = min(min_val, dmin)
+                max_val = max(max_val, dmax)
+        
+        return min_val, max_val
+    
     def chartTitle(self):
         """
         Returns the title for this plot.
@@ -376,7 +482,11 @@ class XChart(QFrame):
         # update dynamic range
         if self._dataChanged:
             for axis in self.axes():
-                if axis.useDynamicRange():
+                if not axis.useDynamicRange():
+                    continue
+                elif axis.useBoundedRange():
+                    axis.calculateBoundedRange(*self.bounds(axis.name()))
+                else:
                     axis.calculateRange(self.values(axis.name()))
             
             self._dataChanged = False
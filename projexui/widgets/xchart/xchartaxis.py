@@ -23,6 +23,13 @@ from projexui.qt.QtGui import QApplication, QFontMetrics
 
 class XChartAxis(object):
     """ """
+    # shared caches for formatted label text and font measurements
+    _labelCache = {}
+    _widthCache = {}
+    _heightCache = {}
+    
+    CacheSize = 4096
+    
     def __init__(self, name, **options):
         # define custom properties
         self._name        = name
@@ -33,6 +40,8 @@ class XChartAxis(object):
         self._minimum     = options.get('minimum', None)
         self._maximum     = options.get('maximum', None)
         self._values      = options.get('values', None)
+        self._valueIndex  = None
+        self._labelWidth  = None
         self._labels      = options.get('labels', None)
         self._labelFont   = options.get('labelFont', QApplication.font())
         self._labelFormat = options.get('labelFormat', '{0}')
@@ -55,6 +64,19 @@ class XChartAxis(object):
         titleFont.setBold(True)
         self._titleFont = options.get('titleFont', titleFont)
     
+    def calculateBoundedRange(self, minimum, maximum):
+        """
+        Calculates the range of values for this axis based on the minimum \
+        and maximum dataset values.  This is used in place of the \
+        calculateRange method when useBoundedRange returns True.
+        
+        :param      minimum | <variant> || None
+                    maximum | <variant> || None
+        """
+        self.setMinimum(minimum)
+        self.setMaximum(maximum)
+        self.reset()
+    
     def calculateRange(self, values):
         """
         Calculates the range of values for this axis based on the dataset
@@ -63,8 +85,14 @@ class XChartAxis(object):
         :param      values | [<variant>, ..]
         """
         self.reset()
-        self._values = list(set(values))
-        self._values.sort(key=lambda x: values.index(x))
+        
+        # preserve the order of the first occurrence of each value
+        seen = set()
+        self._values = []
+        for value in values:
+            if not value in seen:
+                seen.add(value)
+                self._values.append(value)
     
     def calculateValues(self):
         """
@@ -86,6 +114,43 @@ class XChartAxis(object):
         """
         return self._chart
     
+    def datasetPercents(self, dataset):
+        """
+        Returns the percentages for all of the values of the inputed \
+        dataset along this axis.
+        
+        :param      dataset | <XChartDataset>
+        
+        :return     [<float>, ..]
+        """
+        return self.percentsAt(dataset.values(self.name()))
+    
+    def formatLabel(self, value):
+        """
+        Returns the label text for the inputed value using this axis' label \
+        format.  Text is cached per value and format, so recalculating the \
+        chart does not reformat values that have been seen before.
+        
+        :param      value | <variant>
+        
+        :return     <str>
+        """
+        key = (type(value), value, self.labelFormat())
+        cache = XChartAxis._labelCache
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return self.labelFormat().format(value)
+        
+        if len(cache) > XChartAxis.CacheSize:
+            cache.clear()
+        
+        text = self.labelFormat().format(value)
+        cache[key] = text
+        return text
+    
     def horizontalLabelPadding(self):
         """
         Returns the padding for the horizontal direction for the labels on
@@ -95,6 +160,32 @@ class XChartAxis(object):
         """
         return self._hLabelPad
     
+    def indexOf(self, value):
+        """
+        Returns the index of the inputed value within this axis' values, \
+        using a lookup table that is cached until the values change.
+        
+        :param      value | <variant>
+        
+        :return     <int> || None
+        """
+        values = self.values()
+        if self._valueIndex is None:
+            self._valueIndex = {}
+            for i, val in enumerate(values):
+                try:
+                    self._valueIndex.setdefault(val, i)
+                except TypeError:
+                    continue
+        
+        try:
+            return self._valueIndex.get(value)
+        except TypeError:
+            try:
+                return values.index(value)
+            except ValueError:
+                return None
+    
     def isDynamicScalingEnabled(self):
         """
         Returns whether or not this axis supports dynamic scaling of its value
@@ -112,7 +203,7 @@ class XChartAxis(object):
         :return     [<str>, ..]
         """
         if self._labels is None:
-            self._labels = map(self.labelFormat().format, self.values())
+            self._labels = map(self.formatLabel, self.values())
         return self._labels
     
     def labelCount(self):
@@ -177,14 +268,39 @@ class XChartAxis(object):
     def minimumLabelWidth(self):
         """
         Returns the minimum label width required on this renderers font size.
+        The widest label is cached until the labels or font change, and each \
+        label's width is cached per font.
         
         :param      labels | [<str>, ..]
         """
-        min_w = 0
-        metrics = QFontMetrics(self.labelFont())
-        for label in self.labels():
-            min_w = max(min_w, metrics.width(label))
+        labels = self.labels()
+        font = self.labelFont()
+        font_key = font.key()
+        
+        if self._labelWidth is not None:
+            cached_labels, cached_key, min_w = self._labelWidth
+            if cached_labels is labels and cached_key == font_key:
+                return max(self._minimumLabelWidth,
+                           min_w + self.horizontalLabelPadding())
         
+        cache = XChartAxis._widthCache
+        if len(cache) > XChartAxis.CacheSize:
+            cache.clear()
+        
+        min_w = 0
+        metrics = None
+        for label in labels:
+            key = (label, font_key)
+            try:
+                width = cache[key]
+            except KeyError:
+                if metrics is None:
+                    metrics = QFontMetrics(font)
+                width = cache[key] = metrics.width(label)
+            
+            min_w = max(min_w, width)
+        
+        self._labelWidth = (labels, font_key, min_w)
         return max(self._minimumLabelWidth,
                    min_w + self.horizontalLabelPadding())
     
@@ -193,9 +309,15 @@ class XChartAxis(object):
         Returns the minimum height that will be required based on this font size
         and labels list.
         """
-        metrics = QFontMetrics(self.labelFont())
+        font = self.labelFont()
+        try:
+            height = XChartAxis._heightCache[font.key()]
+        except KeyError:
+            height = QFontMetrics(font).height()
+            XChartAxis._heightCache[font.key()] = height
+        
         return max(self._minimumLabelHeight,
-                   metrics.height() + self.verticalLabelPadding())
+                   height + self.verticalLabelPadding())
     
     def name(self):
         """
@@ -228,12 +350,12 @@ class XChartAxis(object):
         if value is None:
             return 0.0
         
-        values = self.values()
+        index = self.indexOf(value)
+        if index is None:
+            return 0.0
         
         try:
-            return float(values.index(value)) / (len(values) - 1)
-        except ValueError:
-            return 0.0
+            return float(index) / (len(self.values()) - 1)
         except ZeroDivisionError:
             return 1.0
     
@@ -252,12 +374,47 @@ class XChartAxis(object):
         except (ZeroDivisionError, ValueError):
             return 0.0
     
+    def percentsAt(self, values):
+        """
+        Returns the percentages for each of the inputed values, as the \
+        percentAt method would calculate them.
+        
+        :param      values | [<variant>, ..]
+        
+        :return     [<float>, ..]
+        """
+        percentAt = self.percentAt
+        return [percentAt(value) for value in values]
+    
+    def percentsOfTotal(self, values):
+        """
+        Calculates the percent each of the inputed values is in relation \
+        to the whole list of values in a single pass.
+        
+        :param      values | [<variant>, ..]
+        
+        :return     [<float>, ..]
+        """
+        if not values:
+            return []
+        
+        count = float(len(values))
+        index = {}
+        for i, value in enumerate(values):
+            try:
+                index.setdefault(value, i)
+            except TypeError:
+                return [self.percentOfTotal(val, values) for val in values]
+        
+        return [(index[value] + 1) / count for value in values]
+    
     def reset(self):
         """
         Resets the information for this axis to the default values.
         """
         self._values      = None
         self._labels      = None
+        self._valueIndex  = None
         
     def setChart(self, chart):
         """
@@ -411,6 +568,7 @@ class XChartAxis(object):
         :param      values | [<variant>, ..] || None
         """
         self._values = values
+        self._valueIndex = None
     
     def setVerticalLabelPadding(self, padding):
         """
@@ -463,6 +621,15 @@ class XChartAxis(object):
         """
         return -1
     
+    def useBoundedRange(self):
+        """
+        Returns whether or not the dynamic range for this axis can be \
+        calculated from only the minimum and maximum dataset values.
+        
+        :return     <bool>
+        """
+        return False
+    
     def useDynamicRange(self):
         """
         Returns whether or not to use a dynamic range calculation for the
@@ -17,25 +17,170 @@ __email__           = 'team@projexsoftware.com'
 
 #------------------------------------------------------------------------------
 
+import itertools
 import random
 
 from projex.text import nativestring
 from projexui.qt.QtGui import QColor
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class XChartDataset(object):
-    """ """
+    """
+    Stores the plotted points for a chart as columns of values per axis, \
+    caching the bounds of each axis so the chart can calculate its ranges \
+    without rescanning the data.
+    """
     def __init__(self, **options):
         # define custom properties
         self._name        = options.get('name', '')
         self._color       = QColor(options.get('color', self.randomColor()))
         self._colorMap    = {}
-        self._plot        = options.get('plot', [])
         self._visible     = True
         self._dragData    = {}
+        self._decimated   = options.get('decimationEnabled', True)
+        
+        # define the columnar storage
+        self._columns     = {}
+        self._count       = 0
+        self._offset      = 0
+        self._head        = 0
+        self._maximumCount = options.get('maximumCount', 0)
+        self._points      = None
+        self._bounds      = {}
+        self._arrays      = {}
+        
+        for point in options.get('plot', []):
+            self.plot(**point)
     
     def __len__(self):
         return self.count()
     
+    def _compact(self):
+        """
+        Deletes the trimmed points that are still held at the start of the \
+        columns.
+        """
+        head = self._head
+        if not head:
+            return
+        
+        for column in self._columns.values():
+            del column[:head]
+        
+        if self._points is not None:
+            del self._points[:head]
+        
+        self._head = 0
+    
+    def _trim(self):
+        """
+        Removes the oldest points from this dataset until it fits within \
+        its maximum count.  The removed points are only skipped over, and \
+        are deleted in chunks once they outnumber the window.
+        """
+        excess = self._count - self._maximumCount
+        if not self._maximumCount or excess <= 0:
+            return
+        
+        head = self._head
+        for key, column in self._columns.items():
+            removed = column[head:head + excess]
+            
+            # only rescan the bounds when an extreme value was removed
+            bounds = self._bounds.get(key)
+            if bounds and (bounds[0] in removed or bounds[1] in removed):
+                del self._bounds[key]
+        
+        self._head += excess
+        self._count -= excess
+        self._offset += excess
+        self._arrays.clear()
+        
+        if self._maximumCount <= self._head:
+            self._compact()
+    
+    def array(self, axis):
+        """
+        Returns the values for the given axis as a floating point numpy \
+        array when numpy is available and the values are numeric, otherwise \
+        the plain list of values is returned.  Missing values will be nan.
+        
+        :param      axis | <str>
+        
+        :return     <numpy.ndarray> || [<variant>, ..]
+        """
+        values = self.values(axis)
+        if numpy is None:
+            return values
+        
+        try:
+            return self._arrays[axis]
+        except KeyError:
+            pass
+        
+        try:
+            array = numpy.array(values, dtype=float)
+        except (TypeError, ValueError):
+            array = values
+        
+        self._arrays[axis] = array
+        return array
+    
+    def axisNames(self):
+        """
+        Returns the names of the axes that have values in this dataset.
+        
+        :return     [<str>, ..]
+        """
+        return self._columns.keys()
+    
+    def bounds(self, axis):
+        """
+        Returns the minimum and maximum values for the given axis, ignoring \
+        any None values.  The bounds are cached and updated as points are \
+        plotted.
+        
+        :param      axis | <str>
+        
+        :return     (<variant> minimum, <variant> maximum)
+        """
+        try:
+            return self._bounds[axis]
+        except KeyError:
+            pass
+        
+        min_val = None
+        max_val = None
+        column = self._columns.get(axis, [])
+        for value in itertools.islice(column, self._head, None):
+            if value is None:
+                continue
+            elif min_val is None:
+                min_val = max_val = value
+            elif value < min_val:
+                min_val = value
+            elif max_val < value:
+                max_val = value
+        
+        self._bounds[axis] = (min_val, max_val)
+        return self._bounds[axis]
+    
+    def clear(self):
+        """
+        Clears all of the points from this dataset.
+        """
+        self._columns.clear()
+        self._bounds.clear()
+        self._arrays.clear()
+        self._count = 0
+        self._offset = 0
+        self._head = 0
+        self._points = None
+    
     def color(self, key=None):
         """
         Returns the color for this data set.
@@ -52,7 +197,7 @@ class XChartDataset(object):
         
         :return     <int>
         """
-        return len(self._plot)
+        return self._count
     
     def dragData(self, key=None, default=None):
         """
@@ -81,6 +226,15 @@ class XChartDataset(object):
                       random.randint(90, 200),
                       random.randint(90, 200))
     
+    def isDecimationEnabled(self):
+        """
+        Returns whether or not renderers are allowed to reduce the points \
+        drawn for this dataset when it has more points than pixels.
+        
+        :return     <bool>
+        """
+        return self._decimated
+    
     def isVisible(self):
         """
         Returns whether or not this dataset is visible.
@@ -89,6 +243,35 @@ class XChartDataset(object):
         """
         return self._visible
     
+    def maximum(self, axis):
+        """
+        Returns the maximum value for the given axis.
+        
+        :param      axis | <str>
+        
+        :return     <variant> || None
+        """
+        return self.bounds(axis)[1]
+    
+    def maximumCount(self):
+        """
+        Returns the maximum number of points this dataset will hold before \
+        dropping its oldest points.  A value of 0 means it is unlimited.
+        
+        :return     <int>
+        """
+        return self._maximumCount
+    
+    def minimum(self, axis):
+        """
+        Returns the minimum value for the given axis.
+        
+        :param      axis | <str>
+        
+        :return     <variant> || None
+        """
+        return self.bounds(axis)[0]
+    
     def name(self):
         """
         Returns the name for this dataset to the inputed name.
@@ -97,13 +280,57 @@ class XChartDataset(object):
         """
         return self._name
     
+    def offset(self):
+        """
+        Returns the number of points that have been dropped from the start \
+        of this dataset by its sliding window since it was last cleared.
+        
+        :return     <int>
+        """
+        return self._offset
+    
     def plot(self, **points):
         """
         Plots a given value at the given point.
         
         :param      **kwds | axis_name=value
         """
-        self._plot.append(points)
+        count = self._head + self._count
+        for key in points:
+            if not key in self._columns:
+                self._columns[key] = [None] * count
+        
+        for key, column in self._columns.items():
+            value = points.get(key)
+            column.append(value)
+            
+            # update the cached bounds
+            if value is None or not key in self._bounds:
+                continue
+            
+            min_val, max_val = self._bounds[key]
+            if min_val is None:
+                self._bounds[key] = (value, value)
+            elif value < min_val:
+                self._bounds[key] = (value, max_val)
+            elif max_val < value:
+                self._bounds[key] = (min_val, value)
+        
+        self._count += 1
+        self._arrays.clear()
+        if self._points is not None:
+            self._points.append(points)
+        
+        self._trim()
+    
+    def setDecimationEnabled(self, state):
+        """
+        Sets whether or not renderers are allowed to reduce the points \
+        drawn for this dataset when it has more points than pixels.
+        
+        :param      state | <bool>
+        """
+        self._decimated = state
     
     def setDragData(self, key, value):
         """
@@ -129,6 +356,17 @@ class XChartDataset(object):
         if key is not None:
             self._colorMap[nativestring(key)] = self._color
     
+    def setMaximumCount(self, count):
+        """
+        Sets the maximum number of points this dataset will hold before \
+        dropping its oldest points, turning it into a sliding window.  A \
+        value of 0 means it is unlimited.
+        
+        :param      count | <int>
+        """
+        self._maximumCount = count
+        self._trim()
+    
     def setName(self, name):
         """
         Sets the name for this dataset to the inputed name.
@@ -155,13 +393,46 @@ class XChartDataset(object):
         """
         return axis.sum(self.values(axis.name()))
     
+    def tail(self, axis, start):
+        """
+        Returns the values for the given axis from the inputed index to the \
+        end of this dataset.
+        
+        :param      axis  | <str>
+                    start | <int>
+        
+        :return     [<variant>, ..]
+        """
+        column = self._columns.get(axis)
+        if column is None:
+            return [None] * max(self._count - start, 0)
+        return column[self._head + start:]
+    
     def values(self, axis=None):
         """
-        Returns the values for this dataset.
+        Returns the values for this dataset.  When an axis name is supplied, \
+        the stored column of values for that axis is returned directly and \
+        should not be modified.
+        
+        :param      axis | <str> || None
         
-        :return     [{<str> axis: <variant> value, ..}, ..]
+        :return     [{<str> axis: <variant> value, ..}, ..] || [<variant>, ..]
         """
+        self._compact()
+        
         if axis is None:
-            return self._plot
-        else:
-            return [value.get(axis) for value in self._plot]
\ No newline at end of file
+            if self._points is None:
+                columns = self._columns.items()
+                self._points = []
+                for i in range(self._count):
+                    point = {}
+                    for key, column in columns:
+                        if column[i] is not None:
+                            point[key] = column[i]
+                    self._points.append(point)
+            return self._points
+        
+        try:
+            return self._columns[axis]
+        except KeyError:
+            return [None] * self._count
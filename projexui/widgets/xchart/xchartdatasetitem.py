@@ -13,10 +13,13 @@ __license__         = 'LGPL'
 __maintainer__      = 'Projex Software'
 __email__           = 'team@projexsoftware.com'
 
+import bisect
+import math
+
 from projex.text import nativestring
 
 from projexui.qt import wrapVariant
-from projexui.qt.QtCore import QMimeData
+from projexui.qt.QtCore import Qt, QMimeData
 from projexui.qt.QtGui import QGraphicsPathItem, QDrag
 
 class XChartDatasetItem(QGraphicsPathItem):
@@ -26,6 +29,10 @@ class XChartDatasetItem(QGraphicsPathItem):
         # define custom properties
         self._dataset = None
         self._buildData = {}
+        self._shape = None
+        self._hitKeys = None
+        self._hitEntries = None
+        self._hitSpan = 0
         
         self.setAcceptHoverEvents(True)
     
@@ -40,6 +47,37 @@ class XChartDatasetItem(QGraphicsPathItem):
         except AttributeError:
             return None
     
+    def _rebuildIndex(self):
+        """
+        Rebuilds the sorted lookup used to hit test this item.  Line points \
+        are indexed by their x position, and bars by the leading edge of \
+        their subpaths along the renderer's orientation.
+        """
+        entries = []
+        span = 0
+        
+        ellipses = self._buildData.get('ellipses')
+        if ellipses is not None:
+            entries = [(pos.x(), i) for i, pos in enumerate(ellipses)]
+        else:
+            vertical = self._buildData.get('orientation') == Qt.Vertical
+            for i, subpath in enumerate(self._buildData.get('subpaths', [])):
+                if type(subpath) == tuple:
+                    continue
+                
+                rect = subpath.boundingRect()
+                if vertical:
+                    entries.append((rect.left(), i))
+                    span = max(span, rect.width())
+                else:
+                    entries.append((rect.top(), i))
+                    span = max(span, rect.height())
+        
+        entries.sort()
+        self._hitKeys = [key for key, _ in entries]
+        self._hitEntries = [i for _, i in entries]
+        self._hitSpan = span
+    
     def buildData(self, key=None, default=None):
         """
         Returns the build information for this item for the given key, 
@@ -55,6 +93,63 @@ class XChartDatasetItem(QGraphicsPathItem):
         
         return self._buildData.get(nativestring(key), default)
     
+    def contains(self, point):
+        """
+        Returns whether or not the inputed point is on this item.  Lines \
+        and bars are tested using a sorted index of their points so that \
+        hovering stays fast for large datasets.
+        
+        :param      point | <QPointF>
+        
+        :return     <bool>
+        """
+        if self._hitKeys is None:
+            self._rebuildIndex()
+        
+        ellipses = self._buildData.get('ellipses')
+        subpaths = self._buildData.get('subpaths')
+        
+        # test against the line segments near the point
+        if ellipses is not None:
+            radius = self._buildData.get('point_radius', 6)
+            keys = self._hitKeys
+            start = bisect.bisect_left(keys, point.x() - radius)
+            end = bisect.bisect_right(keys, point.x() + radius)
+            
+            # include the points around the segment spanning the point, as
+            # sparse lines may have no points within the radius
+            index = bisect.bisect_left(keys, point.x())
+            positions = set(range(start, end))
+            positions.update(i for i in (index - 1, index)
+                             if 0 <= i < len(keys))
+            
+            for i in [self._hitEntries[pos] for pos in sorted(positions)]:
+                for a, b in ((i - 1, i), (i, i + 1)):
+                    if not (0 <= a and b < len(ellipses)):
+                        continue
+                    if _distance(point, ellipses[a], ellipses[b]) <= radius:
+                        return True
+            
+            return len(ellipses) == 1 and \
+                   _distance(point, ellipses[0], ellipses[0]) <= radius
+        
+        # test against the bars near the point
+        elif subpaths and self._hitKeys:
+            if self._buildData.get('orientation') == Qt.Vertical:
+                coord = point.x()
+            else:
+                coord = point.y()
+            
+            keys = self._hitKeys
+            start = bisect.bisect_left(keys, coord - self._hitSpan)
+            end = bisect.bisect_right(keys, coord)
+            for i in self._hitEntries[start:end]:
+                if subpaths[i].contains(point):
+                    return True
+            return False
+        
+        return super(XChartDatasetItem, self).contains(point)
+    
     def dataset(self):
         """
         Returns the dataset instance associated with this item.
@@ -75,6 +170,28 @@ class XChartDatasetItem(QGraphicsPathItem):
         
         super(XChartDatasetItem, self).mousePressEvent(event)
     
+    def nearestPoint(self, point):
+        """
+        Returns the plotted point on this line closest to the inputed \
+        point's x position.
+        
+        :param      point | <QPointF>
+        
+        :return     <QPointF> || None
+        """
+        ellipses = self._buildData.get('ellipses')
+        if not ellipses:
+            return None
+        
+        if self._hitKeys is None:
+            self._rebuildIndex()
+        
+        keys = self._hitKeys
+        index = bisect.bisect_left(keys, point.x())
+        options = [i for i in (index - 1, index) if 0 <= i < len(keys)]
+        index = min(options, key=lambda i: abs(keys[i] - point.x()))
+        return ellipses[self._hitEntries[index]]
+    
     def paint(self, painter, option, widget):
         """
         Draws this item with the inputed painter.  This will call the
@@ -95,6 +212,7 @@ class XChartDatasetItem(QGraphicsPathItem):
                     value | <variant>
         """
         self._buildData[nativestring(key)] = value
+        self._hitKeys = None
     
     def setDataset(self, dataset):
         """
@@ -121,6 +239,27 @@ class XChartDatasetItem(QGraphicsPathItem):
             tip.append('<p>%s</p>' % ', '.join(value_text))
         self.setToolTip(''.join(tip))
     
+    def setPath(self, path):
+        """
+        Sets the path for this item, clearing the cached shape and hit \
+        testing index.
+        
+        :param      path | <QPainterPath>
+        """
+        super(XChartDatasetItem, self).setPath(path)
+        self._shape = None
+        self._hitKeys = None
+    
+    def shape(self):
+        """
+        Returns the shape for this item, caching it until the path changes.
+        
+        :return     <QPainterPath>
+        """
+        if self._shape is None:
+            self._shape = super(XChartDatasetItem, self).shape()
+        return self._shape
+    
     def startDrag(self, dragData):
         """
         Starts a new drag with the inputed data.
@@ -136,4 +275,26 @@ class XChartDatasetItem(QGraphicsPathItem):
         drag = QDrag(self.scene().chart())
         drag.setMimeData(mimeData)
         drag.exec_()
-        
\ No newline at end of file
+
+def _distance(point, a, b):
+    """
+    Returns the distance from the inputed point to the line segment a-b.
+    
+    :param      point | <QPointF>
+                a     | <QPointF>
+                b     | <QPointF>
+    
+    :return     <float>
+    """
+    dx = b.x() - a.x()
+    dy = b.y() - a.y()
+    length = dx * dx + dy * dy
+    
+    if length:
+        perc = ((point.x() - a.x()) * dx + (point.y() - a.y()) * dy) / length
+        perc = max(min(perc, 1.0), 0.0)
+    else:
+        perc = 0.0
+    
+    return math.hypot(point.x() - (a.x() + perc * dx),
+                      point.y() - (a.y() + perc * dy))
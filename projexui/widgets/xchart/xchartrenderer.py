@@ -19,6 +19,7 @@ __email__           = 'team@projexsoftware.com'
 
 #------------------------------------------------------------------------------
 
+from projex.enum import enum
 from projex.text import nativestring
 
 from projexui.qt.QtCore import Qt, QRectF, QLineF, QPointF
@@ -27,7 +28,14 @@ from projexui.qt.QtGui import QPen,\
                               QApplication,\
                               QFontMetrics
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class XChartRenderer(object):
+    Decimation = enum('MinMax', 'Minimum', 'Maximum')
+    
     _plugins = {}
     
     def __init__(self):
@@ -317,6 +325,60 @@ class XChartRenderer(object):
         
         return dataitems
     
+    def decimate(self, keys, values, mode=None):
+        """
+        Reduces the inputed coordinates to a few points per pixel, grouping \
+        consecutive coordinates whose keys fall within the same pixel.  The \
+        MinMax mode keeps the first, lowest, highest and last points of each \
+        pixel so a line drawn through them looks the same as the full line \
+        and keeps all of its peaks.  The Minimum and Maximum modes only keep \
+        the lowest or highest point of each pixel.
+        
+        :param      keys   | [<float>, ..]
+                    values | [<float>, ..]
+                    mode   | <XChartRenderer.Decimation> || None
+        
+        :return     ([<float>, ..] keys, [<float>, ..] values)
+        """
+        if mode is None:
+            mode = XChartRenderer.Decimation.MinMax
+        
+        out_keys = []
+        out_values = []
+        count = len(keys)
+        i = 0
+        
+        while i < count:
+            pixel = int(keys[i])
+            low = high = last = i
+            low_val = high_val = values[i]
+            
+            # collect the extents for this pixel
+            j = i + 1
+            while j < count and int(keys[j]) == pixel:
+                value = values[j]
+                if value < low_val:
+                    low, low_val = j, value
+                elif high_val < value:
+                    high, high_val = j, value
+                last = j
+                j += 1
+            
+            if mode == XChartRenderer.Decimation.Minimum:
+                indexes = (low,)
+            elif mode == XChartRenderer.Decimation.Maximum:
+                indexes = (high,)
+            else:
+                indexes = sorted(set((i, low, high, last)))
+            
+            for index in indexes:
+                out_keys.append(keys[index])
+                out_values.append(values[index])
+            
+            i = j
+        
+        return out_keys, out_values
+    
     def drawAxis(self, painter, rect, axis):
         """
         Draws the axis for the given painter.
@@ -434,6 +496,19 @@ class XChartRenderer(object):
         """
         pass
     
+    def extendDatasets(self, scene, axes, datasets):
+        """
+        Updates the items for the inputed datasets after new points have \
+        been appended to them and the axes have not changed.  By default, \
+        this will rebuild all of the datasets.  Renderers that can extend \
+        their items in place should subclass this method.
+        
+        :param      scene    | <XChartScene>
+                    axes     | [<XChartAxis>, ..]
+                    datasets | [<XChartDataset>, ..]
+        """
+        self.calculateDatasets(scene, axes, scene.chart().datasets())
+    
     def horizontalLabelPadding(self):
         """
         Returns the padding that will be used for the horiztonal
@@ -481,6 +556,77 @@ class XChartRenderer(object):
         
         return point
     
+    def pointsAt(self,
+                 axes,
+                 dataset,
+                 decimation=None,
+                 orientation=Qt.Vertical,
+                 start=0):
+        """
+        Returns the points that best represent each value of the inputed \
+        dataset.  Each axis maps its whole column of values in one pass, \
+        rather than calling pointAt for every value.  When a start index is \
+        supplied, only the values from that index onward are mapped.
+        
+        When a decimation mode is supplied and the dataset has decimation \
+        enabled, datasets with more points than there are pixels will be \
+        reduced per pixel column (vertical) or row (horizontal).  As the \
+        points are mapped to the current axis rect, this is recalculated \
+        whenever the chart is resized.
+        
+        :param      axes        | [<XChartAxis>, ..]
+                    dataset     | <XChartDataset>
+                    decimation  | <XChartRenderer.Decimation> || None
+                    orientation | <Qt.Orientation>
+                    start       | <int>
+        
+        :return     [<QPointF>, ..]
+        """
+        count = max(dataset.count() - start, 0)
+        
+        rect = self._buildData.get('axis_rect')
+        if not rect:
+            return [QPointF() for i in xrange(count)]
+        
+        xs = [0.0] * count
+        ys = [0.0] * count
+        names = dataset.axisNames()
+        
+        for axis in axes:
+            if not axis.name() in names:
+                continue
+            
+            if axis.orientation() == Qt.Vertical:
+                origin = rect.bottom()
+                scale = rect.top() - rect.bottom()
+            else:
+                origin = rect.left()
+                scale = rect.right() - rect.left()
+            
+            if start:
+                percs = axis.percentsAt(dataset.tail(axis.name(), start))
+            else:
+                percs = axis.datasetPercents(dataset)
+            
+            if numpy is not None and isinstance(percs, numpy.ndarray):
+                coords = (origin + percs * scale).tolist()
+            else:
+                coords = [origin + perc * scale for perc in percs]
+            
+            if axis.orientation() == Qt.Vertical:
+                ys = coords
+            else:
+                xs = coords
+        
+        if decimation is not None and not start and \
+           dataset.isDecimationEnabled():
+            if orientation == Qt.Vertical and rect.width() < count:
+                xs, ys = self.decimate(xs, ys, decimation)
+            elif orientation == Qt.Horizontal and rect.height() < count:
+                ys, xs = self.decimate(ys, xs, decimation)
+        
+        return map(QPointF, xs, ys)
+    
     def setAlternateColor(self, color):
         """
         Sets the alternate base color for this renderer to the inputed color.
@@ -40,6 +40,11 @@ class XChartRuler(object):
                 'Monthly',
                 'Custom')
     
+    # shared cache for formatted notch text
+    _labelCache = {}
+    
+    CacheSize = 4096
+    
     def __init__( self, rulerType ):
         
         # define custom properties
@@ -53,6 +58,7 @@ class XChartRuler(object):
         self._padStart      = 0
         self._padEnd        = 0
         self._notchPadding  = 6
+        self._notchSizes    = (None, {})
         
         self.setRulerType(rulerType)
     
@@ -163,6 +169,8 @@ class XChartRuler(object):
     def formatValue( self, value ):
         """
         Formats the inputed value based on the formatting system for this ruler.
+        Values formatted without a custom formatter are cached per value, 
+        ruler type and format.
         
         :param      value | <variant>
         """
@@ -170,18 +178,38 @@ class XChartRuler(object):
         if ( formatter is not None ):
             return formatter(value)
         
-        elif ( self.format() ):
-            rtype = self.rulerType()
-            if ( rtype in (XChartRuler.Type.Date, XChartRuler.Type.Datetime,
-                           XChartRuler.Type.Time) ):
-                return value.toString(self.format())
-            else:
-                try:
-                    return self.format() % value
-                except TypeError:
-                    return nativestring(value)
+        rtype = self.rulerType()
+        key   = (type(value), value, rtype, self.format())
+        cache = XChartRuler._labelCache
+        
+        try:
+            text = cache.get(key)
+        except TypeError:
+            key  = None
+            text = None
+        
+        if ( text is not None ):
+            return text
+        
+        if ( not self.format() ):
+            text = nativestring(value)
+        
+        elif ( rtype in (XChartRuler.Type.Date, XChartRuler.Type.Datetime,
+                         XChartRuler.Type.Time) ):
+            text = value.toString(self.format())
         
-        return nativestring(value)
+        else:
+            try:
+                text = self.format() % value
+            except TypeError:
+                text = nativestring(value)
+        
+        if ( key is not None ):
+            if ( len(cache) > XChartRuler.CacheSize ):
+                cache.clear()
+            cache[key] = text
+        
+        return text
     
     def maxNotchSize( self, orientation ):
         """
@@ -192,17 +220,31 @@ class XChartRuler(object):
         
         :return     <int>
         """
-        metrics = QFontMetrics(QApplication.font())
+        notches = self.notches()
+        font    = QApplication.font()
+        key     = (orientation, font.key())
+        
+        # reuse the sizes until the notches or font change
+        if ( self._notchSizes[0] is not notches ):
+            self._notchSizes = (notches, {})
+        
+        sizes = self._notchSizes[1]
+        if ( key in sizes ):
+            return sizes[key]
+        
+        metrics = QFontMetrics(font)
         
         if orientation == Qt.Vertical:
             notch = ''
-            for n in self.notches():
+            for n in notches:
                 if len(nativestring(n)) > len(nativestring(notch)):
                     notch = nativestring(n)
             
-            return metrics.width(notch)
+            sizes[key] = metrics.width(notch)
         else:
-            return metrics.height()
+            sizes[key] = metrics.height()
+        
+        return sizes[key]
     
     def minLength( self, orientation ):
         """
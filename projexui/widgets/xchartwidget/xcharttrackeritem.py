@@ -84,13 +84,15 @@ class XChartTrackerItem(QGraphicsPathItem):
         self._basePath  = QPainterPath(path)
         
         for item in items:
-            item_path = item.path()
+            # lookup the line position from the item's sorted index
+            if not hasattr(item, 'linePointAt'):
+                continue
+            
             found = None
-            for y in range(int(gridRect.top()), int(gridRect.bottom())):
-                point = QPointF(self.pos().x(), y)
-                if ( item_path.contains(point) ):
-                    found = QPointF(0, y - self.pos().y())
-                    break
+            point = item.linePointAt(item.mapFromScene(self.pos()).x())
+            if point is not None:
+                point = item.mapToScene(point)
+                found = QPointF(0, point.y() - self.pos().y())
             
             if ( found ):
                 path.addEllipse(found, 6, 6)
@@ -11,6 +11,8 @@ __license__         = 'LGPL'
 __maintainer__      = 'Projex Software'
 __email__           = 'team@projexsoftware.com'
 
+import bisect
+import math
 import random
 
 from projex.text import nativestring
@@ -66,6 +68,11 @@ class XChartWidgetItem(QGraphicsPathItem):
         self._hoveredPath       = None
         self._dirty             = False
         self._buildData         = {}
+        
+        # sorted lookup used for hit testing
+        self._hitKeys           = []
+        self._hitEntries        = []
+        self._hitSpan           = 0
     
     def addPoint( self, x, y ):
         """
@@ -175,17 +182,10 @@ class XChartWidgetItem(QGraphicsPathItem):
         
         :param      event | <QEvent>
         """
-        point = event.pos()
-        
-        found_key = ''
-        found = None
-        for key, value, subpath in self._subpaths:
-            if subpath.contains(point):
-                found = subpath
-                found_key = key
-                break
-        
-        if found:
+        entry = self.subpathAt(event.pos())
+        if entry:
+            found_key, _, found = entry
+            
             # update the tooltip
             tip    = self.keyToolTip(found_key)
             if ( tip ):
@@ -265,13 +265,55 @@ class XChartWidgetItem(QGraphicsPathItem):
         
         :return     (<variant> x, <variant> y)
         """
+        # lookup the closest point on a line
+        if self.chartType() == XChartScene.Type.Line:
+            keys = self._hitKeys
+            index = bisect.bisect_left(keys, pos.x())
+            radius = self.pointRadius()
+            
+            for i in (index - 1, index):
+                if not 0 <= i < len(keys):
+                    continue
+                
+                x, y, point = self._hitEntries[i]
+                if abs(point.x() - pos.x()) <= radius and \
+                   abs(point.y() - pos.y()) <= radius:
+                    return (x, y)
+            
+            return (None, None)
+        
         # lookup subpaths
-        for x, y, path in self._subpaths:
-            if path.contains(pos):
-                return (x, y)
+        entry = self.subpathAt(pos)
+        if entry:
+            return entry[:2]
         
         return (None, None)
     
+    def linePointAt( self, x ):
+        """
+        Returns the point on this item's line at the inputed x position, \
+        interpolating between the nearest plotted points.
+        
+        :param      x | <float>
+        
+        :return     <QPointF> || None
+        """
+        if self.chartType() != XChartScene.Type.Line:
+            return None
+        
+        keys = self._hitKeys
+        index = bisect.bisect_left(keys, x)
+        if not keys or index == len(keys) or (index == 0 and x < keys[0]):
+            return None
+        
+        b = self._hitEntries[index][2]
+        if index == 0 or b.x() == x:
+            return QPointF(b)
+        
+        a = self._hitEntries[index - 1][2]
+        perc = (x - a.x()) / (b.x() - a.x())
+        return QPointF(x, a.y() + (b.y() - a.y()) * perc)
+    
     def orientation( self ):
         """
         Returns the orienatation for this item (used in bar charts).
@@ -564,8 +606,11 @@ class XChartWidgetItem(QGraphicsPathItem):
             radius   = self.radius()
             diameter = radius * 2
             angle    = 0
+            angles   = []
             bound    = QRectF(-radius, -radius, diameter, diameter)
             
+            self._buildData['pie_angles'] = angles
+            
             for key, value in sorted(pie_values.items(), key = lambda x: x[1]):
                 # calculate the percentage
                 perc  = float(value) / total
@@ -580,12 +625,49 @@ class XChartWidgetItem(QGraphicsPathItem):
                 
                 path.addPath(sub_path)
                 self._subpaths.append((key, value, sub_path))
+                angles.append(angle)
                 
                 angle += item_angle
                 
         self.setPath(path)
+        self.rebuildIndex()
         self._dirty = False
     
+    def rebuildIndex( self ):
+        """
+        Rebuilds the sorted lookup used to hit test this item.  Lines are \
+        indexed by the x position of their points, bars by the leading edge \
+        of their subpaths and pie slices by their starting angle.
+        """
+        typ     = self.chartType()
+        entries = []
+        span    = 0
+        
+        if typ == XChartScene.Type.Line:
+            for (x, y), pos in zip(self.points(), self._ellipses):
+                entries.append((pos.x(), (x, y, pos)))
+        
+        elif typ == XChartScene.Type.Bar:
+            horiz = self.orientation() == Qt.Horizontal
+            for entry in self._subpaths:
+                rect = entry[2].boundingRect()
+                if horiz:
+                    entries.append((rect.left(), entry))
+                    span = max(span, rect.width())
+                else:
+                    entries.append((rect.top(), entry))
+                    span = max(span, rect.height())
+        
+        elif typ == XChartScene.Type.Pie:
+            angles = self._buildData.get('pie_angles', [])
+            for angle, entry in zip(angles, self._subpaths):
+                entries.append((angle, entry))
+        
+        entries.sort(key=lambda x: x[0])
+        self._hitKeys    = [key for key, _ in entries]
+        self._hitEntries = [entry for _, entry in entries]
+        self._hitSpan    = span
+    
     def points( self ):
         """
         Returns a list of the points for this item.
@@ -758,6 +840,46 @@ class XChartWidgetItem(QGraphicsPathItem):
         """
         return self._showPointsInLine
     
+    def subpathAt( self, point ):
+        """
+        Returns the subpath entry that contains the inputed point, using \
+        the sorted lookup built with the item instead of testing every \
+        subpath.
+        
+        :param      point | <QPointF>
+        
+        :return     (<variant> key, <variant> value, <QPainterPath>) || None
+        """
+        keys = self._hitKeys
+        if not keys:
+            return None
+        
+        typ = self.chartType()
+        
+        # pie slices are built around the item's origin
+        if typ == XChartScene.Type.Pie:
+            angle = math.degrees(math.atan2(-point.y(), point.x())) % 360
+            index = bisect.bisect_right(keys, angle) - 1
+            candidates = (index, index - 1, index + 1)
+        
+        elif typ == XChartScene.Type.Bar:
+            if self.orientation() == Qt.Horizontal:
+                coord = point.x()
+            else:
+                coord = point.y()
+            
+            start = bisect.bisect_left(keys, coord - self._hitSpan)
+            end   = bisect.bisect_right(keys, coord)
+            candidates = range(start, end)
+        
+        else:
+            return None
+        
+        for i in candidates:
+            if 0 <= i < len(keys) and self._hitEntries[i][2].contains(point):
+                return self._hitEntries[i]
+        return None
+    
     def title( self ):
         """
         Returns the title for this item.
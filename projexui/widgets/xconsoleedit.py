@@ -16,21 +16,28 @@ __email__           = 'team@projexsoftware.com'
 #------------------------------------------------------------------------------
 
 import __main__
+import bisect
+import ctypes
 import inspect
 import logging
 import os
 import re
 import sys
+import threading
+import time
+import traceback
 
 import projex.text
 import projexui
 
 from projex import hooks
+from projex.enum import enum
 from projexui.qt import Signal, Property, wrapVariant, unwrapVariant
 from projexui.qt.QtCore import QObject,\
                                QPoint,\
                                Qt,\
                                QMutexLocker,\
+                               QThread,\
                                QTimer
                          
 from projexui.qt.QtGui import QApplication,\
@@ -62,9 +69,190 @@ HEADER = """\
 class XIOHook(QObject):
     _instance = None
     
+    DropPolicy = enum('DropOldest', 'DropNewest')
+    
     printed = Signal(str)
     errored = Signal(str)
     
+    def __init__(self, parent=None):
+        super(XIOHook, self).__init__(parent)
+        
+        # define custom properties
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._bufferSize = 1024 * 1024
+        self._flushSize = 4096
+        self._dropPolicy = XIOHook.DropPolicy.DropOldest
+        self._droppedCount = 0
+        
+        # flush any partial lines left in the buffers
+        self._timer = QTimer(self)
+        self._timer.setInterval(50)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+    
+    def bufferSize(self):
+        """
+        Returns the maximum number of characters that will be buffered per \
+        thread before the drop policy is applied.
+        
+        :return     <int>
+        """
+        return self._bufferSize
+    
+    def dropPolicy(self):
+        """
+        Returns the policy used when a thread's buffer is full.
+        
+        :return     <XIOHook.DropPolicy>
+        """
+        return self._dropPolicy
+    
+    def droppedCount(self):
+        """
+        Returns the total number of characters that have been dropped.
+        
+        :return     <int>
+        """
+        return self._droppedCount
+    
+    def flush(self, ident=None):
+        """
+        Emits the buffered text for the inputed thread, or for all threads \
+        when no thread is given, as a single chunk per stream change.
+        
+        :param      ident | <int> || None
+        """
+        with self._lock:
+            if ident is None:
+                items = self._buffers.values()
+                self._buffers = {}
+            else:
+                buff = self._buffers.pop(ident, None)
+                items = [buff] if buff else []
+        
+        for size, runs, dropped, created in items:
+            if dropped:
+                msg = '\n<<< {0} characters of output were dropped >>>\n'
+                self.errored.emit(msg.format(dropped))
+            
+            for error, chunks in runs:
+                if error:
+                    self.errored.emit(''.join(chunks))
+                else:
+                    self.printed.emit(''.join(chunks))
+    
+    def flushInterval(self):
+        """
+        Returns the interval in milliseconds between buffer flushes.
+        
+        :return     <int>
+        """
+        return self._timer.interval()
+    
+    def flushSize(self):
+        """
+        Returns the number of buffered characters that will trigger an \
+        immediate flush.
+        
+        :return     <int>
+        """
+        return self._flushSize
+    
+    def setBufferSize(self, size):
+        """
+        Sets the maximum number of characters that will be buffered per \
+        thread before the drop policy is applied.
+        
+        :param      size | <int>
+        """
+        self._bufferSize = max(1, size)
+    
+    def setDropPolicy(self, policy):
+        """
+        Sets the policy used when a thread's buffer is full.  DropOldest \
+        will discard the oldest buffered text and DropNewest will discard \
+        the text being written.
+        
+        :param      policy | <XIOHook.DropPolicy>
+        """
+        self._dropPolicy = policy
+    
+    def setFlushInterval(self, msecs):
+        """
+        Sets the interval in milliseconds between buffer flushes.
+        
+        :param      msecs | <int>
+        """
+        self._timer.setInterval(msecs)
+    
+    def setFlushSize(self, size):
+        """
+        Sets the number of buffered characters that will trigger an \
+        immediate flush.
+        
+        :param      size | <int>
+        """
+        self._flushSize = size
+    
+    def write(self, text, error=False):
+        """
+        Buffers the inputed text for the current thread.  The buffer is \
+        flushed when it reaches the flush size, when a newline is written \
+        to a buffer older than the flush interval, or by the flush timer.
+        
+        :param      text  | <str>
+                    error | <bool>
+        """
+        if not text:
+            return
+        
+        ident = threading.current_thread().ident
+        interval = self._timer.interval() / 1000.0
+        
+        with self._lock:
+            try:
+                buff = self._buffers[ident]
+            except KeyError:
+                buff = self._buffers[ident] = [0, [], 0, time.time()]
+            
+            # apply the drop policy when the buffer is full
+            limit = self._bufferSize
+            if buff[0] + len(text) > limit:
+                if self._dropPolicy == XIOHook.DropPolicy.DropNewest:
+                    buff[2] += len(text)
+                    self._droppedCount += len(text)
+                    return
+                
+                if len(text) > limit:
+                    buff[2] += len(text) - limit
+                    self._droppedCount += len(text) - limit
+                    text = text[-limit:]
+                
+                runs = buff[1]
+                while runs and buff[0] + len(text) > limit:
+                    chunks = runs[0][1]
+                    count = len(chunks.pop(0))
+                    if not chunks:
+                        runs.pop(0)
+                    
+                    buff[0] -= count
+                    buff[2] += count
+                    self._droppedCount += count
+            
+            runs = buff[1]
+            if runs and runs[-1][0] == error:
+                runs[-1][1].append(text)
+            else:
+                runs.append([error, [text]])
+            buff[0] += len(text)
+            
+            ready = buff[0] >= self._flushSize or \
+                    ('\n' in text and time.time() - buff[3] >= interval)
+        
+        if ready:
+            self.flush(ident)
+    
     @staticmethod
     def cleanup():
         # destroy the global hook instance
@@ -74,6 +262,9 @@ class XIOHook(QObject):
         
         XIOHook._instance = None
         
+        hook._timer.stop()
+        hook.flush()
+        
         # disconnect Qt hooks
         try:
             hook.printed.disconnect()
@@ -94,11 +285,11 @@ class XIOHook(QObject):
     
     @staticmethod
     def stdout(text):
-        XIOHook.instance().printed.emit(text)
+        XIOHook.instance().write(text)
 
     @staticmethod
     def stderr(text):
-        XIOHook.instance().errored.emit(text)
+        XIOHook.instance().write(text, error=True)
 
     @staticmethod
     def instance():
@@ -115,10 +306,124 @@ class XIOHook(QObject):
 
 #----------------------------------------------------------------------
 
+class XConsoleWorker(QObject):
+    """
+    Executes console commands from a worker thread.  Output printed by the \
+    command is streamed back through the XIOHook.
+    """
+    commandFinished = Signal(object, float)
+    commandErrored = Signal(str, float)
+    
+    def __init__(self, parent=None):
+        super(XConsoleWorker, self).__init__(parent)
+        
+        self._ident = None
+        self._lock = threading.Lock()
+    
+    def _release(self, ident):
+        """
+        Stops accepting cancel requests for the current command and \
+        discards an interrupt that was raised but not yet delivered.
+        
+        :param      ident | <int>
+        """
+        with self._lock:
+            self._ident = None
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(ident),
+                                                       None)
+    
+    def cancel(self):
+        """
+        Interrupts the running command by raising a KeyboardInterrupt within \
+        the worker thread.  The interrupt is delivered the next time the \
+        command executes Python code, so blocking calls will finish first.
+        
+        :return     <bool> success
+        """
+        # the lock keeps the command from finishing between the check and
+        # raising the interrupt
+        with self._lock:
+            ident = self._ident
+            if ident is None:
+                return False
+            
+            count = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                        ctypes.c_long(ident),
+                        ctypes.py_object(KeyboardInterrupt))
+        return count == 1
+    
+    def execute(self, command, scope):
+        """
+        Executes the inputed command in the given scope, emitting the \
+        commandFinished signal with the formatted result or the \
+        commandErrored signal with the traceback, along with the number of \
+        seconds the command took.
+        
+        :param      command | <unicode>
+                    scope   | <dict>
+        """
+        ident = threading.current_thread().ident
+        with self._lock:
+            self._ident = ident
+        
+        start = time.time()
+        error = None
+        result = None
+        
+        try:
+            try:
+                try:
+                    try:
+                        cmdresult = eval(command, scope, scope)
+                    except SyntaxError:
+                        cmdresult = None
+                        exec(command) in scope, scope
+                except:
+                    error = traceback.format_exc()
+                else:
+                    if cmdresult is not None:
+                        try:
+                            result = projex.text.nativestring(repr(cmdresult))
+                        except:
+                            result = '<<< error formatting result to utf-8 >>>'
+            finally:
+                self._release(ident)
+            
+            # make sure the printed output reaches the console first
+            hook = XIOHook._instance
+            if hook:
+                hook.flush(ident)
+        
+        # a cancel that arrived as the command finished must not keep the
+        # completion signal from being emitted
+        except KeyboardInterrupt:
+            self._release(ident)
+            if error is None:
+                error = traceback.format_exc()
+        
+        elapsed = time.time() - start
+        
+        if error is not None:
+            self.commandErrored.emit(error, elapsed)
+        else:
+            self.commandFinished.emit(result, elapsed)
+
+#----------------------------------------------------------------------
+
 class XConsoleEdit(XLoggerWidget):
     __designer_icon__ = projexui.resources.find('img/ui/console.png')
     
+    CompletionPageSize = 100
+    
+    # worker threads that were still running a command when background
+    # execution was turned off, held until they finish since the console
+    # may be deleted first.  They are released by a timer in the gui thread,
+    # as a thread cannot safely drop the last reference to itself.
+    _retiredWorkers = []
+    _releaseTimer = None
+    
     executeRequested = Signal(str)
+    backgroundExecuteRequested = Signal(str, object)
     
     def __init__(self, parent):
         super(XConsoleEdit, self).__init__(parent)
@@ -127,11 +432,20 @@ class XConsoleEdit(XLoggerWidget):
         self._scope = __main__.__dict__
         self._initialized = False
         self._completerTree = None
+        self._completionCache = {}
+        self._completionKeys = []
+        self._completionMatches = []
+        self._completionPrefix = ''
+        self._completionLoaded = 0
         self._commandStack = []
         self._history = []
         self._currentHistoryIndex = 0
         self._waitingForInput = False
         self._commandLineInteraction = False
+        self._backgroundExecution = False
+        self._commandRunning = False
+        self._worker = None
+        self._workerThread = None
         self._highlighter = XPythonHighlighter(self.document())
         
         # setup the look for the console
@@ -157,10 +471,42 @@ class XConsoleEdit(XLoggerWidget):
         self.insertPlainText(msg)
         self.scrollToEnd()
         
-        if not self._waitingForInput:
+        # a running background command places the prompt when it finishes
+        if not (self._waitingForInput or self._commandRunning):
             self._waitingForInput = True
             QTimer.singleShot(50, self.waitForInput)
 
+    def _commandErrored(self, error, elapsed):
+        self._commandRunning = False
+        self._error(error)
+        self.information('# failed after {0:.3f} secs'.format(elapsed))
+        self.waitForInput()
+
+    def _commandFinished(self, result, elapsed):
+        self._commandRunning = False
+        if result is not None:
+            self.information(result)
+        self.information('# finished in {0:.3f} secs'.format(elapsed))
+        self.waitForInput()
+
+    def _loadMoreCompletions(self, value):
+        vbar = self._completerTree.verticalScrollBar()
+        if value >= vbar.maximum():
+            self.loadCompletions()
+
+    @staticmethod
+    def _releaseWorkers():
+        # wait(0) only succeeds once the thread has completely finished,
+        # unlike isFinished which differs between Qt versions while the
+        # finished signal is being emitted
+        workers = XConsoleEdit._retiredWorkers
+        workers[:] = [(thread, worker)
+                      for thread, worker in workers
+                      if not thread.wait(0)]
+        
+        if not workers:
+            XConsoleEdit._releaseTimer.stop()
+
     def acceptCompletion( self ):
         """
         Accepts the current completion and inserts the code into the edit.
@@ -199,6 +545,10 @@ class XConsoleEdit(XLoggerWidget):
         """
         Applies the current line of code as an interactive python command.
         """
+        # wait for the background command to finish
+        if self._commandRunning:
+            return False
+        
         # generate the command information
         cursor      = self.textCursor()
         cursor.movePosition(cursor.EndOfLine)
@@ -276,6 +626,16 @@ class XConsoleEdit(XLoggerWidget):
         self.executeCommand(command)
         return True
     
+    def cancelCommand(self):
+        """
+        Interrupts the command that is running in the background.
+        
+        :return     <bool> success
+        """
+        if not (self._commandRunning and self._worker):
+            return False
+        return self._worker.cancel()
+    
     def cancelCompletion( self ):
         """
         Cancels the current completion.
@@ -283,6 +643,11 @@ class XConsoleEdit(XLoggerWidget):
         if self._completerTree:
             self._completerTree.hide()
     
+    def cleanup(self):
+        self.setBackgroundExecution(False)
+        
+        super(XConsoleEdit, self).cleanup()
+    
     def clear(self):
         """
         Clears the current text and starts a new input line.
@@ -290,6 +655,12 @@ class XConsoleEdit(XLoggerWidget):
         super(XConsoleEdit, self).clear()
         self.waitForInput()
 
+    def clearCompletionCache(self):
+        """
+        Clears the cached attribute listings used for completion.
+        """
+        self._completionCache.clear()
+    
     def commandLineInteraction(self):
         """
         Returns whether or not the console is using interaction like the
@@ -314,8 +685,46 @@ class XConsoleEdit(XLoggerWidget):
             self._completerTree.setRootIsDecorated(False)
             self._completerTree.header().hide()
             
+            # load more completions as the user scrolls to the end
+            vbar = self._completerTree.verticalScrollBar()
+            vbar.valueChanged.connect(self._loadMoreCompletions)
+            
         return self._completerTree
     
+    def completionKeys(self, obj):
+        """
+        Returns the sorted public attribute names for the inputed object. \
+        Listings are cached per object until the next command is executed. \
+        The cache holds a reference to each object so its id cannot be \
+        reused by another object while the listing is cached.
+        
+        :param      obj | <object>
+        
+        :return     [<str>, ..]
+        """
+        key = id(obj)
+        try:
+            cached, keys = self._completionCache[key]
+        except KeyError:
+            pass
+        else:
+            if cached is obj:
+                return keys
+        
+        # compare the ids since some things might overload the __eq__
+        # comparator
+        if id(obj) == id(self._scope):
+            o_keys = obj.keys()
+        else:
+            o_keys = dir(obj)
+        
+        keys = sorted([name for name in o_keys if not name.startswith('_')])
+        
+        if len(self._completionCache) >= 256:
+            self._completionCache.clear()
+        self._completionCache[key] = (obj, keys)
+        return keys
+    
     def eventFilter(self, obj, event):
         """
         Filters particular events for a given QObject through this class. \
@@ -354,19 +763,7 @@ class XConsoleEdit(XLoggerWidget):
             text     = text[:cursor.columnNumber()].split(' ')[-1]
             text     = text.split('.')[-1]
             
-            self._completerTree.blockSignals(True)
-            self._completerTree.setUpdatesEnabled(False)
-            
-            self._completerTree.setCurrentItem(None)
-            
-            for i in range(self._completerTree.topLevelItemCount()):
-                item = self._completerTree.topLevelItem(i)
-                if projex.text.nativestring(item.text(0)).startswith(text):
-                    self._completerTree.setCurrentItem(item)
-                    break
-            
-            self._completerTree.blockSignals(False)
-            self._completerTree.setUpdatesEnabled(True)
+            self.filterCompletion(text)
             
             return True
     
@@ -381,6 +778,9 @@ class XConsoleEdit(XLoggerWidget):
         if not command.strip():
             return self.waitForInput()
         
+        # executing code can change any of the cached attribute listings
+        self.clearCompletionCache()
+        
         # store the current block
         self._history.append(command)
         self._currentHistoryIndex = len(self._history)
@@ -399,13 +799,23 @@ class XConsoleEdit(XLoggerWidget):
         self.insertPlainText('\n')
         cmdresult = None
         
-        try:
-            cmdresult = eval(command, self.scope(), self.scope())
-        
-        except SyntaxError:
-            exec(command) in self.scope(), self.scope()
+        if self.isBackgroundExecution():
+            self.startWorker()
+            self._commandRunning = True
+            self.backgroundExecuteRequested.emit(command, self.scope())
+            return
         
-        else:
+        try:
+            try:
+                cmdresult = eval(command, self.scope(), self.scope())
+            except SyntaxError:
+                exec(command) in self.scope(), self.scope()
+            finally:
+                # make sure the printed output reaches the console first
+                hook = XIOHook._instance
+                if hook:
+                    hook.flush(threading.current_thread().ident)
+            
             if cmdresult is not None:
                 # check to see if the command we executed actually caused
                 # the destruction of this object -- if it did, then
@@ -441,6 +851,37 @@ class XConsoleEdit(XLoggerWidget):
         else:
             super(XConsoleEdit, self).dropEvent(event)
     
+    def filterCompletion(self, prefix):
+        """
+        Narrows the visible completions to the keys starting with the \
+        inputed prefix.  When the prefix extends the previous prefix, only \
+        the previous matches are searched, otherwise all of the keys for \
+        the object are searched again.
+        
+        :param      prefix | <str>
+        """
+        tree = self._completerTree
+        if not (tree and tree.isVisible()):
+            return
+        
+        if prefix.startswith(self._completionPrefix):
+            keys = self._completionMatches
+        else:
+            keys = self._completionKeys
+        
+        # the keys are sorted, so the matches are a contiguous range
+        start = bisect.bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        
+        self._completionPrefix = prefix
+        
+        if start == end:
+            self.cancelCompletion()
+        else:
+            self.setCompletions(keys[start:end])
+    
     def highlighter(self):
         """
         Returns the console highlighter for this widget.
@@ -513,6 +954,22 @@ class XConsoleEdit(XLoggerWidget):
         
         self.replaceCommand(cmd)
     
+    def isBackgroundExecution(self):
+        """
+        Returns whether or not commands are executed on a worker thread.
+        
+        :return     <bool>
+        """
+        return self._backgroundExecution
+    
+    def isCommandRunning(self):
+        """
+        Returns whether or not a command is running in the background.
+        
+        :return     <bool>
+        """
+        return self._commandRunning
+    
     def keyPressEvent(self, event):
         """
         Overloads the key press event to control keystroke modifications for \
@@ -520,8 +977,16 @@ class XConsoleEdit(XLoggerWidget):
         
         :param      event | <QKeyEvent>
         """
+        # Ctrl+C will interrupt a running background command
+        if event.key() == Qt.Key_C and \
+           event.modifiers() & Qt.ControlModifier and \
+           self._commandRunning and \
+           not self.textCursor().hasSelection():
+            self.cancelCommand()
+            event.accept()
+        
         # enter || return keys will apply the command
-        if event.key() in (Qt.Key_Return, Qt.Key_Enter):
+        elif event.key() in (Qt.Key_Return, Qt.Key_Enter):
             self.applyCommand()
             event.accept()
         
@@ -580,6 +1045,24 @@ class XConsoleEdit(XLoggerWidget):
         else:
             super(XConsoleEdit, self).keyPressEvent(event)
     
+    def loadCompletions(self, count=None):
+        """
+        Adds the next page of matching completions to the completer tree.
+        
+        :param      count | <int> || None
+        """
+        tree = self.completerTree()
+        if count is None:
+            count = self.CompletionPageSize
+        
+        start = self._completionLoaded
+        keys = self._completionMatches[start:start + count]
+        if not keys:
+            return
+        
+        tree.addTopLevelItems([QTreeWidgetItem([key]) for key in keys])
+        self._completionLoaded += len(keys)
+    
     def objectAtCursor(self):
         """
         Returns the python object that the text is representing.
@@ -702,6 +1185,43 @@ class XConsoleEdit(XLoggerWidget):
         """
         return self._scope
     
+    def setBackgroundExecution(self, state=True):
+        """
+        Sets whether or not commands are executed on a worker thread, \
+        keeping the application responsive while they run.  Commands run \
+        in the background should not access widgets directly.
+        
+        :param      state | <bool>
+        """
+        self._backgroundExecution = state
+        
+        if not state and self._workerThread:
+            thread = self._workerThread
+            worker = self._worker
+            
+            self.cancelCommand()
+            self.backgroundExecuteRequested.disconnect(worker.execute)
+            worker.commandFinished.disconnect(self._commandFinished)
+            worker.commandErrored.disconnect(self._commandErrored)
+            
+            self._workerThread = None
+            self._worker = None
+            self._commandRunning = False
+            
+            # a command that is still running keeps the thread alive, so the
+            # thread and worker must not be deleted until it finishes
+            thread.quit()
+            if not thread.wait(1000):
+                XConsoleEdit._retiredWorkers.append((thread, worker))
+                
+                timer = XConsoleEdit._releaseTimer
+                if timer is None:
+                    timer = QTimer(QApplication.instance())
+                    timer.setInterval(100)
+                    timer.timeout.connect(XConsoleEdit._releaseWorkers)
+                    XConsoleEdit._releaseTimer = timer
+                timer.start()
+    
     def setCommandLineInteraction(self, state=True):
         """
         Sets whether or not the interaction should follow command-line
@@ -711,6 +1231,26 @@ class XConsoleEdit(XLoggerWidget):
         """
         self._commandLineInteraction = state
     
+    def setCompletions(self, keys):
+        """
+        Sets the matching completions for the completer tree, loading the \
+        first page of items and selecting the first match.
+        
+        :param      keys | [<str>, ..]
+        """
+        tree = self.completerTree()
+        tree.blockSignals(True)
+        tree.setUpdatesEnabled(False)
+        
+        tree.clear()
+        self._completionMatches = keys
+        self._completionLoaded = 0
+        self.loadCompletions()
+        tree.setCurrentItem(tree.topLevelItem(0))
+        
+        tree.setUpdatesEnabled(True)
+        tree.blockSignals(False)
+    
     def setScope(self, scope):
         """
         Sets the scope that will be used for this editor.
@@ -718,6 +1258,29 @@ class XConsoleEdit(XLoggerWidget):
         :param      scope | <dict>
         """
         self._scope = scope
+        self.clearCompletionCache()
+    
+    def startWorker(self):
+        """
+        Creates the worker thread for background execution if necessary.
+        
+        :return     <XConsoleWorker>
+        """
+        if self._worker:
+            return self._worker
+        
+        self._worker = XConsoleWorker()
+        self._workerThread = QThread()
+        self._worker.moveToThread(self._workerThread)
+        
+        # create connections
+        self.backgroundExecuteRequested.connect(self._worker.execute)
+        self._worker.commandFinished.connect(self._commandFinished)
+        self._worker.commandErrored.connect(self._commandErrored)
+        QApplication.instance().aboutToQuit.connect(self._workerThread.quit)
+        
+        self._workerThread.start()
+        return self._worker
     
     def startCompletion(self, force=False):
         """
@@ -731,6 +1294,10 @@ class XConsoleEdit(XLoggerWidget):
             return
         
         tree.clear()
+        self._completionKeys = []
+        self._completionMatches = []
+        self._completionPrefix = ''
+        self._completionLoaded = 0
         
         # make sure we have a valid object
         obj, remain = self.objectAtCursor()
@@ -744,25 +1311,25 @@ class XConsoleEdit(XLoggerWidget):
         cursor = self.textCursor()
         point  = QPoint(rect.left(), rect.top() + 18)
         
-        # compare the ids since some things might overload the __eq__
-        # comparator
-        if id(obj) == id(self._scope):
-            o_keys = obj.keys()
-        elif obj is not None:
-            o_keys = dir(obj)
-        
-        keys = [key for key in sorted(o_keys) if not key.startswith('_')]
+        allkeys = self.completionKeys(obj)
+        keys = allkeys
         if id(obj) == id(self._scope):
             if not remain:
                 return False
             else:
-                keys = filter(lambda x: x.startswith(remain[0]), keys)
+                start = bisect.bisect_left(keys, remain[0])
+                end = start
+                while end < len(keys) and keys[end].startswith(remain[0]):
+                    end += 1
+                keys = keys[start:end]
+                self._completionPrefix = remain[0]
         
         if not keys:
             return False
         
-        for key in keys:
-            tree.addTopLevelItem(QTreeWidgetItem([key]))
+        # keep the full listing so shorter prefixes can be searched again
+        self._completionKeys = allkeys
+        self.setCompletions(keys)
         
         tree.move(self.mapToGlobal(point))
         tree.show()
@@ -796,6 +1363,9 @@ class XConsoleEdit(XLoggerWidget):
         
         self._blankCache = ''
 
+    x_backgroundExecution = Property(bool, isBackgroundExecution,
+                                           setBackgroundExecution)
+    
     x_commandLineInteraction = Property(bool, commandLineInteraction,
                                               setCommandLineInteraction)
 
@@ -17,7 +17,8 @@ __email__           = 'team@projexsoftware.com'
 
 import weakref
 
-from projexui.qt.QtCore   import QPointF
+from projexui.qt.QtCore   import QPointF,\
+                                 QRectF
 
 from projexui.qt.QtGui    import QGraphicsPathItem,\
                                  QColor,\
@@ -57,13 +58,19 @@ class XGanttDepItem(QGraphicsPathItem):
             painter.setBrush(self.pen().color())
             painter.drawPolygon(self._polygon)
     
-    def rebuild( self ):
+    def rebuild( self, visibleRect=None ):
         """
-        Rebuilds the dependency path for this item.
+        Rebuilds the dependency path for this item.  If a visible rect is \
+        provided and the link falls outside of it, the path is cleared \
+        instead of being constructed.
+        
+        :param      visibleRect | <QRectF> || None
+        
+        :return     <bool> | built
         """
         scene      = self.scene()
         if ( not scene ):
-            return
+            return False
         
         sourcePos  = self.sourceItem().viewItem().pos()
         sourceRect = self.sourceItem().viewItem().rect()
@@ -79,6 +86,19 @@ class XGanttDepItem(QGraphicsPathItem):
         endX   = targetPos.x() - 2
         endY   = targetPos.y() + (targetRect.height() / 2.0)
         
+        # skip the path for links outside of the visible area
+        if ( visibleRect is not None ):
+            bounds = QRectF(min(startX, endX - 10),
+                            min(startY, endY) - 3,
+                            abs(endX - startX) + 10,
+                            abs(endY - startY) + 6)
+            
+            if ( not visibleRect.intersects(bounds) ):
+                if ( self._polygon ):
+                    self._polygon = None
+                    self.setPath(QPainterPath())
+                return False
+        
         path = QPainterPath()
         path.moveTo(startX, startY)
         path.lineTo(startX, endY)
@@ -93,6 +113,7 @@ class XGanttDepItem(QGraphicsPathItem):
         path.addPolygon(self._polygon)
         
         self.setPath(path)
+        return True
     
     def sourceItem( self ):
         """
@@ -15,12 +15,16 @@ __email__           = 'team@projexsoftware.com'
 
 #------------------------------------------------------------------------------
 
+import bisect
+import math
+
 from projex.text import nativestring
 
 from projexui.qt.QtCore   import QDate,\
                                  QTime,\
+                                 QTimer,\
                                  QDateTime,\
-                                 QLine,\
+                                 QLineF,\
                                  QRect,\
                                  QRectF,\
                                  Qt
@@ -38,22 +42,45 @@ class XGanttRenderOptions(object):
         self.__dict__.update(kwds)
 
 class XGanttScene(QGraphicsScene):
+    TileCacheSize = 128
+    
     def __init__(self, ganttWidget):
         super(XGanttScene, self).__init__(ganttWidget)
         
         # setup custom properties
         self._ganttWidget       = ganttWidget
-        self._hlines            = []
-        self._vlines            = []
+        self._columnCount       = 0
+        self._weekStartDay      = 0
         self._alternateRects    = []
-        self._weekendRects      = []
+        self._alternateEdges    = []
         self._topLabels         = []
         self._labels            = []
         self._dirty             = True
-        self._tiles   = {}
+        self._layoutKey         = None
+        self._tiles             = []
+        self._tileEdges         = []
+        self._tileCache         = {}
+        self._dirtyEndpoints    = set()
+        self._staleDependencies = set()
+        
+        # dependency links are rebuilt once per event loop
+        self._dependencyTimer = QTimer(self)
+        self._dependencyTimer.setSingleShot(True)
+        self._dependencyTimer.setInterval(0)
         
         # create connections
         ganttWidget.dateRangeChanged.connect(self.setDirty)
+        self._dependencyTimer.timeout.connect(self.rebuildDependencies)
+    
+    def clearDependencies(self):
+        """
+        Clears the pending dependency rebuilds for this scene.  This should be
+        called when the scene's items are cleared, as the pending links will
+        no longer be valid.
+        """
+        self._dependencyTimer.stop()
+        self._dirtyEndpoints.clear()
+        self._staleDependencies.clear()
     
     def dateAt(self, x):
         """
@@ -148,8 +175,13 @@ class XGanttScene(QGraphicsScene):
         width  = self.sceneRect().width()
         height = header.height()
         
-        for tile_rect, tile in self._tiles:
-            painter.drawPixmap(tile_rect.x(), rect.top(), tile)
+        # draw the visible header tiles, rendering them as needed
+        index = bisect.bisect_left(self._tileEdges, rect.left())
+        for i in range(index, len(self._tiles)):
+            tile_rect = self._tiles[i][0]
+            if rect.right() < tile_rect.left():
+                break
+            painter.drawPixmap(tile_rect.x(), rect.top(), self.tilePixmap(i))
         
         palette = self.palette()
         textColor = palette.color(palette.Button).darker(125)
@@ -157,73 +189,55 @@ class XGanttScene(QGraphicsScene):
         painter.drawLine(0, rect.top() + height, width, rect.top() + height)
     
     def rebuildTiles(self):
-        # create the foreground pixmap
+        """
+        Rebuilds the header tile layout for the current labels.  The tile \
+        pixmaps are not rendered here - they are looked up from the tile \
+        cache, or rendered, as they become visible.
+        """
         gantt  = self.ganttWidget()
         header = gantt.treeWidget().header()
-        width  = self.sceneRect().width()
         height = header.height()
+        scale  = gantt.timescale()
         
-        # create the main color
-        palette     = gantt.palette()
-        color       = palette.color(palette.Button)
-        textColor   = palette.color(palette.ButtonText)
-        borderColor = color.darker(140)
-        text_align  = Qt.AlignBottom | Qt.AlignHCenter
+        palette = gantt.palette()
+        colors  = (palette.color(palette.Button).rgba(),
+                   palette.color(palette.ButtonText).rgba())
         
-        # create the gradient
-        gradient = QLinearGradient()
-        gradient.setStart(0, 0)
-        gradient.setFinalStop(0, height)
-        gradient.setColorAt(0, color)
-        gradient.setColorAt(1, color.darker(120))
+        # assign the bottom labels to their tiles in a single pass
+        tiles  = []
+        labels = self._labels
+        index  = 0
+        count  = len(labels)
         
-        # generate the tiles
-        tiles = []
-        painters = []
         for rect, label in self._topLabels:
-            tile_rect = QRectF(rect.x(), 0, rect.width(), height)
-            pixmap = QPixmap(rect.width(), height)
+            tile_rect   = QRectF(rect.x(), 0, rect.width(), height)
+            tile_labels = []
             
-            with XPainter(pixmap) as painter:
-                painter.setBrush(QBrush(gradient))
-                painter.drawRect(tile_rect)
-                
-                rx = 0
-                ry = 0
-                rw = rect.width()
-                rh = rect.height()
-                
-                painter.setPen(borderColor)
-                painter.drawRect(rx, ry, rw, rh)
-                
-                painter.setPen(textColor)
-                painter.drawText(rx, ry, rw, rh - 2, text_align, label)
-                
-                tiles.append((tile_rect, pixmap))
-                painters.append((tile_rect, pixmap, painter))
-        
-        # add bottom labels
-        for rect, label in self._labels:
-            for tile_rect, tile, painter in painters:
-                if tile_rect.x() <= rect.x() and \
-                   rect.right() <= tile_rect.right():
-                    rx = rect.x() - tile_rect.x()
-                    ry = rect.y()
-                    rw = rect.width()
-                    rh = rect.height()
-                    
-                    with painter:
-                        painter.setPen(borderColor)
-                        painter.drawRect(rx, ry, rw, rh)
-                        
-                        painter.setPen(textColor)
-                        painter.drawText(rx, ry, rw, rh - 2, text_align, label)
-
+            while index < count and labels[index][0].x() < rect.right():
+                label_rect, text = labels[index]
+                label_rect = label_rect.translated(-rect.x(), 0)
+                tile_labels.append((label_rect, text))
+                index += 1
+            
+            key = (scale,
+                   label,
+                   rect.width(),
+                   rect.height(),
+                   height,
+                   colors,
+                   tuple((label_rect.x(), label_rect.width(), text)
+                         for label_rect, text in tile_labels))
+            
+            tiles.append((tile_rect, key, rect, label, tile_labels))
+        
         self._tiles = tiles
+        self._tileEdges = [tile[0].right() for tile in tiles]
     
     def drawBackground(self, painter, rect):
         """
-        Draws the background for this scene.
+        Draws the background for this scene.  Only the exposed area is \
+        painted, with the column and row geometry calculated from the cell \
+        size rather than stored for the whole scene.
         
         :param      painter | <QPainter>
                     rect    | <QRect>
@@ -231,23 +245,60 @@ class XGanttScene(QGraphicsScene):
         if self._dirty:
             self.rebuild()
         
-        # draw the alternating rects
-        gantt   = self.ganttWidget()
+        gantt       = self.ganttWidget()
+        scene_rect  = self.sceneRect()
+        cell_width  = gantt.cellWidth()
+        cell_height = gantt.cellHeight()
+        
+        rect = QRectF(rect).intersected(scene_rect)
+        if rect.isEmpty() or cell_width <= 0 or cell_height <= 0:
+            return
+        
+        left    = rect.left()
+        right   = rect.right()
+        top     = rect.top()
+        bottom  = rect.bottom()
+        
+        # calculate the visible columns
+        first   = max(int(left // cell_width), 0)
+        last    = min(int(right // cell_width), self._columnCount - 1)
         
         # draw the alternating rects
         painter.setPen(Qt.NoPen)
         painter.setBrush(gantt.alternateBrush())
-        for rect in self._alternateRects:
-            painter.drawRect(rect)
+        index = bisect.bisect_left(self._alternateEdges, left)
+        for alt_rect in self._alternateRects[index:]:
+            if right < alt_rect.left():
+                break
+            painter.drawRect(QRectF(alt_rect.left(),
+                                    top,
+                                    alt_rect.width(),
+                                    rect.height()))
         
         # draw the weekends
-        painter.setBrush(gantt.weekendBrush())
-        for rect in self._weekendRects:
-            painter.drawRect(rect)
+        if self._weekStartDay:
+            painter.setBrush(gantt.weekendBrush())
+            for column in range(first, last + 1):
+                if 5 <= (self._weekStartDay + column - 1) % 7:
+                    painter.drawRect(QRectF(column * cell_width,
+                                            top,
+                                            cell_width,
+                                            rect.height()))
+        
+        # draw the column lines
+        lines = []
+        for column in range(first, last + 1):
+            x = column * cell_width
+            lines.append(QLineF(x, top, x, bottom))
+        
+        # draw the row lines
+        y = math.ceil(top / float(cell_height)) * cell_height
+        while y <= bottom and y < scene_rect.height():
+            lines.append(QLineF(left, y, right, y))
+            y += cell_height
         
-        # draw the default background
         painter.setPen(gantt.gridPen())
-        painter.drawLines(self._hlines + self._vlines)
+        painter.drawLines(lines)
     
     def ganttWidget(self):
         """
@@ -292,11 +343,26 @@ class XGanttScene(QGraphicsScene):
         
         opt = XGanttRenderOptions(**options)
         
-        # rebuild the minute timescale
         if scale in (gantt.Timescale.Minute, gantt.Timescale.Hour):
             opt.start = gantt.dateTimeStart()
             opt.end = gantt.dateTimeEnd()
-            
+        
+        # the header layout only depends on the timescale and date span, so
+        # a change to the scene height can reuse the current layout
+        layout_key = (scale,
+                      nativestring(opt.start.toString(Qt.ISODate)),
+                      nativestring(opt.end.toString(Qt.ISODate)),
+                      opt.cell_width,
+                      opt.header_height)
+        
+        if layout_key == self._layoutKey:
+            width = self._columnCount * opt.cell_width
+            self.setSceneRect(0, 0, width, opt.height)
+            self._dirty = False
+            return
+        
+        # rebuild the minute timescale
+        if scale in (gantt.Timescale.Minute, gantt.Timescale.Hour):
             self.rebuildHour(opt)
         
         # rebuild the day timescale
@@ -307,8 +373,43 @@ class XGanttScene(QGraphicsScene):
         elif scale == gantt.Timescale.Week:
             self.rebuildWeek(opt)
         
+        self._layoutKey = layout_key
+        self._alternateEdges = [alt_rect.right()
+                                for alt_rect in self._alternateRects]
         self.rebuildTiles()
 
+    def rebuildDependencies(self):
+        """
+        Rebuilds the dependency links for the endpoints that have been marked
+        dirty, building each link once.  Links outside of the visible area of
+        the views skip their path construction and are rebuilt when they 
+        scroll into view.
+        """
+        self._dependencyTimer.stop()
+        
+        # collect the unique links for the dirty endpoints
+        links = dict((id(link), link) for link in self._staleDependencies)
+        for endpoint in self._dirtyEndpoints:
+            for link in endpoint.dependencyItems():
+                links[id(link)] = link
+        
+        self._dirtyEndpoints.clear()
+        
+        visible = self.visibleRect()
+        if visible.isNull():
+            visible = None
+        
+        stale = set()
+        for link in links.values():
+            # hidden links are updated when their endpoints are shown
+            if link.scene() is not self or not link.isVisible():
+                continue
+            
+            if not link.rebuild(visible):
+                stale.add(link)
+        
+        self._staleDependencies = stale
+    
     def rebuildDay(self, opt):
         """
         Rebuilds the scale for the day mode.
@@ -316,9 +417,6 @@ class XGanttScene(QGraphicsScene):
         :param      opt | <XGanttRenderOptions>
         """
         self._labels            = []
-        self._hlines            = []
-        self._vlines            = []
-        self._weekendRects      = []
         self._alternateRects    = []
         self._topLabels         = []
         
@@ -352,9 +450,6 @@ class XGanttScene(QGraphicsScene):
                 else:
                     alt_rect = QRect(x, 0, 0, opt.height)
             
-            # create the line
-            self._hlines.append(QLine(x, 0, x, opt.height))
-            
             # create the header label/rect
             label = nativestring(curr.toString(label_format))[:-1]
             rect  = QRect(x, half, opt.cell_width, half)
@@ -378,14 +473,9 @@ class XGanttScene(QGraphicsScene):
         new_width = x
         self.setSceneRect(0, 0, new_width, opt.height)
         
-        # generate horizontal lines
-        y       = 0
-        h       = opt.height
-        width   = new_width
-        
-        while y < h:
-            self._vlines.append(QLine(0, y, width, y))
-            y += opt.cell_height
+        # store the column information for drawing the background
+        self._columnCount = i
+        self._weekStartDay = 0
         
         # clear the dirty flag
         self._dirty = False
@@ -397,9 +487,6 @@ class XGanttScene(QGraphicsScene):
         :param      opt | <XGanttRenderOptions>
         """
         self._labels            = []
-        self._hlines            = []
-        self._vlines            = []
-        self._weekendRects      = []
         self._alternateRects    = []
         self._topLabels         = []
         
@@ -437,9 +524,6 @@ class XGanttScene(QGraphicsScene):
                 else:
                     alt_rect = QRect(x, 0, 0, opt.height)
             
-            # create the line
-            self._hlines.append(QLine(x, 0, x, opt.height))
-            
             # create the header label/rect
             label = nativestring(curr.toString(label_format))
             rect  = QRect(x, half, opt.cell_width, half)
@@ -463,14 +547,9 @@ class XGanttScene(QGraphicsScene):
         new_width = x
         self.setSceneRect(0, 0, new_width, opt.height)
         
-        # generate horizontal lines
-        y       = 0
-        h       = opt.height
-        width   = new_width
-        
-        while y < h:
-            self._vlines.append(QLine(0, y, width, y))
-            y += opt.cell_height
+        # store the column information for drawing the background
+        self._columnCount = i
+        self._weekStartDay = 0
         
         # clear the dirty flag
         self._dirty = False
@@ -482,9 +561,6 @@ class XGanttScene(QGraphicsScene):
         :param      opt | <XOrbRenderOptions>
         """
         self._labels            = []
-        self._hlines            = []
-        self._vlines            = []
-        self._weekendRects      = []
         self._alternateRects    = []
         self._topLabels         = []
         
@@ -517,19 +593,11 @@ class XGanttScene(QGraphicsScene):
                 else:
                     alt_rect = QRect(x, 0, 0, opt.height)
             
-            # create the line
-            self._hlines.append(QLine(x, 0, x, opt.height))
-            
             # create the header label/rect
             label = nativestring(curr.toString(label_format))
             rect  = QRect(x, half, opt.cell_width, half)
             self._labels.append((rect, label))
             
-            # store weekend rectangles
-            if curr.dayOfWeek() in (6, 7):
-                rect = QRect(x, 0, opt.cell_width, opt.height)
-                self._weekendRects.append(rect)
-            
             # increment the dates
             curr = curr.addDays(increment)
             x += opt.cell_width
@@ -548,14 +616,9 @@ class XGanttScene(QGraphicsScene):
         new_width = x
         self.setSceneRect(0, 0, new_width, opt.height)
         
-        # generate horizontal lines
-        y       = 0
-        h       = opt.height
-        width   = new_width
-        
-        while y < h:
-            self._vlines.append(QLine(0, y, width, y))
-            y += opt.cell_height
+        # store the column information for drawing the background
+        self._columnCount = i
+        self._weekStartDay = opt.start.dayOfWeek()
         
         # clear the dirty flag
         self._dirty = False
@@ -573,6 +636,29 @@ class XGanttScene(QGraphicsScene):
         
         self._dirty = True
     
+    def removeDependencyItem(self, link):
+        """
+        Removes the inputed dependency link from this scene, along with any
+        pending rebuild for it.
+        
+        :param      link | <XGanttDepItem>
+        """
+        self._staleDependencies.discard(link)
+        if link.scene() is self:
+            self.removeItem(link)
+    
+    def setDependenciesDirty(self, item):
+        """
+        Marks the dependency links for the inputed item as needing to be 
+        rebuilt on the next pass through the event loop.
+        
+        :sa         rebuildDependencies
+        
+        :param      item | <XGanttWidgetItem>
+        """
+        self._dirtyEndpoints.add(item)
+        self._dependencyTimer.start()
+    
     def setDirty(self, state=True):
         """
         Sets the dirty state for this scene.  When the scene is dirty, it will
@@ -595,5 +681,90 @@ class XGanttScene(QGraphicsScene):
         
         if curr != QRectF(*args):
             self._dirty = True
-
+    
+    def tilePixmap(self, index):
+        """
+        Returns the header pixmap for the tile at the inputed index, \
+        rendering it if an identical tile is not already cached.
+        
+        :param      index | <int>
+        
+        :return     <QPixmap>
+        """
+        tile_rect, key, rect, label, tile_labels = self._tiles[index]
+        
+        pixmap = self._tileCache.get(key)
+        if pixmap is not None:
+            return pixmap
+        
+        gantt  = self.ganttWidget()
+        width  = rect.width()
+        height = tile_rect.height()
+        
+        # create the main color
+        palette     = gantt.palette()
+        color       = palette.color(palette.Button)
+        textColor   = palette.color(palette.ButtonText)
+        borderColor = color.darker(140)
+        text_align  = Qt.AlignBottom | Qt.AlignHCenter
+        
+        # create the gradient
+        gradient = QLinearGradient()
+        gradient.setStart(0, 0)
+        gradient.setFinalStop(0, height)
+        gradient.setColorAt(0, color)
+        gradient.setColorAt(1, color.darker(120))
+        
+        pixmap = QPixmap(width, height)
+        with XPainter(pixmap) as painter:
+            painter.setBrush(QBrush(gradient))
+            painter.drawRect(QRectF(0, 0, width, height))
+            
+            # draw the top label
+            rh = rect.height()
+            painter.setPen(borderColor)
+            painter.drawRect(0, 0, width, rh)
+            
+            painter.setPen(textColor)
+            painter.drawText(0, 0, width, rh - 2, text_align, label)
+            
+            # draw the bottom labels
+            for label_rect, text in tile_labels:
+                rx = label_rect.x()
+                ry = label_rect.y()
+                rw = label_rect.width()
+                rh = label_rect.height()
+                
+                painter.setPen(borderColor)
+                painter.drawRect(rx, ry, rw, rh)
+                
+                painter.setPen(textColor)
+                painter.drawText(rx, ry, rw, rh - 2, text_align, text)
+        
+        if len(self._tileCache) >= self.TileCacheSize:
+            self._tileCache.clear()
+        
+        self._tileCache[key] = pixmap
+        return pixmap
+    
+    def updateVisibleDependencies(self):
+        """
+        Schedules a rebuild for the dependency links that were skipped for
+        being outside of the visible area, for when the views are scrolled
+        or resized.
+        """
+        if self._staleDependencies:
+            self._dependencyTimer.start()
+    
+    def visibleRect(self):
+        """
+        Returns the area of this scene that is visible in its views.
+        
+        :return     <QRectF>
+        """
+        rect = QRectF()
+        for view in self.views():
+            view_rect = view.mapToScene(view.viewport().rect()).boundingRect()
+            rect = rect.united(view_rect)
+        return rect
 
@@ -22,6 +22,7 @@ from projexui.qt.QtCore   import QDate,\
                                  QSize,\
                                  QDateTime,\
                                  QTime,\
+                                 QTimer,\
                                  Qt,\
                                  QPoint
 
@@ -32,6 +33,7 @@ from projexui.qt.QtGui    import QWidget,\
                                  QColor,\
                                  QApplication,\
                                  QTreeWidgetItem,\
+                                 QTreeWidgetItemIterator,\
                                  QGraphicsItem
 
 from projex.enum import enum
@@ -69,6 +71,15 @@ class XGanttWidget(QWidget):
         self._timescale             = XGanttWidget.Timescale.Month
         self._scrolling             = False
         self._dirty                 = False
+        self._dirtyItems            = set()
+        self._rangeItems            = set()
+        self._layoutItems           = set()
+        
+        # dirty items are synced once per event loop
+        self._syncTimer = QTimer(self)
+        self._syncTimer.setSingleShot(True)
+        self._syncTimer.setInterval(0)
+        self._syncTimer.timeout.connect(self.syncDirtyItems)
         
         # setup the palette colors
         palette = self.palette()
@@ -109,8 +120,8 @@ class XGanttWidget(QWidget):
         self.uiGanttVIEW.setContextMenuPolicy(Qt.CustomContextMenu)
         
         # create connections
-        self.uiGanttTREE.itemExpanded.connect(self.syncView)
-        self.uiGanttTREE.itemCollapsed.connect(self.syncView)
+        self.uiGanttTREE.itemExpanded.connect(self._syncExpandedItem)
+        self.uiGanttTREE.itemCollapsed.connect(self._syncExpandedItem)
         
         # connect scrollbars
         tree_bar = self.uiGanttTREE.verticalScrollBar()
@@ -120,6 +131,12 @@ class XGanttWidget(QWidget):
         tree_bar.valueChanged.connect(self._scrollView)
         view_bar.valueChanged.connect(self._scrollTree)
         
+        # update the links that scroll into view
+        scene = self.uiGanttVIEW.scene()
+        for bar in (view_bar, self.uiGanttVIEW.horizontalScrollBar()):
+            bar.valueChanged.connect(scene.updateVisibleDependencies)
+            bar.rangeChanged.connect(scene.updateVisibleDependencies)
+        
         # connect selection
         self.uiGanttTREE.itemSelectionChanged.connect(self._selectView)
         self.uiGanttVIEW.scene().selectionChanged.connect(self._selectTree)
@@ -127,6 +144,30 @@ class XGanttWidget(QWidget):
         self.uiGanttTREE.customContextMenuRequested.connect(self.requestTreeMenu)
         self.uiGanttVIEW.customContextMenuRequested.connect(self.requestViewMenu)
     
+    def _nextItem(self, item):
+        """
+        Returns the first item that follows the inputed item and all of its
+        children in the tree.
+        
+        :param      item | <QTreeWidgetItem>
+        
+        :return     <QTreeWidgetItem> || None
+        """
+        tree = self.treeWidget()
+        while item is not None:
+            parent = item.parent()
+            if parent is not None:
+                index = parent.indexOfChild(item) + 1
+                if index < parent.childCount():
+                    return parent.child(index)
+            else:
+                index = tree.indexOfTopLevelItem(item) + 1
+                if index < tree.topLevelItemCount():
+                    return tree.topLevelItem(index)
+            
+            item = parent
+        return None
+    
     def _scrollTree( self, value ):
         """
         Updates the tree view scrolling to the inputed value.
@@ -155,6 +196,60 @@ class XGanttWidget(QWidget):
         view_bar.setValue(value)
         self._scrolling = False
     
+    def _shiftRows(self, items, synced):
+        """
+        Shifts the view items for the rows below each of the inputed expanded
+        or collapsed items to match the tree, skipping the synced items.
+        
+        :param      items  | [<XGanttWidgetItem>, ..]
+                    synced | {<XGanttWidgetItem>, ..}
+        """
+        tree = self.treeWidget()
+        offset_y  = tree.header().height() + 1
+        offset_y += tree.verticalScrollBar().value()
+        
+        rects = [(tree.visualItemRect(item), item) for item in items]
+        rects.sort(key=lambda x: x[0].y())
+        
+        for rect, item in rects:
+            # an item within a collapsed parent does not move any rows
+            if not rect.height():
+                continue
+            
+            below = self._nextItem(item)
+            if below is None:
+                continue
+            
+            delta = None
+            iterator = QTreeWidgetItemIterator(below)
+            while iterator.value():
+                row = iterator.value()
+                iterator += 1
+                
+                if row in synced:
+                    continue
+                
+                try:
+                    vitem = row.viewItem()
+                except AttributeError:
+                    continue
+                
+                # hidden rows will be synced when they are shown
+                if not vitem.isVisible():
+                    continue
+                
+                # measure the shift from the first visible row
+                if delta is None:
+                    row_y = tree.visualItemRect(row).y() + offset_y
+                    delta = row_y - vitem.pos().y()
+                    if not delta:
+                        break
+                
+                vitem.setSyncing(True)
+                vitem.moveBy(0, delta)
+                vitem.setSyncing(False)
+                row.syncDependencies()
+    
     def _selectTree( self ):
         """
         Matches the tree selection to the views selection.
@@ -199,6 +294,16 @@ class XGanttWidget(QWidget):
         rect.setHeight(max(widget_max, sbar_max))
         self.uiGanttVIEW.scene().setSceneRect(rect)
     
+    def _syncExpandedItem(self, item):
+        """
+        Marks the children of the inputed item dirty after it has been 
+        expanded or collapsed, along with the rows below it.
+        
+        :param      item | <XGanttWidgetItem>
+        """
+        self._layoutItems.add(item)
+        self.setItemDirty(item, recursive=True)
+    
     def addTopLevelItem(self, item):
         """
         Adds the inputed item to the gantt widget.
@@ -285,8 +390,16 @@ class XGanttWidget(QWidget):
         """
         Clears all the gantt widget items for this widget.
         """
+        self._syncTimer.stop()
+        self._dirtyItems.clear()
+        self._rangeItems.clear()
+        self._layoutItems.clear()
+        
+        scene = self.uiGanttVIEW.scene()
+        scene.clearDependencies()
+        
         self.uiGanttTREE.clear()
-        self.uiGanttVIEW.scene().clear()
+        scene.clear()
     
     def columns( self ):
         """
@@ -537,6 +650,22 @@ class XGanttWidget(QWidget):
         y = point.y()
         view.ensureVisible(x, y, 1, 1)
     
+    def setItemDirty(self, item, recursive=False):
+        """
+        Marks the inputed item as needing to be synced to the view.  Dirty
+        items are synced together on the next pass through the event loop.
+        
+        :sa         syncDirtyItems
+        
+        :param      item      | <XGanttWidgetItem>
+                    recursive | <bool>
+        """
+        self._dirtyItems.add(item)
+        if recursive:
+            self._dirtyItems.update(item.children(recursive=True))
+        
+        self._syncTimer.start()
+    
     def setGridPen( self, pen ):
         """
         Sets the pen used to draw the grid lines for the view.
@@ -545,6 +674,18 @@ class XGanttWidget(QWidget):
         """
         self._gridPen = QPen(pen)
     
+    def setRangeDirty(self, item):
+        """
+        Marks the inputed item as needing its range, and the ranges of its
+        parents, adjusted to the limits of their children.
+        
+        :sa         syncDirtyItems
+        
+        :param      item | <XGanttWidgetItem>
+        """
+        self._rangeItems.add(item)
+        self._syncTimer.start()
+    
     def setTimescale( self, timescale ):
         """
         Sets the timescale value for this widget to the inputed value.
@@ -609,12 +750,17 @@ class XGanttWidget(QWidget):
         
         if state:
             self._updateViewRect()
+            self._dirtyItems.clear()
+            self._layoutItems.clear()
+            
             for i in range(self.topLevelItemCount()):
                 item = self.topLevelItem(i)
                 try:
                     item.sync(recursive=True)
                 except AttributeError:
                     continue
+            
+            self.syncDirtyItems()
 
     def setWeekendBrush( self, brush ):
         """
@@ -624,6 +770,60 @@ class XGanttWidget(QWidget):
         """
         self._weekendBrush = QBrush(brush)
     
+    def syncDirtyItems(self):
+        """
+        Syncs the items that have been marked dirty to the view.  Pending range
+        adjustments are rolled up through the parents in one bottom-up pass,
+        then only the affected rows are synced and the rows below any
+        expanded or collapsed items are shifted into place.
+        """
+        if not self.updatesEnabled():
+            return
+        
+        self._syncTimer.stop()
+        
+        items   = self._dirtyItems
+        ranges  = self._rangeItems
+        layouts = self._layoutItems
+        
+        self._dirtyItems  = set()
+        self._rangeItems  = set()
+        self._layoutItems = set()
+        
+        # collect the pending items and their parents by depth
+        groups = {}
+        for item in ranges:
+            chain = []
+            while item is not None:
+                chain.append(item)
+                item = item.parent()
+            
+            for depth, group in enumerate(reversed(chain)):
+                groups[id(group)] = (depth, group)
+        
+        # roll up the ranges from the deepest items first
+        for depth, group in sorted(groups.values(),
+                                   key=lambda x: x[0],
+                                   reverse=True):
+            try:
+                changed = group.adjustRange(recursive=False)
+            except AttributeError:
+                continue
+            
+            if changed:
+                group.syncTree()
+                items.add(group)
+        
+        # sync the affected rows
+        for item in items:
+            try:
+                item.syncView()
+            except AttributeError:
+                continue
+        
+        if layouts:
+            self._shiftRows(layouts, items)
+    
     def syncView(self):
         """
         Syncs all the items to the view.
@@ -631,6 +831,9 @@ class XGanttWidget(QWidget):
         if not self.updatesEnabled():
             return
         
+        self._dirtyItems.clear()
+        self._layoutItems.clear()
+        
         for item in self.topLevelItems():
             try:
                 item.syncView(recursive=True)
@@ -134,18 +134,31 @@ class XGanttWidgetItem(XTreeWidgetItem):
             else:
                 child.setDateStart(child.dateStart().addDays(delta))
             child.blockAdjustments('range', False)
+        
+        # resync the shifted children with the next view update
+        gantt = self.ganttWidget()
+        if gantt:
+            gantt.setItemDirty(self, recursive=True)
     
     def adjustRange(self, recursive=True):
         """
         Adjust the start and end ranges for this item based on the limits from
-        its children.  This method will only apply to group items.
+        its children.  This method will only apply to group items.  When 
+        recursive, the change is rolled up through the parents immediately,
+        stopping at the first parent whose range is unaffected, and only the
+        view sync of the changed items is queued with the gantt widget.
+        
+        :sa         XGanttWidget.setItemDirty
         
         :param      recursive | <bool>
+        
+        :return     <bool> | changed
         """
-        if ( self.adjustmentsBlocked('range') ):
-            return
+        if self.adjustmentsBlocked('range'):
+            return False
         
-        if ( self.itemStyle() == self.ItemStyle.Group ):
+        changed = False
+        if self.itemStyle() == self.ItemStyle.Group:
             dateStart = self.dateStart()
             dateEnd   = self.dateEnd()
             first     = True
@@ -161,13 +174,36 @@ class XGanttWidgetItem(XTreeWidgetItem):
                     dateStart   = min(child.dateStart(), dateStart)
                     dateEnd     = max(child.dateEnd(), dateEnd)
             
+            changed = dateStart != self._dateStart or \
+                      dateEnd != self._dateEnd
+            
             self._dateStart = dateStart
             self._dateEnd   = dateEnd
+        
+        if not recursive:
+            return changed
+        
+        gantt = self.ganttWidget()
+        item = self
+        item_changed = changed
+        while True:
+            if item_changed:
+                item.syncTree()
+                if gantt:
+                    gantt.setItemDirty(item)
+                else:
+                    item.syncView()
+            
+            parent = item.parent()
+            if parent is None:
+                break
             
-            self.sync()
+            item_changed = parent.adjustRange(recursive=False)
+            if not item_changed:
+                break
+            item = parent
         
-        if ( self.parent() and recursive ):
-            self.parent().adjustRange(True)
+        return changed
     
     def blockAdjustments(self, key, state):
         """
@@ -190,7 +226,7 @@ class XGanttWidgetItem(XTreeWidgetItem):
         
         for target, viewItem in self._dependencies.items():
             target._reverseDependencies.pop(self)
-            scene.removeItem(viewItem)
+            scene.removeDependencyItem(viewItem)
         
         self._dependencies.clear()
     
@@ -242,6 +278,16 @@ class XGanttWidgetItem(XTreeWidgetItem):
         """
         return self._dependencies.keys()
     
+    def dependencyItems(self):
+        """
+        Returns the view items for the dependencies linked to and from this
+        item.
+        
+        :return     [<XGanttDepItem>, ..]
+        """
+        return self._dependencies.values() + \
+               self._reverseDependencies.values()
+    
     def duration(self):
         """
         Returns the number of days this gantt item represents.
@@ -341,7 +387,7 @@ class XGanttWidgetItem(XTreeWidgetItem):
         scene.removeItem(self.viewItem())
         for target, viewItem in self._dependencies.items():
             target._reverseDependencies.pop(self)
-            scene.removeItem(viewItem)
+            scene.removeDependencyItem(viewItem)
     
     def setAllDay(self, state):
         """
@@ -509,7 +555,10 @@ class XGanttWidgetItem(XTreeWidgetItem):
 
     def syncDependencies(self, recursive=False):
         """
-        Syncs the dependencies for this item to the view.
+        Syncs the dependencies for this item to the view.  The dependency
+        paths are rebuilt by the scene on its next dependency update.
+        
+        :sa         XGanttScene.rebuildDependencies
         
         :param      recurisve | <bool>
         """
@@ -517,17 +566,16 @@ class XGanttWidgetItem(XTreeWidgetItem):
         if not scene:
             return
         
-        visible       = self.viewItem().isVisible()
-        depViewItems  = self._dependencies.values() 
-        depViewItems += self._reverseDependencies.values()
+        visible = self.viewItem().isVisible()
         
-        for depViewItem in depViewItems:
+        for depViewItem in self.dependencyItems():
             if not depViewItem.scene():
                 scene.addItem(depViewItem)
             
-            depViewItem.rebuild()
             depViewItem.setVisible(visible)
         
+        scene.setDependenciesDirty(self)
+        
         if recursive:
             for c in range(self.childCount()):
                 self.child(c).syncDependencies(recursive = True)
@@ -688,7 +736,7 @@ class XGanttWidgetItem(XTreeWidgetItem):
         
         scene    = viewItem.scene()
         if ( scene ):
-            scene.removeItem(viewItem)
+            scene.removeDependencyItem(viewItem)
     
     def timeEnd(self):
         """
@@ -63,6 +63,13 @@ class XLoggerWidget(QtGui.QTextEdit):
         self._loggers       = set()
         self._configurable  = True
         self._destroyed     = False
+        self._pending       = []
+        self._pendingMutex  = QtCore.QMutex()
+        
+        # pending messages are flushed to the document once per frame
+        self._flushTimer    = QtCore.QTimer(self)
+        self._flushTimer.setSingleShot(True)
+        self._flushTimer.setInterval(16)
         
         # define the popup button for congfiguration
         self._configButton  = XPopupButton(self)
@@ -107,6 +114,7 @@ class XLoggerWidget(QtGui.QTextEdit):
         
         # create connections
         self._handler.dispatch().messageLogged.connect(self.log)
+        self._flushTimer.timeout.connect(self.flushMessages)
         self.destroyed.connect(self.markDestroyed)
     
     def activeLevels(self):
@@ -154,6 +162,10 @@ class XLoggerWidget(QtGui.QTextEdit):
         self.markDestroyed()
     
     def clear(self):
+        locker = QtCore.QMutexLocker(self._pendingMutex)
+        self._pending = []
+        locker.unlock()
+        
         super(XLoggerWidget, self).clear()
         
         self._currentMode = 'standard'
@@ -244,6 +256,49 @@ class XLoggerWidget(QtGui.QTextEdit):
         """
         self.log(logging.FATAL, msg)
     
+    def flushMessages(self):
+        """
+        Inserts all of the pending messages into the document as a single \
+        edit block, grouping consecutive messages of the same level into \
+        one insertion, and then scrolls to the end once.
+        """
+        locker = QtCore.QMutexLocker(self._pendingMutex)
+        pending = self._pending
+        self._pending = []
+        locker.unlock()
+        
+        if not pending or self.isDestroyed():
+            return
+        
+        try:
+            cursor = QtGui.QTextCursor(self.document())
+            cursor.movePosition(QtGui.QTextCursor.End)
+            cursor.beginEditBlock()
+            
+            newline = bool(cursor.block().text())
+            
+            i = 0
+            count = len(pending)
+            while i < count:
+                level = pending[i][0]
+                lines = []
+                while i < count and pending[i][0] == level:
+                    lines.append(pending[i][1])
+                    i += 1
+                
+                text = '\n'.join(lines)
+                if newline:
+                    text = '\n' + text
+                newline = True
+                
+                self.setCurrentMode(level)
+                cursor.insertText(text, self.currentCharFormat())
+            
+            cursor.endEditBlock()
+            self.scrollToEnd()
+        except RuntimeError:
+            return
+    
     def formatText(self):
         """
         Returns the text that is used to format entries that are logged
@@ -313,17 +368,25 @@ class XLoggerWidget(QtGui.QTextEdit):
         if self.isDestroyed():
             return
         
-        locker = QtCore.QMutexLocker(self._mutex)
-        try:
-            msg = projex.text.nativestring(msg)
-            self.moveCursor(QtGui.QTextCursor.End)
-            self.setCurrentMode(level)
-            if self.textCursor().block().text():
-                self.insertPlainText('\n')
-            self.insertPlainText(msg.lstrip('\n\r'))
-            self.scrollToEnd()
-        except RuntimeError:
-            return
+        msg = projex.text.nativestring(msg)
+        
+        locker = QtCore.QMutexLocker(self._pendingMutex)
+        scheduled = bool(self._pending)
+        self._pending.append((level, msg.lstrip('\n\r')))
+        locker.unlock()
+        
+        # timers can only be started from the thread they live in, and only
+        # need to be started once per batch of pending messages
+        if not scheduled:
+            try:
+                if QtCore.QThread.currentThread() == self.thread():
+                    self._flushTimer.start()
+                else:
+                    QtCore.QMetaObject.invokeMethod(self._flushTimer,
+                                                    'start',
+                                                    QtCore.Qt.QueuedConnection)
+            except RuntimeError:
+                return
         
         if not self.signalsBlocked():
             self.messageLogged.emit(level, msg)
@@ -361,6 +424,30 @@ class XLoggerWidget(QtGui.QTextEdit):
     def markDestroyed(self):
         self._destroyed = True
     
+    def moveCursor(self, operation, mode=QtGui.QTextCursor.MoveAnchor):
+        """
+        Overloads the base method to insert any pending messages before \
+        moving to the end of the document, so text written at the end \
+        stays ordered after the logged output.
+        
+        :param      operation | <QtGui.QTextCursor.MoveOperation>
+                    mode      | <QtGui.QTextCursor.MoveMode>
+        """
+        if operation == QtGui.QTextCursor.End:
+            self.flushMessages()
+        
+        super(XLoggerWidget, self).moveCursor(operation, mode)
+    
+    def maximumBlockCount(self):
+        """
+        Returns the maximum number of lines that will be kept in this \
+        widget before the oldest lines are removed.  A value of 0 will \
+        keep all lines.
+        
+        :return     <int>
+        """
+        return self.document().maximumBlockCount()
+    
     def resizeEvent(self, event):
         super(XLoggerWidget, self).resizeEvent(event)
         
@@ -552,6 +639,17 @@ class XLoggerWidget(QtGui.QTextEdit):
         """
         pass
     
+    def setMaximumBlockCount(self, count):
+        """
+        Sets the maximum number of lines that will be kept in this widget \
+        before the oldest lines are removed.  A value of 0, the default, \
+        will keep all lines.  Note that the document's undo/redo stack is \
+        disabled while a maximum is set.
+        
+        :param      count | <int>
+        """
+        self.document().setMaximumBlockCount(count)
+    
     @deprecatedmethod('2.1', 'You should now use the setFormatText method.')
     def setShowDetails(self, state):
         pass
@@ -0,0 +1,248 @@
+#!/usr/bin/python
+
+""" Defines an on-disk, indexed store for logging records. """
+
+# define authorship information
+__authors__         = ['Eric Hulser']
+__author__          = ','.join(__authors__)
+__credits__         = []
+__copyright__       = 'Copyright (c) 2011, Projex Software'
+__license__         = 'LGPL'
+
+# maintanence information
+__maintainer__      = 'Projex Software'
+__email__           = 'team@projexsoftware.com'
+
+#------------------------------------------------------------------------------
+
+import datetime
+import logging
+import sqlite3
+
+def createdText(created):
+    """
+    Returns the display text for a record's creation time.
+
+    :param      created | <float> | seconds since the epoch
+
+    :return     <str>
+    """
+    if created is None:
+        return ''
+    return str(datetime.datetime.fromtimestamp(created))
+
+def relativeText(relativeCreated):
+    """
+    Returns the display text for a record's relative creation time.
+
+    :param      relativeCreated | <float> | milliseconds
+
+    :return     <str>
+    """
+    if relativeCreated is None:
+        return ''
+    return '% 10.4f' % (relativeCreated / 1000.0)
+
+#------------------------------------------------------------------------------
+
+class XLogRecordDatabase(object):
+    """
+    Append-only SQLite store for logging records, indexed by level, logger \
+    name and creation time.  Records are read back in pages as plain \
+    logging.LogRecord instances, so a session can be scrolled through long \
+    after the records have left memory.
+    """
+    Fields = [
+        ('levelname',       'TEXT'),
+        ('levelno',         'INTEGER'),
+        ('name',            'TEXT'),
+        ('created',         'REAL'),
+        ('message',         'TEXT'),
+        ('relativeCreated', 'REAL'),
+        ('filename',        'TEXT'),
+        ('module',          'TEXT'),
+        ('funcName',        'TEXT'),
+        ('lineno',          'INTEGER'),
+        ('pathname',        'TEXT'),
+        ('process',         'INTEGER'),
+        ('processName',     'TEXT'),
+        ('thread',          'INTEGER'),
+        ('threadName',      'TEXT'),
+    ]
+
+    # fields that are stored as raw values but displayed as formatted text,
+    # filtering matches against the same text the view shows
+    DisplayFunctions = {
+        'created':          ('createdText', createdText),
+        'relativeCreated':  ('relativeText', relativeText),
+    }
+
+    def __init__(self, filename=':memory:'):
+        self._filename = filename
+        self._connection = sqlite3.connect(filename)
+        for name, func in self.DisplayFunctions.values():
+            self._connection.create_function(name, 1, func)
+
+        names = [name for name, _ in self.Fields]
+        self._columns = ', '.join(names)
+        self._insert = 'INSERT INTO records ({0}) VALUES ({1})'.format(
+                            self._columns,
+                            ', '.join(['?'] * len(names)))
+
+        fields = ', '.join(['{0} {1}'.format(*f) for f in self.Fields])
+        with self._connection as conn:
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS records '
+                         '(id INTEGER PRIMARY KEY, {0})'.format(fields))
+            conn.execute('CREATE INDEX IF NOT EXISTS records_levelno '
+                         'ON records (levelno)')
+            conn.execute('CREATE INDEX IF NOT EXISTS records_name '
+                         'ON records (name)')
+            conn.execute('CREATE INDEX IF NOT EXISTS records_created '
+                         'ON records (created)')
+
+    def addRecords(self, records):
+        """
+        Appends the inputed records to the database in a single transaction.
+
+        :param      records | [<logging.LogRecord>, ..]
+
+        :return     <int> | the id of the last record
+        """
+        rows = []
+        for record in records:
+            row = []
+            for name, _ in self.Fields:
+                if name == 'message':
+                    try:
+                        value = record.message
+                    except AttributeError:
+                        value = record.getMessage()
+                else:
+                    value = getattr(record, name, None)
+                row.append(value)
+            rows.append(row)
+
+        with self._connection as conn:
+            conn.executemany(self._insert, rows)
+
+        return self.maximumId()
+
+    def clear(self):
+        """
+        Removes all the records from the database.
+        """
+        with self._connection as conn:
+            conn.execute('DELETE FROM records')
+
+    def close(self):
+        """
+        Closes the connection to the database file.
+        """
+        self._connection.close()
+
+    def count(self, where='', args=()):
+        """
+        Returns the number of records matching the inputed where clause.
+
+        :param      where | <str>
+                    args  | (<variant>, ..)
+
+        :return     <int>
+        """
+        sql = 'SELECT COUNT(*) FROM records'
+        if where:
+            sql += ' WHERE ' + where
+        return self._connection.execute(sql, args).fetchone()[0]
+
+    def filename(self):
+        """
+        Returns the filename for this database.
+
+        :return     <str>
+        """
+        return self._filename
+
+    def maximumId(self):
+        """
+        Returns the id of the newest record in the database.
+
+        :return     <int>
+        """
+        sql = 'SELECT MAX(id) FROM records'
+        return self._connection.execute(sql).fetchone()[0] or 0
+
+    def minimumId(self):
+        """
+        Returns the id of the oldest record in the database.
+
+        :return     <int>
+        """
+        sql = 'SELECT MIN(id) FROM records'
+        return self._connection.execute(sql).fetchone()[0] or 0
+
+    def records(self, where='', args=(), limit=-1, offset=0):
+        """
+        Returns the records matching the inputed where clause in the order \
+        they were added.  Each record will have its database id assigned \
+        to its recordId attribute.
+
+        :param      where  | <str>
+                    args   | (<variant>, ..)
+                    limit  | <int>
+                    offset | <int>
+
+        :return     [<logging.LogRecord>, ..]
+        """
+        sql = 'SELECT id, {0} FROM records'.format(self._columns)
+        if where:
+            sql += ' WHERE ' + where
+        sql += ' ORDER BY id LIMIT ? OFFSET ?'
+
+        names = ['recordId'] + [name for name, _ in self.Fields]
+        output = []
+        for row in self._connection.execute(sql, tuple(args) + (limit, offset)):
+            data = dict(zip(names, row))
+            data['msg'] = data['message']
+            data['args'] = None
+            output.append(logging.makeLogRecord(data))
+        return output
+
+    def whereClause(self, levels=None, terms=None, columns=None):
+        """
+        Generates the where clause for the inputed filter options.  Each \
+        term needs to be found within the display text of the inputed \
+        columns for a record to match.
+
+        :param      levels  | [<int>, ..] || None
+                    terms   | [<str>, ..] || None
+                    columns | [<int>, ..] || None | field indexes
+
+        :return     (<str> where, (<variant>, ..) args)
+        """
+        clauses = []
+        args = []
+
+        if levels:
+            marks = ', '.join(['?'] * len(levels))
+            clauses.append('levelno IN ({0})'.format(marks))
+            args += list(levels)
+
+        if terms:
+            columns = columns or range(len(self.Fields))
+            exprs = []
+            for c in columns:
+                field = self.Fields[c][0]
+                func = self.DisplayFunctions.get(field)
+                if func:
+                    field = '{0}({1})'.format(func[0], field)
+                exprs.append("COALESCE({0}, '')".format(field))
+            text = " || ' ' || ".join(exprs)
+
+            for term in terms:
+                term = term.replace('\\', '\\\\')
+                term = term.replace('%', '\\%').replace('_', '\\_')
+                clauses.append("({0}) LIKE ? ESCAPE '\\'".format(text))
+                args.append('%' + term + '%')
+
+        return ' AND '.join(clauses), tuple(args)
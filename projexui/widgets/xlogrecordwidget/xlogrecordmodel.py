@@ -0,0 +1,623 @@
+#!/usr/bin/python
+
+""" Defines a bounded, lazily formatted item model for logging records. """
+
+# define authorship information
+__authors__         = ['Eric Hulser']
+__author__          = ','.join(__authors__)
+__credits__         = []
+__copyright__       = 'Copyright (c) 2011, Projex Software'
+__license__         = 'LGPL'
+
+# maintanence information
+__maintainer__      = 'Projex Software'
+__email__           = 'team@projexsoftware.com'
+
+#------------------------------------------------------------------------------
+
+import bisect
+import collections
+import logging
+
+from projex.text import nativestring
+from xqt import wrapVariant, QtGui, QtCore
+
+from .xlogrecorddatabase import createdText, relativeText
+
+def _message(record):
+    try:
+        return record.message
+    except AttributeError:
+        return record.getMessage()
+
+class XLogRecordStore(object):
+    """
+    Fixed capacity ring buffer for logging records.  Appending a record is \
+    O(1) and once the store is full the oldest record is overwritten, so \
+    memory usage stays flat no matter how many records are logged.
+
+    Every record is assigned an increasing sequence number, which remains \
+    valid until the record is evicted from the store.
+    """
+    def __init__(self, maximum=10000):
+        self._maximum   = max(1, maximum)
+        self._records   = []
+        self._start     = 0
+        self._count     = 0
+        self._first     = 0
+
+    def __iter__(self):
+        for i in xrange(self._count):
+            yield self.at(i)
+
+    def __len__(self):
+        return self._count
+
+    def append(self, record):
+        """
+        Appends the inputed record to the store, overwriting the oldest \
+        record when the store is full.
+
+        :param      record | <logging.LogRecord>
+
+        :return     <bool> | whether or not a record was evicted
+        """
+        if self._count == self._maximum:
+            self._records[self._start] = record
+            self._start = (self._start + 1) % self._maximum
+            self._first += 1
+            return True
+
+        index = (self._start + self._count) % self._maximum
+        if index == len(self._records):
+            self._records.append(record)
+        else:
+            self._records[index] = record
+
+        self._count += 1
+        return False
+
+    def at(self, row):
+        """
+        Returns the record at the inputed row, where row 0 is the oldest \
+        record in the store.
+
+        :param      row | <int>
+
+        :return     <logging.LogRecord>
+        """
+        return self._records[(self._start + row) % self._maximum]
+
+    def clear(self):
+        """
+        Removes all the records from this store.
+        """
+        self._first += self._count
+        self._records = []
+        self._start = 0
+        self._count = 0
+
+    def discard(self, count):
+        """
+        Removes the inputed number of oldest records from this store.
+
+        :param      count | <int>
+        """
+        count = min(count, self._count)
+        for i in xrange(count):
+            self._records[self._start] = None
+            self._start = (self._start + 1) % self._maximum
+
+        self._first += count
+        self._count -= count
+
+    def first(self):
+        """
+        Returns the sequence number for the oldest record in this store.
+
+        :return     <int>
+        """
+        return self._first
+
+    def maximum(self):
+        """
+        Returns the maximum number of records this store will hold.
+
+        :return     <int>
+        """
+        return self._maximum
+
+    def record(self, sequence):
+        """
+        Returns the record for the inputed sequence number.
+
+        :param      sequence | <int>
+
+        :return     <logging.LogRecord>
+        """
+        return self.at(sequence - self._first)
+
+    def setMaximum(self, maximum):
+        """
+        Sets the maximum number of records this store will hold, discarding \
+        the oldest records if there are more than the new maximum.
+
+        :param      maximum | <int>
+        """
+        maximum = max(1, maximum)
+        records = list(self)[-maximum:]
+
+        self._first += self._count - len(records)
+        self._maximum = maximum
+        self._records = records
+        self._start = 0
+        self._count = len(records)
+
+#------------------------------------------------------------------------------
+
+class XLogRecordModel(QtCore.QAbstractTableModel):
+    """
+    Table model for displaying logging records from an XLogRecordStore.  The \
+    column text is generated on demand when the view requests it, so only \
+    the rows and columns that are visible are ever formatted.
+    """
+    Colors = {
+        logging.DEBUG:      'gray',
+        logging.INFO:       'blue',
+        logging.SUCCESS:    'darkGreen',
+        logging.WARNING:    'brown',
+        logging.ERROR:      'darkRed',
+        logging.CRITICAL:   'darkRed'
+    }
+
+    Columns = [
+        ('Level',       lambda r: r.levelname),
+        ('Level #',     lambda r: r.levelno),
+        ('Name',        lambda r: r.name),
+        ('Created at',  lambda r: createdText(r.created)),
+        ('Message',     _message),
+        ('Relative time (secs)',
+            lambda r: relativeText(r.relativeCreated)),
+        ('Filename',    lambda r: r.filename),
+        ('Module',      lambda r: r.module),
+        ('Function',    lambda r: r.funcName),
+        ('Line #',      lambda r: r.lineno),
+        ('Path',        lambda r: r.pathname),
+        ('Process ID',  lambda r: r.process),
+        ('Process Name', lambda r: r.processName),
+        ('Thread',      lambda r: r.thread),
+        ('Thread Name', lambda r: r.threadName),
+    ]
+
+    def __init__(self, parent=None, maximum=10000):
+        super(XLogRecordModel, self).__init__(parent)
+
+        # define custom properties
+        self._store         = XLogRecordStore(maximum)
+        self._activeLevels  = []
+        self._filterText    = ''
+        self._filterTerms   = []
+        self._filterColumns = []
+        self._brushes       = {}
+
+        # sequence numbers for the accepted records while filtering, the
+        # leading entries before the row offset have been evicted
+        self._rows          = None
+        self._rowOffset     = 0
+
+    def activeLevels(self):
+        """
+        Returns the levels that are accepted by this model.  An empty list \
+        will accept all levels.
+
+        :return     [<int>, ..]
+        """
+        return self._activeLevels
+
+    def acceptsRecord(self, record):
+        """
+        Returns whether or not the inputed record passes the active levels \
+        and filter text for this model.
+
+        :param      record | <logging.LogRecord>
+
+        :return     <bool>
+        """
+        if self._activeLevels and record.levelno not in self._activeLevels:
+            return False
+
+        if not self._filterTerms:
+            return True
+
+        columns = self._filterColumns or range(len(self.Columns))
+        text = ' '.join([nativestring(self.Columns[c][1](record))
+                        for c in columns])
+        text = text.lower()
+
+        for term in self._filterTerms:
+            if term not in text:
+                return False
+        return True
+
+    def addRecords(self, records):
+        """
+        Appends the inputed records to this model, evicting the oldest \
+        records once the maximum record count is reached.
+
+        :param      records | [<logging.LogRecord>, ..]
+        """
+        maximum = self._store.maximum()
+        records = list(records)[-maximum:]
+        if not records:
+            return
+
+        store = self._store
+
+        # make room for the new records
+        evict = len(store) + len(records) - maximum
+        if evict > 0:
+            if self._rows is None:
+                count = evict
+            else:
+                offset = bisect.bisect_left(self._rows,
+                                            store.first() + evict,
+                                            self._rowOffset)
+                count = offset - self._rowOffset
+
+            if count:
+                self.beginRemoveRows(QtCore.QModelIndex(), 0, count - 1)
+
+            store.discard(evict)
+
+            # compact the filtered rows once half of them are stale
+            if self._rows is not None:
+                self._rowOffset += count
+                if self._rowOffset > len(self._rows) / 2:
+                    self._rows = self._rows[self._rowOffset:]
+                    self._rowOffset = 0
+
+            if count:
+                self.endRemoveRows()
+
+        # append the new records
+        if self._rows is None:
+            row = len(store)
+            self.beginInsertRows(QtCore.QModelIndex(),
+                                 row,
+                                 row + len(records) - 1)
+            for record in records:
+                store.append(record)
+            self.endInsertRows()
+        else:
+            accepted = []
+            for record in records:
+                if self.acceptsRecord(record):
+                    accepted.append(store.first() + len(store))
+                store.append(record)
+
+            if accepted:
+                row = self.rowCount()
+                self.beginInsertRows(QtCore.QModelIndex(),
+                                     row,
+                                     row + len(accepted) - 1)
+                self._rows += accepted
+                self.endInsertRows()
+
+    def clear(self):
+        """
+        Removes all the records from this model.
+        """
+        self.beginResetModel()
+        self._store.clear()
+        if self._rows is not None:
+            self._rows = []
+            self._rowOffset = 0
+        self.endResetModel()
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.Columns)
+
+    def columnNames(self):
+        """
+        Returns the names of the columns for this model.
+
+        :return     [<str>, ..]
+        """
+        return [column[0] for column in self.Columns]
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return wrapVariant(None)
+
+        if role == QtCore.Qt.DisplayRole:
+            record = self.recordAt(index.row())
+            return wrapVariant(self.Columns[index.column()][1](record))
+
+        elif role == QtCore.Qt.ForegroundRole:
+            record = self.recordAt(index.row())
+            try:
+                brush = self._brushes[record.levelno]
+            except KeyError:
+                clr = self.Colors.get(record.levelno)
+                brush = QtGui.QBrush(QtGui.QColor(clr)) if clr else None
+                self._brushes[record.levelno] = brush
+
+            if brush is not None:
+                return wrapVariant(brush)
+
+        return wrapVariant(None)
+
+    def filterColumns(self):
+        """
+        Returns the column indexes that the filter text will be matched \
+        against.  An empty list will match against all columns.
+
+        :return     [<int>, ..]
+        """
+        return self._filterColumns
+
+    def filterText(self):
+        """
+        Returns the text used to filter the records for this model.
+
+        :return     <str>
+        """
+        return self._filterText
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and \
+           role == QtCore.Qt.DisplayRole and \
+           0 <= section < len(self.Columns):
+            return wrapVariant(self.Columns[section][0])
+        return wrapVariant(None)
+
+    def maximumRecordCount(self):
+        """
+        Returns the maximum number of records this model will hold.
+
+        :return     <int>
+        """
+        return self._store.maximum()
+
+    def recordAt(self, row):
+        """
+        Returns the record for the inputed row.
+
+        :param      row | <int>
+
+        :return     <logging.LogRecord>
+        """
+        if self._rows is None:
+            return self._store.at(row)
+        return self._store.record(self._rows[self._rowOffset + row])
+
+    def refilter(self):
+        """
+        Rebuilds the filtered rows for this model based on its active levels \
+        and filter text.
+        """
+        self.beginResetModel()
+        if not (self._activeLevels or self._filterTerms):
+            self._rows = None
+        else:
+            first = self._store.first()
+            self._rows = [first + i for i, record in enumerate(self._store)
+                          if self.acceptsRecord(record)]
+        self._rowOffset = 0
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._rows is None:
+            return len(self._store)
+        return len(self._rows) - self._rowOffset
+
+    def setActiveLevels(self, levels):
+        """
+        Sets the levels that are accepted by this model.
+
+        :param      levels | [<int>, ..]
+        """
+        self._activeLevels = list(levels or [])
+        self.refilter()
+
+    def setFilterColumns(self, columns):
+        """
+        Sets the column indexes that the filter text will be matched against.
+
+        :param      columns | [<int>, ..]
+        """
+        self._filterColumns = list(columns or [])
+        if self._filterTerms:
+            self.refilter()
+
+    def setFilterText(self, text):
+        """
+        Sets the text used to filter the records for this model.  Each \
+        whitespace separated term needs to be found within the filter \
+        columns for a record to be displayed.
+
+        :param      text | <str>
+        """
+        self._filterText = nativestring(text)
+        self._filterTerms = self._filterText.lower().split()
+        self.refilter()
+
+    def setMaximumRecordCount(self, count):
+        """
+        Sets the maximum number of records this model will hold, discarding \
+        the oldest records when lowered.
+
+        :param      count | <int>
+        """
+        self.beginResetModel()
+        self._store.setMaximum(count)
+        self.endResetModel()
+
+        if self._rows is not None:
+            self.refilter()
+
+    def store(self):
+        """
+        Returns the record store for this model.
+
+        :return     <XLogRecordStore>
+        """
+        return self._store
+
+#------------------------------------------------------------------------------
+
+class XLogRecordDatabaseModel(XLogRecordModel):
+    """
+    Table model for displaying logging records from an XLogRecordDatabase. \
+    Records are paged in from the database as the view requests them and \
+    only the most recently used pages are kept in memory.
+    """
+    PageSize = 256
+    MaximumPages = 64
+
+    def __init__(self, database, parent=None, maximum=10000):
+        super(XLogRecordDatabaseModel, self).__init__(parent, maximum)
+
+        # define custom properties
+        self._database  = database
+        self._pages     = collections.OrderedDict()
+        self._count     = 0
+        self._firstId   = None
+        self._lastId    = 0
+        self._where     = ('', ())
+
+        self.refilter()
+
+    def _fetchPage(self, page):
+        """
+        Loads the records for the inputed page from the database.
+
+        :param      page | <int>
+
+        :return     [<logging.LogRecord>, ..]
+        """
+        db = self._database
+        where, args = self._where
+        prev = self._pages.get(page - 1)
+
+        # unfiltered ids are contiguous, so the page can be found directly
+        if not where:
+            if self._firstId is None:
+                self._firstId = db.minimumId()
+            first = self._firstId + page * self.PageSize
+            records = db.records('id >= ?', (first,), self.PageSize)
+
+        # continue on from the previous page when it is available
+        elif prev:
+            clause = '{0} AND id > ?'.format(where)
+            records = db.records(clause,
+                                 args + (prev[-1].recordId,),
+                                 self.PageSize)
+        else:
+            records = db.records(where,
+                                 args,
+                                 self.PageSize,
+                                 page * self.PageSize)
+
+        self._pages[page] = records
+        if len(self._pages) > self.MaximumPages:
+            self._pages.popitem(last=False)
+
+        return records
+
+    def addRecords(self, records):
+        """
+        Appends the inputed records to the database.
+
+        :param      records | [<logging.LogRecord>, ..]
+        """
+        records = list(records)
+        if not records:
+            return
+
+        db = self._database
+        where, args = self._where
+
+        last_id = db.addRecords(records)
+        clause = 'id > ?'
+        if where:
+            clause += ' AND ' + where
+
+        added = db.count(clause, (self._lastId,) + args)
+        self._lastId = last_id
+        if not added:
+            return
+
+        # the last page may have been partially loaded
+        self._pages.pop(max(0, self._count - 1) / self.PageSize, None)
+
+        self.beginInsertRows(QtCore.QModelIndex(),
+                             self._count,
+                             self._count + added - 1)
+        self._count += added
+        self.endInsertRows()
+
+    def clear(self):
+        """
+        Removes all the records from this model's database.
+        """
+        self.beginResetModel()
+        self._database.clear()
+        self._pages.clear()
+        self._count = 0
+        self._firstId = None
+        self._lastId = 0
+        self.endResetModel()
+
+    def database(self):
+        """
+        Returns the database that this model is displaying.
+
+        :return     <XLogRecordDatabase>
+        """
+        return self._database
+
+    def recordAt(self, row):
+        """
+        Returns the record for the inputed row, loading its page from the \
+        database if necessary.
+
+        :param      row | <int>
+
+        :return     <logging.LogRecord>
+        """
+        page, index = divmod(row, self.PageSize)
+        try:
+            records = self._pages.pop(page)
+        except KeyError:
+            records = self._fetchPage(page)
+        else:
+            self._pages[page] = records
+
+        return records[index]
+
+    def refilter(self):
+        """
+        Recalculates the rows for this model based on its active levels \
+        and filter text.
+        """
+        db = self._database
+
+        self.beginResetModel()
+        self._where = db.whereClause(self._activeLevels,
+                                     self._filterTerms,
+                                     self._filterColumns)
+        self._count = db.count(*self._where)
+        self._pages.clear()
+        self._firstId = None
+        self._lastId = db.maximumId()
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._count
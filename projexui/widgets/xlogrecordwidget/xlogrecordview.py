@@ -0,0 +1,133 @@
+#!/usr/bin/python
+
+""" Defines the tree view used to display logging records. """
+
+# define authorship information
+__authors__         = ['Eric Hulser']
+__author__          = ','.join(__authors__)
+__credits__         = []
+__copyright__       = 'Copyright (c) 2011, Projex Software'
+__license__         = 'LGPL'
+
+# maintanence information
+__maintainer__      = 'Projex Software'
+__email__           = 'team@projexsoftware.com'
+
+#------------------------------------------------------------------------------
+
+from projex.text import nativestring
+from projexui.xpainter import XPainter
+from xqt import unwrapVariant, QtGui, QtCore
+
+class XLogRecordView(QtGui.QTreeView):
+    """
+    Extends the QTreeView class to render a hint when there are no records \
+    and to allow the user to show and hide columns from the header.
+    """
+    def __init__(self, parent=None):
+        super(XLogRecordView, self).__init__(parent)
+
+        # define custom properties
+        palette = self.palette()
+        self._hint = ''
+        self._hintColor = palette.color(palette.Disabled, palette.Text)
+
+        # create connections
+        header = self.header()
+        header.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        header.customContextMenuRequested.connect(self.showHeaderMenu)
+
+    def hint(self):
+        """
+        Returns the hint that is displayed when there are no records.
+
+        :return     <str>
+        """
+        return self._hint
+
+    def hintColor(self):
+        """
+        Returns the color used for the hint rendering.
+
+        :return     <QtGui.QColor>
+        """
+        return self._hintColor
+
+    def paintEvent(self, event):
+        """
+        Overloads the paint event to support rendering of hints if there are
+        no records in the view.
+
+        :param      event | <QPaintEvent>
+        """
+        super(XLogRecordView, self).paintEvent(event)
+
+        model = self.model()
+        if self.hint() and (model is None or not model.rowCount()):
+            text    = self.hint()
+            rect    = self.rect()
+
+            # modify the padding on the rect
+            w = min(250, rect.width() - 30)
+            x = (rect.width() - w) / 2
+
+            rect.setX(x)
+            rect.setY(rect.y() + 15)
+            rect.setWidth(w)
+            rect.setHeight(rect.height() - 30)
+
+            align = int(QtCore.Qt.AlignHCenter | QtCore.Qt.AlignTop)
+
+            # paint the hint
+            with XPainter(self.viewport()) as painter:
+                painter.setPen(self.hintColor())
+                painter.drawText(rect, align | QtCore.Qt.TextWordWrap, text)
+
+    def setHint(self, hint):
+        """
+        Sets the hint that is displayed when there are no records.
+
+        :param      hint | <str>
+        """
+        self._hint = hint
+        self.viewport().update()
+
+    def setHintColor(self, color):
+        """
+        Sets the color used for the hint rendering.
+
+        :param      color | <QtGui.QColor>
+        """
+        self._hintColor = QtGui.QColor(color)
+        self.viewport().update()
+
+    def showHeaderMenu(self, pos):
+        """
+        Displays a menu for toggling the visibility of the columns.
+
+        :param      pos | <QtCore.QPoint>
+        """
+        model = self.model()
+        if model is None:
+            return
+
+        menu = QtGui.QMenu(self)
+        count = model.columnCount()
+        visible = [c for c in range(count) if not self.isColumnHidden(c)]
+
+        for c in range(count):
+            text = unwrapVariant(model.headerData(c, QtCore.Qt.Horizontal))
+            act = menu.addAction(nativestring(text))
+            act.setData(c)
+            act.setCheckable(True)
+            act.setChecked(c in visible)
+
+            # always keep at least one column visible
+            act.setEnabled(visible != [c])
+
+        act = menu.exec_(self.header().mapToGlobal(pos))
+        if act:
+            column = unwrapVariant(act.data())
+            self.setColumnHidden(column, not act.isChecked())
+
+    x_hint = QtCore.Property(str, hint, setHint)
@@ -9,69 +9,19 @@ __license__         = 'LGPL'
 
 #------------------------------------------------------------------------------
 
-import datetime
+import collections
 import logging
 import threading
 import projexui
 
 from projexui import resources
-from projexui.widgets.xtreewidget import XTreeWidgetItem
 from xml.etree import ElementTree
 from xqt import wrapVariant, unwrapVariant, QtGui, QtCore
 
 from .xlogrecordcontrols import XLogRecordControls
+from .xlogrecorddatabase import XLogRecordDatabase
 from .xlogrecordhandler import XLogRecordHandler
-
-class XLogRecordItem(XTreeWidgetItem):
-    Colors = {
-        logging.DEBUG:      'gray',
-        logging.INFO:       'blue',
-        logging.SUCCESS:    'darkGreen',
-        logging.WARNING:    'brown',
-        logging.ERROR:      'darkRed',
-        logging.CRITICAL:   'darkRed'
-    }
-    def __init__(self, parent, record):
-        super(XLogRecordItem, self).__init__(parent)
-        
-        # set default properties
-        self.setFixedHeight(22)
-        
-        created = datetime.datetime.fromtimestamp(record.created)
-        
-        self.setData( 0, QtCore.Qt.DisplayRole, wrapVariant(record.levelname))
-        self.setData( 1, QtCore.Qt.DisplayRole, wrapVariant(record.levelno))
-        self.setData( 2, QtCore.Qt.DisplayRole, wrapVariant(record.name))
-        self.setData( 3, QtCore.Qt.DisplayRole, wrapVariant(str(created)))
-        self.setData( 4, QtCore.Qt.DisplayRole, wrapVariant(record.message))
-        self.setData( 5, QtCore.Qt.DisplayRole, wrapVariant('% 10.4f' % (record.relativeCreated / 1000.0)))
-        self.setData( 6, QtCore.Qt.DisplayRole, wrapVariant(record.filename))
-        self.setData( 7, QtCore.Qt.DisplayRole, wrapVariant(record.module))
-        self.setData( 8, QtCore.Qt.DisplayRole, wrapVariant(record.funcName))
-        self.setData( 9, QtCore.Qt.DisplayRole, wrapVariant(record.lineno))
-        self.setData(10, QtCore.Qt.DisplayRole, wrapVariant(record.pathname))
-        self.setData(11, QtCore.Qt.DisplayRole, wrapVariant(record.process))
-        self.setData(12, QtCore.Qt.DisplayRole, wrapVariant(record.processName))
-        self.setData(13, QtCore.Qt.DisplayRole, wrapVariant(record.thread))
-        self.setData(14, QtCore.Qt.DisplayRole, wrapVariant(record.threadName))
-        
-        clr = XLogRecordItem.Colors.get(record.levelno)
-        if clr:
-            for i in range(self.columnCount()):
-                self.setForeground(i, QtGui.QColor(clr))
-        
-        # create custom properties
-        self._record = record
-
-    def record(self):
-        """
-        Returns the record for this instance.
-        
-        :return     <logging.LoggerRecord>
-        """
-        return self._record
-
-#----------------------------------------------------------------------
+from .xlogrecordmodel import XLogRecordModel, XLogRecordDatabaseModel
 
 class XLogRecordWidget(QtGui.QWidget):
     """ """
@@ -83,10 +33,11 @@ class XLogRecordWidget(QtGui.QWidget):
         
         # define custom properties
         self._handler = XLogRecordHandler(self)
+        self._model = XLogRecordModel(self)
         self._destroyed = False
         self._loggers = set()
         self._activeLevels = []
-        self._queue = []
+        self._queue = collections.deque(maxlen=self._model.maximumRecordCount())
         self._timer = QtCore.QTimer()
         self._timer.setInterval(500)  # only load records every 500 msecs
         
@@ -98,8 +49,12 @@ class XLogRecordWidget(QtGui.QWidget):
         font = QtGui.QFont('Courier New')
         font.setPointSize(9)
         self.uiRecordTREE.setFont(font)
-        self.uiRecordTREE.setVisibleColumns(['Level', 'Name', 'Message'])
-        self.uiRecordTREE.setFilteredColumns(list(range(self.uiRecordTREE.columnCount())))
+        self.uiRecordTREE.setModel(self._model)
+        
+        visible = ('Level', 'Name', 'Message')
+        for i, name in enumerate(self._model.columnNames()):
+            self.uiRecordTREE.setColumnHidden(i, name not in visible)
+        
         self.updateUi()
         
         # setup the configurations
@@ -120,9 +75,11 @@ class XLogRecordWidget(QtGui.QWidget):
         
         # create connections
         self._timer.timeout.connect(self.loadQueue)
-        self._handler.dispatch().recordLogged.connect(self.addRecord)
+        self._handler.setBatched(True)
+        self._handler.dispatch().recordsLogged.connect(self.addRecords)
         
         self.uiRecordBTN.toggled.connect(self.updateUi)
+        self.uiFilterTXT.textChanged.connect(self.filterRecords)
         self.uiRecordTREE.customContextMenuRequested.connect(self.showMenu)
         self.destroyed.connect(self.markDestroyed)
 
@@ -172,12 +129,26 @@ class XLogRecordWidget(QtGui.QWidget):
             return
         
         self._queue.append(record)
+    
+    def addRecords(self, records):
+        """
+        Adds the inputed batch of records to this logger tree widget.
+        
+        :param      records | [<logging.LogRecord>, ..]
+        """
+        if self._destroyed:
+            return
+        
+        if not self.uiRecordBTN.isChecked():
+            return
+        
+        self._queue.extend(records)
 
     def cleanup(self):
         self._destroyed = True
         
         try:
-            self._handler.dispatch().recordLogged.disconnect(self.addRecord)
+            self._handler.dispatch().recordsLogged.disconnect(self.addRecords)
         except StandardError:
             pass
         
@@ -185,12 +156,16 @@ class XLogRecordWidget(QtGui.QWidget):
             self._timer.stop()
         except StandardError:
             pass
+        
+        if isinstance(self._model, XLogRecordDatabaseModel):
+            self._model.database().close()
 
     def clear(self):
         """
         Clears the information for this widget.
         """
-        self.uiRecordTREE.clear()
+        self._queue.clear()
+        self._model.clear()
 
     def clearLoggers(self, logger):
         """
@@ -207,6 +182,26 @@ class XLogRecordWidget(QtGui.QWidget):
         
         self._loggers = set()
     
+    def databaseFile(self):
+        """
+        Returns the database file that records are being captured to, or \
+        an empty string when the records are only kept in memory.
+        
+        :return     <str>
+        """
+        if isinstance(self._model, XLogRecordDatabaseModel):
+            return self._model.database().filename()
+        return ''
+    
+    def filterRecords(self, text):
+        """
+        Filters the records for this widget by the inputed text, matching \
+        against all of the columns.
+        
+        :param      text | <str>
+        """
+        self._model.setFilterText(text)
+    
     def handler(self):
         """
         Returns the logging handler that is linked to this widget.
@@ -231,17 +226,12 @@ class XLogRecordWidget(QtGui.QWidget):
             return
         
         tree = self.uiRecordTREE
-        tree.blockSignals(True)
-        tree.setUpdatesEnabled(False)
-        lvls = self.activeLevels()
         records = list(self._queue)
-        self._queue = []
-        for record in records:
-            item = XLogRecordItem(tree, record)
-            if lvls and record.levelno not in lvls:
-                item.setHidden(True)
+        self._queue.clear()
+        
+        tree.setUpdatesEnabled(False)
+        self._model.addRecords(records)
         tree.setUpdatesEnabled(True)
-        tree.blockSignals(False)
         tree.scrollToBottom()
     
     def loggerLevels(self):
@@ -255,6 +245,23 @@ class XLogRecordWidget(QtGui.QWidget):
     def markDestroyed(self):
         self._destroyed = True
     
+    def maximumRecordCount(self):
+        """
+        Returns the maximum number of records that will be kept by this \
+        widget before the oldest records are discarded.
+        
+        :return     <int>
+        """
+        return self._model.maximumRecordCount()
+    
+    def model(self):
+        """
+        Returns the record model for this widget.
+        
+        :return     <XLogRecordModel>
+        """
+        return self._model
+    
     def removeLogger(self, logger):
         """
         Removes the inputed logger from the set for this widget.
@@ -293,7 +300,11 @@ class XLogRecordWidget(QtGui.QWidget):
         filt = unwrapVariant(settings.value('filter'))
         if filt:
             self.uiFilterTXT.setText(filt)
-        self.uiRecordTREE.restoreSettings(settings)
+        
+        headerState = unwrapVariant(settings.value('headerState'))
+        if headerState:
+            state = QtCore.QByteArray.fromBase64(str(headerState))
+            self.uiRecordTREE.header().restoreState(state)
 
     def restoreXml(self, xml):
         """
@@ -315,8 +326,9 @@ class XLogRecordWidget(QtGui.QWidget):
                 lvl = int(lvl)
                 self.setLoggerLevel(logger, lvl)
         
-        if xtree is not None:
-            self.uiRecordTREE.restoreXml(xtree)
+        if xtree is not None and xtree.get('headerState'):
+            state = QtCore.QByteArray.fromBase64(xtree.get('headerState'))
+            self.uiRecordTREE.header().restoreState(state)
 
     def saveSettings(self, settings):
         """
@@ -332,7 +344,8 @@ class XLogRecordWidget(QtGui.QWidget):
         settings.setValue('levels', wrapVariant(','.join(map(str, self.activeLevels()))))
         settings.setValue('loggerLevels', wrapVariant(','.join(lvls)))
         
-        self.uiRecordTREE.saveSettings(settings)
+        state = self.uiRecordTREE.header().saveState().toBase64()
+        settings.setValue('headerState', wrapVariant(str(state)))
     
     def saveXml(self, xml):
         """
@@ -353,7 +366,8 @@ class XLogRecordWidget(QtGui.QWidget):
         xml.set('filter', wrapVariant(self.uiFilterTXT.text()))
         
         xtree = ElementTree.SubElement(xml, 'tree')
-        self.uiRecordTREE.saveXml(xtree)
+        xtree.set('headerState',
+                  str(self.uiRecordTREE.header().saveState().toBase64()))
     
     def setActiveLevels(self, levels):
         """
@@ -362,18 +376,43 @@ class XLogRecordWidget(QtGui.QWidget):
         :param      levels | [<int>, ..]
         """
         self._activeLevels = levels
-        tree = self.uiRecordTREE
-        tree.setUpdatesEnabled(False)
-        tree.blockSignals(True)
+        self._model.setActiveLevels(levels)
+    
+    def setDatabaseFile(self, filename):
+        """
+        Sets the database file that records will be captured to.  The \
+        records will be paged in from the file as the user scrolls or \
+        filters, allowing very long sessions to be browsed.  Providing an \
+        empty filename will switch back to an in-memory store.
         
-        for i in tree.topLevelItems():
-            if levels and i.record().levelno not in levels:
-                i.setHidden(True)
-            else:
-                i.setHidden(False)
+        :param      filename | <str>
+        """
+        filename = str(filename or '')
+        if filename == self.databaseFile():
+            return
         
-        tree.blockSignals(False)
-        tree.setUpdatesEnabled(True)
+        old = self._model
+        count = old.maximumRecordCount()
+        if filename:
+            db = XLogRecordDatabase(filename)
+            model = XLogRecordDatabaseModel(db, self, count)
+        else:
+            model = XLogRecordModel(self, count)
+        
+        model.setFilterColumns(old.filterColumns())
+        model.setFilterText(old.filterText())
+        model.setActiveLevels(old.activeLevels())
+        
+        # preserve the column layout when swapping models
+        tree = self.uiRecordTREE
+        state = tree.header().saveState()
+        self._model = model
+        tree.setModel(model)
+        tree.header().restoreState(state)
+        
+        if isinstance(old, XLogRecordDatabaseModel):
+            old.database().close()
+        old.deleteLater()
     
     def setLoggerLevel(self, logger, level):
         """
@@ -395,6 +434,18 @@ class XLogRecordWidget(QtGui.QWidget):
         else:
             self.handler().setLoggerLevel(logger, level)
 
+    def setMaximumRecordCount(self, count):
+        """
+        Sets the maximum number of records that will be kept by this widget \
+        before the oldest records are discarded.
+        
+        :param      count | <int>
+        """
+        self._model.setMaximumRecordCount(count)
+        
+        count = self._model.maximumRecordCount()
+        self._queue = collections.deque(self._queue, maxlen=count)
+    
     def showMenu(self, point):
         menu = QtGui.QMenu(self)
         acts = {}
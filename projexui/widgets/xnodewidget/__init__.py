@@ -23,9 +23,11 @@ from projexui.widgets.xnodewidget.xnodehotspot    import XNodeHotspot
 from projexui.widgets.xnodewidget.xnodewidget     import XNodeWidget
 from projexui.widgets.xnodewidget.xnodescene      import XNodeScene
 from projexui.widgets.xnodewidget.xnodelayout     import XNodeLayout
+from projexui.widgets.xnodewidget.xnodebatch      import XNodeBatch
 from projexui.widgets.xnodewidget.xnode           import XNode, \
                                                          XNodeDispatcher,\
-                                                         XNodeAnimation
+                                                         XNodeAnimation,\
+                                                         XNodeLayoutAnimation
                                                             
 from projexui.widgets.xnodewidget.xnodeconnection import XNodeConnection, \
                                                          XConnectionLocation, \
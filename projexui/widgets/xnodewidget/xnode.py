@@ -16,6 +16,7 @@ __email__           = 'team@projexsoftware.com'
 #------------------------------------------------------------------------------
 
 import datetime
+import math
 
 from projex.text import nativestring
 
@@ -23,6 +24,7 @@ from projexui.qt import wrapVariant, unwrapVariant, Signal
 from xqt import QtCore
 from projexui.qt.QtCore           import  QObject, \
                                           QPointF, \
+                                          QVariantAnimation, \
                                           QRectF, \
                                           QRect,\
                                           QSize,\
@@ -38,6 +40,7 @@ from projexui.qt.QtGui            import  QApplication,\
                                           QCursor,\
                                           QIcon,\
                                           QPen,\
+                                          QPainter,\
                                           QPainterPath,\
                                           QCursor,\
                                           QPixmap,\
@@ -88,6 +91,85 @@ class XNodeAnimation(XObjectAnimation):
             self.targetObject().setXSnapToGrid(xsnap)
             self.targetObject().setYSnapToGrid(ysnap)
 
+class XNodeLayoutAnimation(QVariantAnimation):
+    """
+    Animates a group of nodes to new positions from a single animation.  \
+    All of the node positions are interpolated in one timer tick with the \
+    node signals blocked, and the connections attached to the nodes are \
+    marked dirty once per frame rather than once per node move.  Grid \
+    snapping is disabled for the nodes until the animation stops, at which \
+    point they are moved to their end positions.
+    """
+    def __init__(self, positions, parent=None):
+        """
+        :param      positions | {<XNode>: (<QPointF> start, <QPointF> end), ..}
+                    parent    | <QObject> || None
+        """
+        super(XNodeLayoutAnimation, self).__init__(parent)
+        
+        self._positions = []
+        self._snapping = []
+        self._connections = []
+        
+        for node, (start, end) in positions.items():
+            self._positions.append((node, QPointF(start), QPointF(end)))
+            self._snapping.append((node,
+                                   node.isXSnappedToGrid(),
+                                   node.isYSnappedToGrid()))
+            node.setXSnapToGrid(False)
+            node.setYSnapToGrid(False)
+        
+        # collect the affected connections once for the whole animation
+        if self._positions:
+            scene = self._positions[0][0].scene()
+            if scene:
+                nodes = set(positions.keys())
+                for con in scene.connections():
+                    if con.inputNode() in nodes or con.outputNode() in nodes:
+                        self._connections.append(con)
+        
+        self.setStartValue(0.0)
+        self.setEndValue(1.0)
+    
+    def updateCurrentValue(self, value):
+        """
+        Moves all of the nodes to their interpolated positions for the \
+        inputed progress value.
+        
+        :param      value | <float>
+        """
+        t = float(unwrapVariant(value))
+        
+        for node, start, end in self._positions:
+            blocked = node.signalsBlocked()
+            node.blockSignals(True)
+            node.setPos(start.x() + (end.x() - start.x()) * t,
+                        start.y() + (end.y() - start.y()) * t)
+            node.blockSignals(blocked)
+        
+        for con in self._connections:
+            con.setDirty()
+    
+    def updateState(self, newState, oldState):
+        """
+        Restores the node snapping and end positions once the animation \
+        has stopped.
+        
+        :param      newState | <QAbstractAnimation.State>
+                    oldState | <QAbstractAnimation.State>
+        """
+        super(XNodeLayoutAnimation, self).updateState(newState, oldState)
+        
+        if newState != self.Stopped:
+            return
+        
+        for node, xsnap, ysnap in self._snapping:
+            node.setXSnapToGrid(xsnap)
+            node.setYSnapToGrid(ysnap)
+        
+        for node, _, end in self._positions:
+            node.setPos(end)
+
 #------------------------------------------------------------------------------
 
 class XNode(QGraphicsRectItem):
@@ -100,6 +182,9 @@ class XNode(QGraphicsRectItem):
     Dispatcher  = XNodeDispatcher
     BaseName    = 'node'
     
+    # defines the cell size used when indexing hotspots and dropzones
+    HotspotIndexCellSize = 16
+    
     NodeStyle = enum('Rectangle', 'Ellipse', 'Pixmap')
     HotspotStyle = XNodeHotspot.Style # keeping backward compatibility
     
@@ -168,6 +253,7 @@ class XNode(QGraphicsRectItem):
         self._hotspotPressed            = False
         self._hotspots                  = []
         self._dropzones                 = []
+        self._hotspotIndex              = None
         self._drawHotspotsUnderneath    = False
         self._titleFont                 = None
         self._wordWrap                  = False
@@ -184,6 +270,7 @@ class XNode(QGraphicsRectItem):
         :param      dropzone | <XNodeHotspot>
         """
         self._dropzones.append(dropzone)
+        self._hotspotIndex = None
     
     def addHotspot( self, hotspot ):
         """
@@ -192,6 +279,53 @@ class XNode(QGraphicsRectItem):
         :param      hotspot | <XNodeHotspot>
         """
         self._hotspots.append(hotspot)
+        self._hotspotIndex = None
+    
+    def _buildSpotIndex(self, spots):
+        """
+        Builds a grid index for the inputed hotspots, mapping each cell to \
+        the spots whose rects overlap it, in their lookup order.
+        
+        :param      spots | [<XNodeHotspot>, ..]
+        
+        :return     {(<int> col, <int> row): [<XNodeHotspot>, ..], ..}
+        """
+        size = float(self.HotspotIndexCellSize)
+        grid = {}
+        for spot in spots:
+            rect = spot.rect()
+            left = int(math.floor(rect.left() / size))
+            right = int(math.floor(rect.right() / size))
+            top = int(math.floor(rect.top() / size))
+            bottom = int(math.floor(rect.bottom() / size))
+            
+            for col in range(left, right + 1):
+                for row in range(top, bottom + 1):
+                    grid.setdefault((col, row), []).append(spot)
+        return grid
+    
+    def _spotAt(self, point, dropzones=False):
+        """
+        Looks up the first hotspot or dropzone that contains the inputed \
+        point from this node's index, rebuilding the index if necessary.
+        
+        :param      point     | <QPointF>
+                    dropzones | <bool>
+        
+        :return     <XNodeHotspot> || None
+        """
+        if self._hotspotIndex is None:
+            self._hotspotIndex = (self._buildSpotIndex(self._hotspots),
+                                  self._buildSpotIndex(self._dropzones))
+        
+        size = float(self.HotspotIndexCellSize)
+        key = (int(math.floor(point.x() / size)),
+               int(math.floor(point.y() / size)))
+        
+        for spot in self._hotspotIndex[int(dropzones)].get(key, ()):
+            if spot.rect().contains(point):
+                return spot
+        return None
     
     def adjustTitleFont(self):
         """
@@ -259,6 +393,7 @@ class XNode(QGraphicsRectItem):
         self.setMinimumHeight(h)
         
         self.rebuild()
+        self._hotspotIndex = None
     
     def alternateColor(self):
         """
@@ -361,12 +496,14 @@ class XNode(QGraphicsRectItem):
         Clears the dropzones and slots from this node.
         """
         self._dropzones = []
+        self._hotspotIndex = None
     
     def clearHotspots( self ):
         """
         Clears the hotspots and slots from this node.
         """
         self._hotspots = []
+        self._hotspotIndex = None
     
     def contentsMargins( self ):
         """
@@ -430,6 +567,7 @@ class XNode(QGraphicsRectItem):
         hotspot.setColor(color)
         hotspot.setStyle(style)
         self._dropzones.append(hotspot)
+        self._hotspotIndex = None
         return hotspot
     
     def connectHotspot( self, 
@@ -464,6 +602,7 @@ class XNode(QGraphicsRectItem):
         hotspot.setStyle(style)
         
         self._hotspots.append(hotspot)
+        self._hotspotIndex = None
         return hotspot
     
     def connectTo( self, node, cls = None ):
@@ -646,6 +785,13 @@ class XNode(QGraphicsRectItem):
         x += 6
         w -= 12
         metrics = QFontMetrics(self.titleFont())
+        
+        # cull the title when it would be smaller than a pixel on screen
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if metrics.height() * lod < 1:
+            painter.restore()
+            return
+        
         if not self.wordWrap():
             e_text  = metrics.elidedText(nativestring(self.displayName()), 
                                          Qt.ElideRight,
@@ -687,6 +833,27 @@ class XNode(QGraphicsRectItem):
         """
         return self._drawHotspotsUnderneath
     
+    def drawSimplified(self, painter, option, widget):
+        """
+        Draws a simplified version of this node for low levels of detail. \
+        Rather than rendering the title, icon and hotspots, a cached pixmap \
+        of the node's style is looked up from the scene and drawn into the \
+        node's rect.
+        
+        :param      painter     <QPainter>
+        :param      option      <QGraphicsItemSytleOption>
+        :param      widget      <QWidget>
+        """
+        scene = self.scene()
+        if not scene:
+            return
+        
+        pixmap = scene.simplifiedPixmap(self)
+        if pixmap.isNull():
+            return
+        
+        painter.drawPixmap(self.rect(), pixmap, QRectF(pixmap.rect()))
+    
     def drawStyle(self, painter, x, y, width, height, radius):
         """
         Draws the style for the given coordinates for this node.
@@ -735,11 +902,7 @@ class XNode(QGraphicsRectItem):
         
         :param      point | <QPoint>
         """
-        for dropzone in self._dropzones:
-            rect = dropzone.rect()
-            if ( rect.contains(point) ):
-                return dropzone
-        return None
+        return self._spotAt(point, dropzones=True)
     
     def emitGeometryChanged( self, point = None ):
         """
@@ -880,11 +1043,7 @@ class XNode(QGraphicsRectItem):
         
         :return     <XNodeHotspot> || None
         """
-        for hotspot in self._hotspots:
-            rect = hotspot.rect()
-            if rect.contains(point):
-                return hotspot
-        return None
+        return self._spotAt(point)
     
     def hotspotColor(self):
         """
@@ -1160,6 +1319,12 @@ class XNode(QGraphicsRectItem):
             eff = self.graphicsEffect()
             eff.setColor(self.highlightColor() if value else QColor(0, 0, 0 ,0))
         
+        # update the scene's node index once the node has moved
+        elif change == self.ItemPositionHasChanged:
+            scene = self.scene()
+            if scene:
+                scene.invalidateNodeIndex(self)
+        
         # only operate when it is a visible, geometric change
         if not (self.isVisible() and change == self.ItemPositionChange):
             return super(XNode, self).itemChange(change, value)
@@ -1436,6 +1601,14 @@ class XNode(QGraphicsRectItem):
         painter.save()
         painter.setOpacity( self.opacity() )
         
+        # draw a simplified box when zoomed out past the detail threshold
+        scene = self.scene()
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if scene and lod * 100 < scene.nodeDetailZoomAmount():
+            self.drawSimplified(painter, option, widget)
+            painter.restore()
+            return
+        
         if self.drawHotspotsUnderneath():
             self.drawHotspots(painter)
         
@@ -1564,6 +1737,88 @@ class XNode(QGraphicsRectItem):
         self.adjustTitleFont()
         return True
     
+    def renderSimplified(self, scale=1.0):
+        """
+        Renders the simplified look for this node to a pixmap at the given \
+        scale.  This is used by the scene to populate its pixmap cache for \
+        low levels of detail, and can be overloaded for custom nodes.
+        
+        :param      scale | <float>
+        
+        :return     <QPixmap>
+        """
+        rect = self.rect()
+        w = max(int(rect.width() * scale + 0.5), 1)
+        h = max(int(rect.height() * scale + 0.5), 1)
+        
+        pixmap = QPixmap(w, h)
+        pixmap.fill(Qt.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(painter.Antialiasing)
+        
+        if self.isEnabled():
+            painter.setPen(self.borderColor())
+            painter.setBrush(self.baseColor())
+        else:
+            painter.setPen(self.disabledBorderColor())
+            painter.setBrush(self.disabledColor())
+        
+        if self.style() == XNode.NodeStyle.Ellipse:
+            painter.drawEllipse(0, 0, w - 1, h - 1)
+        
+        elif self.style() == XNode.NodeStyle.Pixmap:
+            if self.pixmap() and not self.pixmap().isNull():
+                pmap = self.pixmap().scaled(w,
+                                            h,
+                                            Qt.KeepAspectRatio,
+                                            Qt.SmoothTransformation)
+                painter.drawPixmap(0, 0, pmap)
+        
+        else:
+            r = self.roundingRadius() * scale
+            painter.drawRoundedRect(0, 0, w - 1, h - 1, r, r)
+        
+        painter.end()
+        return pixmap
+    
+    def restoreSnapshotData(self, data):
+        """
+        Restores the properties for this node from the inputed snapshot \
+        data.  This is called by the scene when loading a snapshot before \
+        the node is added to the scene, and can be overloaded in subclasses \
+        to restore additional information.
+        
+        :sa         snapshotData
+        
+        :param      data | <dict>
+        """
+        self._objectName = data.get('name', self._objectName)
+        self._displayName = data.get('displayName', '')
+        self._customData = dict(data.get('customData', {}))
+        
+        min_w, min_h = data.get('minimumSize', (None, None))
+        if min_w is not None:
+            self._minimumWidth = min_w
+        if min_h is not None:
+            self._minimumHeight = min_h
+        
+        self.rebuild()
+        
+        if 'rect' in data:
+            self.setRect(QRectF(*data['rect']))
+        if 'pos' in data:
+            self.setPos(*data['pos'])
+    
+    def resetHotspotIndex(self):
+        """
+        Resets the index used to look up hotspots and dropzones by point.  \
+        The index is rebuilt automatically when the node's size or hotspots \
+        change, this only needs to be called when a hotspot's rect is \
+        modified directly.
+        """
+        self._hotspotIndex = None
+    
     def roundingRadius( self ):
         """
         Returns the desired rounding radius for the node when drawing.
@@ -1942,6 +2197,19 @@ class XNode(QGraphicsRectItem):
         self._palette.setColor(self._palette.NodeForeground, color)
         self.setDirty()
     
+    def setPos(self, *args):
+        """
+        Overloads the base QGraphicsItem method to keep the scene's node \
+        index in sync when the node is moved programmatically.
+        
+        :param      *args | <QPointF> || <float> x, <float> y
+        """
+        super(XNode, self).setPos(*args)
+        
+        scene = self.scene()
+        if scene:
+            scene.invalidateNodeIndex(self)
+    
     def setPinch(self,
                  topLeft=None,
                  topRight=None,
@@ -2000,7 +2268,14 @@ class XNode(QGraphicsRectItem):
         if ( rect.height() < mheight ):
             rect.setHeight(mheight)
         
-        return super(XNode, self).setRect(rect)
+        self._hotspotIndex = None
+        result = super(XNode, self).setRect(rect)
+        
+        scene = self.scene()
+        if scene:
+            scene.invalidateNodeIndex(self)
+        
+        return result
     
     def setRoundingRadius( self, radius ):
         """
@@ -2089,6 +2364,32 @@ class XNode(QGraphicsRectItem):
         """
         self._ySnapToGrid = state
     
+    def simplifiedCacheKey(self):
+        """
+        Returns the key used to share simplified pixmaps between nodes of \
+        the same style, size and coloring.
+        
+        :return     <tuple>
+        """
+        rect = self.rect()
+        if self.isEnabled():
+            colors = (self.borderColor().rgba(), self.baseColor().rgba())
+        else:
+            colors = (self.disabledBorderColor().rgba(),
+                      self.disabledColor().rgba())
+        
+        pixmap = None
+        if self.style() == XNode.NodeStyle.Pixmap and self.pixmap():
+            pixmap = self.pixmap().cacheKey()
+        
+        return (type(self).__name__,
+                self.style(),
+                int(rect.width()),
+                int(rect.height()),
+                self.roundingRadius(),
+                colors,
+                pixmap)
+    
     def signalsBlocked( self ):
         """
         Returns whether or not this item's dispatch object has its \
@@ -2098,6 +2399,26 @@ class XNode(QGraphicsRectItem):
         """
         return self.dispatch.signalsBlocked()
     
+    def snapshotData(self):
+        """
+        Returns the information for this node that will be stored when \
+        saving a scene snapshot.  Subclasses can overload this method to \
+        store additional information, which must be JSON serializable.
+        
+        :sa         restoreSnapshotData
+        
+        :return     <dict>
+        """
+        rect = self.rect()
+        pos = self.pos()
+        
+        return {'name': self._objectName,
+                'displayName': self._displayName,
+                'customData': self._customData,
+                'minimumSize': (self._minimumWidth, self._minimumHeight),
+                'rect': (rect.x(), rect.y(), rect.width(), rect.height()),
+                'pos': (pos.x(), pos.y())}
+    
     def style(self):
         """
         Returns the style for this node.
@@ -2144,6 +2465,22 @@ class XNode(QGraphicsRectItem):
         
         self.update()
     
+    def syncLevelOfDetail(self, zoomAmount):
+        """
+        Syncs the level of detail information for this node based on the \
+        inputed zoom amount.  Below the scene's node detail threshold the \
+        highlight drop shadow is disabled, as it is rendered off screen.
+        
+        :param      zoomAmount | <int> | 100 based %
+        """
+        effect = self.graphicsEffect()
+        if not effect:
+            return
+        
+        scene = self.scene()
+        if scene:
+            effect.setEnabled(zoomAmount >= scene.nodeDetailZoomAmount())
+    
     def titleFont(self):
         """
         Returns the font that is being used for this node's title.
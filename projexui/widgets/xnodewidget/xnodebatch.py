@@ -0,0 +1,239 @@
+#!/usr/bin/python
+
+"""
+Defines a batch editing context for building node graphs programmatically.
+
+:usage      |from projexui.widgets.xnodewidget import XNodeBatch
+            |with XNodeBatch(scene) as batch:
+            |   batch.addNodes([{'name': 'a', 'pos': (0, 0)},
+            |                   {'name': 'b', 'pos': (200, 0)}])
+            |   batch.addConnections([{'output': 'a', 'input': 'b'}])
+"""
+
+# define authorship information
+__authors__         = ['Eric Hulser']
+__author__          = ','.join(__authors__)
+__credits__         = []
+__copyright__       = 'Copyright (c) 2011, Projex Software'
+__license__         = 'LGPL'
+
+# maintanence information
+__maintainer__      = 'Projex Software'
+__email__           = 'team@projexsoftware.com'
+
+#------------------------------------------------------------------------------
+
+from projexui.qt.QtCore import QPointF
+
+from projexui.widgets.xnodewidget.xnode import XNode
+
+
+class XNodeBatch(object):
+    """
+    Suspends the signals, isolation updates, item indexing and view updates \
+    for a node scene while a set of node and connection specs are queued, \
+    then commits them in a single pass.  Once the outermost batch exits, \
+    the scene's itemsAdded signal is emitted once for all of the items.
+
+    Node specs are dictionaries that support the keys: cls, name, \
+    displayName, pos, layer, customData.  Connection specs support the keys: \
+    cls, output, input, outputHotspot, inputHotspot, layer, style, text, \
+    customData, where output and input can be an <XNode>, the index of a \
+    node spec in this batch or a node's object name.
+    """
+    def __init__(self, scene):
+        self._scene         = scene
+        self._nodeSpecs     = []
+        self._edgeSpecs     = []
+        self._nodes         = []
+        self._connections   = []
+        self._names         = {}
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.commit()
+        finally:
+            self.end(notify=exc_type is None)
+
+    def _resolveNode(self, value, nodes):
+        """
+        Resolves the inputed connection endpoint to a node.  Names are \
+        looked up by the name requested in the node spec first, as the \
+        scene may have made the node's object name unique.
+
+        :param      value | <XNode> || <int> || <str> || None
+                    nodes | [<XNode>, ..] | nodes created by this commit
+
+        :return     <XNode> || None
+        """
+        if value is None or isinstance(value, XNode):
+            return value
+
+        if isinstance(value, int):
+            return nodes[value]
+
+        node = self._names.get(value)
+        if node is None:
+            node = self._scene.findNode(value)
+        return node
+
+    def addConnection(self, **spec):
+        """
+        Queues a connection to be created when this batch is committed.
+
+        :param      **spec | connection spec keys
+        """
+        self._edgeSpecs.append(spec)
+
+    def addConnections(self, specs):
+        """
+        Queues the inputed connection specs to be created when this batch \
+        is committed.
+
+        :param      specs | [<dict>, ..]
+        """
+        self._edgeSpecs.extend(specs)
+
+    def addNode(self, **spec):
+        """
+        Queues a node to be created when this batch is committed.
+
+        :param      **spec | node spec keys
+        """
+        self._nodeSpecs.append(spec)
+
+    def addNodes(self, specs):
+        """
+        Queues the inputed node specs to be created when this batch is \
+        committed.
+
+        :param      specs | [<dict>, ..]
+        """
+        self._nodeSpecs.extend(specs)
+
+    def begin(self):
+        """
+        Suspends the scene's signals, indexing and view updates.  Nested \
+        batches will leave the state to be restored by the outermost batch.
+        """
+        self._scene.beginBatch()
+
+    def commit(self):
+        """
+        Creates all of the queued nodes and connections in a single pass.
+
+        :return     ([<XNode>, ..], [<XNodeConnection>, ..])
+        """
+        scene = self._scene
+        nodes = []
+        connections = []
+
+        # create the nodes
+        for spec in self._nodeSpecs:
+            cls = spec.get('cls') or scene.defaultNodeClass()
+            node = cls(scene)
+            node.blockSignals(True)
+
+            if 'layer' in spec:
+                node.setLayer(spec['layer'])
+            if spec.get('name'):
+                node.setObjectName(scene.uniqueNodeName(spec['name']))
+                self._names.setdefault(spec['name'], node)
+                self._names.setdefault(node.objectName(), node)
+            if spec.get('displayName'):
+                node.setDisplayName(spec['displayName'])
+            for key, value in spec.get('customData', {}).items():
+                node.setCustomData(key, value)
+
+            node.rebuild()
+            scene.addItem(node)
+
+            pos = spec.get('pos')
+            if pos is not None:
+                if not isinstance(pos, QPointF):
+                    pos = QPointF(*pos)
+                node.setPos(pos)
+
+            node.blockSignals(False)
+            nodes.append(node)
+
+        # create the connections
+        for spec in self._edgeSpecs:
+            cls = spec.get('cls') or scene.defaultConnectionClass()
+            con = cls(scene)
+
+            if 'layer' in spec:
+                con.setLayer(spec['layer'])
+            if 'style' in spec:
+                con.setStyle(spec['style'])
+
+            out_node = self._resolveNode(spec.get('output'), nodes)
+            in_node = self._resolveNode(spec.get('input'), nodes)
+            con.setOutputNode(out_node)
+            con.setInputNode(in_node)
+
+            for node, key, setter in ((out_node,
+                                       'outputHotspot',
+                                       con.setOutputHotspot),
+                                      (in_node,
+                                       'inputHotspot',
+                                       con.setInputHotspot)):
+                hotspot = spec.get(key)
+                if node and isinstance(hotspot, basestring):
+                    hotspot = node.findHotspot(hotspot) or \
+                              node.findDropzone(hotspot)
+                if hotspot:
+                    setter(hotspot)
+
+            for key, value in spec.get('customData', {}).items():
+                con.setCustomData(key, value)
+            if spec.get('text'):
+                con.setText(spec['text'])
+
+            scene.addItem(con)
+            connections.append(con)
+
+        self._nodeSpecs = []
+        self._edgeSpecs = []
+        self._nodes += nodes
+        self._connections += connections
+
+        return nodes, connections
+
+    def connections(self):
+        """
+        Returns the connections that have been created by this batch.
+
+        :return     [<XNodeConnection>, ..]
+        """
+        return self._connections
+
+    def end(self, notify=True):
+        """
+        Restores the scene's state, emitting the itemsAdded signal once for \
+        all the items added during the outermost batch.
+
+        :param      notify | <bool>
+        """
+        self._scene.endBatch(notify)
+
+    def nodes(self):
+        """
+        Returns the nodes that have been created by this batch.
+
+        :return     [<XNode>, ..]
+        """
+        return self._nodes
+
+    def scene(self):
+        """
+        Returns the scene this batch is editing.
+
+        :return     <XNodeScene>
+        """
+        return self._scene
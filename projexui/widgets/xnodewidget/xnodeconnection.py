@@ -21,6 +21,7 @@ __email__ = 'team@projexsoftware.com'
 from projex.text import nativestring
 
 from projexui.qt.QtCore import Qt, \
+    QLineF, \
     QPointF, \
     QRectF
 
@@ -67,6 +68,7 @@ class XNodeConnection(QGraphicsPathItem):
         # define custom properties
         self._textItem = None
         self._polygons = []
+        self._line = QLineF()
         self._style = XConnectionStyle.Linear
         self._padding = 20
         self._squashThreshold = 10
@@ -1113,6 +1115,15 @@ class XNodeConnection(QGraphicsPathItem):
         if self.isDirty():
             self.setPath(self.rebuild())
 
+        # draw a straight, cosmetic line when zoomed out past the threshold
+        scene = self.scene()
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if scene and lod * 100 < scene.connectionDetailZoomAmount():
+            pen.setWidthF(0)
+            painter.setPen(pen)
+            painter.drawLine(self._line)
+            return
+
         # store the initial hint
         hint = painter.renderHints()
         painter.setRenderHint(painter.Antialiasing)
@@ -1159,6 +1170,7 @@ class XNodeConnection(QGraphicsPathItem):
         # create the path
         path = self.rebuildPath()
         self._polygons = self.rebuildPolygons(path)
+        self._line = QLineF(path.pointAtPercent(0), path.pointAtPercent(1))
 
         if self._textItem:
             point = path.pointAtPercent(0.5)
@@ -1260,6 +1272,42 @@ class XNodeConnection(QGraphicsPathItem):
 
         return output
 
+    def restoreSnapshotData(self, data):
+        """
+        Restores the properties for this connection from the inputed
+        snapshot data.  This is called by the scene once the input and
+        output nodes have been assigned, and can be overloaded in subclasses
+        to restore additional information.
+        
+        :sa         snapshotData
+        
+        :param      data | <dict>
+        """
+        self._customData = dict(data.get('customData', {}))
+        self._style = data.get('style', self._style)
+        self._inputLocation = data.get('inputLocation', self._inputLocation)
+        self._outputLocation = data.get('outputLocation',
+                                        self._outputLocation)
+
+        for node, key, setter in ((self._inputNode,
+                                   'inputHotspot',
+                                   self.setInputHotspot),
+                                  (self._outputNode,
+                                   'outputHotspot',
+                                   self.setOutputHotspot)):
+            name = data.get(key)
+            if node is None or not name:
+                continue
+
+            hotspot = node.findHotspot(name) or node.findDropzone(name)
+            if hotspot:
+                setter(hotspot)
+
+        if data.get('text'):
+            self.setText(data['text'])
+
+        self.setDirty()
+
     def rebuildLinear(self):
         """ 
         Rebuilds a linear path from the output to input points.
@@ -1796,10 +1844,39 @@ class XNodeConnection(QGraphicsPathItem):
 
             self._textItem.setPlainText(text)
 
+            scene = self.scene()
+            if scene and scene.mainView():
+                self.syncLevelOfDetail(scene.zoomAmount())
+
         elif self._textItem:
             self.scene().removeItem(self._textItem)
             self._textItem = None
 
+    def snapshotData(self):
+        """
+        Returns the information for this connection that will be stored
+        when saving a scene snapshot.  The input and output nodes are
+        stored by the scene.  Subclasses can overload this method to store
+        additional information, which must be JSON serializable.
+        
+        :sa         restoreSnapshotData
+        
+        :return     <dict>
+        """
+        data = {'customData': self._customData,
+                'style': self._style,
+                'inputLocation': self._inputLocation,
+                'outputLocation': self._outputLocation}
+
+        if self._inputHotspot:
+            data['inputHotspot'] = self._inputHotspot.name()
+        if self._outputHotspot:
+            data['outputHotspot'] = self._outputHotspot.name()
+        if self._text:
+            data['text'] = self._text
+
+        return data
+
     def style(self):
         """
         :remarks    Returns the style of the connection that is being drawn.
@@ -1834,6 +1911,27 @@ class XNodeConnection(QGraphicsPathItem):
             self.setAcceptHoverEvents(True)
             self.setZValue(layerData.get('zValue', 0) - 1)
 
+    def syncLevelOfDetail(self, zoomAmount):
+        """
+        Syncs the level of detail information for this connection based on
+        the inputed zoom amount.  The text label is hidden when the
+        connection is simplified, or when it would be smaller than a pixel.
+        
+        :param      zoomAmount | <int> | 100 based %
+        """
+        if not self._textItem:
+            return
+
+        scene = self.scene()
+        if not scene:
+            return
+
+        metrics = QFontMetrics(self._textItem.font())
+        visible = zoomAmount >= scene.connectionDetailZoomAmount() and \
+                  metrics.height() * zoomAmount / 100.0 >= 1
+
+        self._textItem.setVisible(visible)
+
     def text(self):
         """
         Returns the text for this connection.
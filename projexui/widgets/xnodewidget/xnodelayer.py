@@ -234,6 +234,24 @@ class XNodeLayer(object):
         
         return True
     
+    def restoreSnapshotData(self, data):
+        """
+        Restores the properties for this layer from the inputed snapshot \
+        data.  The parent layer is restored by the scene.
+        
+        :sa         snapshotData
+        
+        :param      data | <dict>
+        """
+        self._name = data.get('name', '')
+        self._visible = data.get('visible', True)
+        self._inheritVisibility = data.get('inheritVisibility', True)
+        self._enabled = data.get('enabled', False)
+        self._linkEnabledToCurrent = data.get('linkEnabledToCurrent', False)
+        self._opacity = data.get('opacity', 1.0)
+        self._zValue = data.get('zValue', 0)
+        self._customData = dict(data.get('customData', {}))
+    
     def scene(self):
         """
         Returns the scene that this layer is associated with.
@@ -388,6 +406,24 @@ class XNodeLayer(object):
         self.sync()
         return True
     
+    def snapshotData(self):
+        """
+        Returns the information for this layer that will be stored when \
+        saving a scene snapshot.
+        
+        :sa         restoreSnapshotData
+        
+        :return     <dict>
+        """
+        return {'name': self._name,
+                'visible': self._visible,
+                'inheritVisibility': self._inheritVisibility,
+                'enabled': self._enabled,
+                'linkEnabledToCurrent': self._linkEnabledToCurrent,
+                'opacity': self._opacity,
+                'zValue': self._zValue,
+                'customData': self._customData}
+    
     def sync(self):
         """
         Syncs the items on this layer with the current layer settings.
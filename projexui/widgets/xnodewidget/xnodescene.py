@@ -15,12 +15,15 @@ __email__           = 'team@projexsoftware.com'
 
 #------------------------------------------------------------------------------
 
+import json
+import math
 import re
 
 from projex.text import nativestring
 
 from projexui.qt import Signal
 from projexui.qt.QtCore       import  QLine,\
+                                      QPointF,\
                                       QRectF,\
                                       Qt,\
                                       QParallelAnimationGroup
@@ -34,7 +37,9 @@ from projexui.qt.QtGui        import  QColor, \
                                       QPen
 
 from projexui.xanimation                            import XObjectAnimation
-from projexui.widgets.xnodewidget.xnode             import XNode
+from projexui.widgets.xnodewidget.xnode             import XNode, \
+                                                           XNodeLayoutAnimation
+from projexui.widgets.xnodewidget.xnodebatch        import XNodeBatch
 from projexui.widgets.xnodewidget.xnodeconnection   import XNodeConnection
 from projexui.widgets.xnodewidget.xnodelayer        import XNodeLayer
 from projexui.widgets.xnodewidget.xnodelayout       import XNodeLayout
@@ -64,8 +69,12 @@ class XNodeScene(QGraphicsScene):
     viewModeChanged         = Signal()
     
     itemDoubleClicked       = Signal( QGraphicsItem )
+    itemsAdded              = Signal()
     itemsRemoved            = Signal()
     
+    # defines the cell size used when indexing nodes by position
+    NodeIndexCellSize       = 200
+    
     # members
     def __init__(self, view, cellWidth=20, cellHeight=18):
         """
@@ -105,6 +114,10 @@ class XNodeScene(QGraphicsScene):
         self._cellHeight                = cellHeight
         self._minZoomAmount             = 20
         self._maxZoomAmount             = 100
+        self._maxAnimatedNodeCount      = 500
+        self._nodeDetailZoomAmount      = 40
+        self._connectionDetailZoomAmount = 40
+        self._simplifiedPixmaps         = {}
         self._modified                  = False
         self._dirty                     = True
         self._viewMode                  = False
@@ -117,6 +130,15 @@ class XNodeScene(QGraphicsScene):
         self._activeConnection          = None
         self._currentLayer              = None
         self._palette                   = XNodePalette()
+        self._nodeNames                 = None
+        self._batchDepth                = 0
+        self._batchItems                = []
+        self._batchState                = None
+        self._batchChanged              = False
+        self._nodeIndex                 = {}
+        self._nodeIndexCells            = {}
+        self._nodeIndexDirty            = set()
+        self._nodeIndexOrder            = {}
         
         self._defaultNodeClass          = XNode
         self._defaultConnectionClass    = XNodeConnection
@@ -213,6 +235,53 @@ class XNodeScene(QGraphicsScene):
                            next_y,
                            processed)
     
+    def _indexCells(self, rect):
+        """
+        Returns the node index cells that the inputed scene rect overlaps.
+        
+        :param      rect | <QRectF>
+        
+        :return     [(<int> col, <int> row), ..]
+        """
+        size = float(self.NodeIndexCellSize)
+        left = int(math.floor(rect.left() / size))
+        right = int(math.floor(rect.right() / size))
+        top = int(math.floor(rect.top() / size))
+        bottom = int(math.floor(rect.bottom() / size))
+        
+        return [(col, row) for col in range(left, right + 1)
+                           for row in range(top, bottom + 1)]
+    
+    def _unindexNode(self, node):
+        """
+        Removes the inputed node from the node index.
+        
+        :param      node | <XNode>
+        """
+        for cell in self._nodeIndexCells.pop(node, ()):
+            nodes = self._nodeIndex.get(cell)
+            if nodes is not None:
+                nodes.discard(node)
+                if not nodes:
+                    del self._nodeIndex[cell]
+    
+    def _updateNodeIndex(self):
+        """
+        Re-indexes any nodes whose geometry has changed since the last query.
+        """
+        dirty = self._nodeIndexDirty
+        self._nodeIndexDirty = set()
+        
+        for node in dirty:
+            self._unindexNode(node)
+            if node.scene() != self:
+                continue
+            
+            cells = self._indexCells(node.sceneBoundingRect())
+            for cell in cells:
+                self._nodeIndex.setdefault(cell, set()).add(node)
+            self._nodeIndexCells[node] = cells
+    
     def activeConnection( self ):
         """
         Returns the active connection instance.  This method is provided \
@@ -283,6 +352,20 @@ class XNodeScene(QGraphicsScene):
         self.setModified()
         self._cache.add(item)
         
+        if isinstance(item, XNode):
+            self._nodeIndexOrder[item] = len(self._nodeIndexOrder)
+            self._nodeIndexDirty.add(item)
+        
+        # defer the level of detail and notification while batch editing
+        if self._batchDepth:
+            self._batchItems.append(item)
+            if self._nodeNames is not None and isinstance(item, XNode):
+                self._nodeNames.add(item.objectName())
+        
+        # sync the level of detail for the current zoom
+        elif isinstance(item, (XNode, XNodeConnection)) and self._mainView:
+            item.syncLevelOfDetail(self.zoomAmount())
+        
         return result
     
     def addNode(self, cls=None, point=None):
@@ -408,15 +491,34 @@ class XNodeScene(QGraphicsScene):
                 self.mainView().centerOn(centerOn)
             return results
         else:
-            anim_group = QParallelAnimationGroup(self)
+            # lay out the nodes immediately, then animate them from their
+            # starting positions using a single driver for all the nodes
+            starts = dict((node, QPointF(node.pos())) for node in nodes if node)
+            
             plugin.setTesting(debug)
-            results = plugin.layout(self,
-                                   nodes,
-                                   center,
-                                   padX,
-                                   padY,
-                                   direction,
-                                   anim_group)
+            results = plugin.layout(self, nodes, center, padX, padY, direction)
+            
+            # large graphs are moved instantly
+            if len(starts) > self.maxAnimatedNodeCount():
+                if centerOn:
+                    self.mainView().centerOn(centerOn)
+                return results
+            
+            positions = {}
+            for node, start in starts.items():
+                end = QPointF(node.pos())
+                if end != start:
+                    positions[node] = (start, end)
+            
+            anim_group = QParallelAnimationGroup(self)
+            anim_group.addAnimation(XNodeLayoutAnimation(positions))
+            
+            # restore the starting positions until the animation begins
+            for node, (start, _) in positions.items():
+                blocked = node.signalsBlocked()
+                node.blockSignals(True)
+                node.setPos(start)
+                node.blockSignals(blocked)
             
             if isinstance(centerOn, XNode):
                 if centerOn in results:
@@ -467,6 +569,46 @@ class XNodeScene(QGraphicsScene):
                                     centerOn,
                                     center)
     
+    def batchEdit(self):
+        """
+        Returns a new batch editing context for this scene.  While the \
+        batch is active, signals, isolation updates, item indexing and view \
+        updates are suspended, and queued node and connection specs are \
+        committed in a single pass when it exits.
+        
+        :usage      |with scene.batchEdit() as batch:
+                    |   batch.addNodes(node_specs)
+                    |   batch.addConnections(edge_specs)
+        
+        :return     <XNodeBatch>
+        """
+        return XNodeBatch(self)
+    
+    def beginBatch(self):
+        """
+        Suspends the signals, loading state, item indexing and view updates \
+        for this scene.  Nested calls will leave the state to be restored by \
+        the outermost endBatch call.
+        """
+        self._batchDepth += 1
+        if self._batchDepth > 1:
+            return
+        
+        self._batchState = (self.signalsBlocked(),
+                            self.isLoading(),
+                            self.itemIndexMethod(),
+                            self.isModified())
+        
+        self.blockSignals(True)
+        self.setLoading(True)
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self._nodeNames = set(node.objectName() for node in self.nodes())
+        self._batchItems = []
+        self._batchChanged = False
+        
+        if self._mainView:
+            self._mainView.setUpdatesEnabled(False)
+    
     def blockSelectionSignals( self, state ):
         """
         Sets the state for the seleciton finished signal.  When it \
@@ -540,6 +682,17 @@ class XNodeScene(QGraphicsScene):
         
         self._layers = []
         self._cache.clear()
+        self._simplifiedPixmaps.clear()
+        self._nodeIndex.clear()
+        self._nodeIndexCells.clear()
+        self._nodeIndexDirty.clear()
+        self._nodeIndexOrder.clear()
+        
+        if self._batchDepth:
+            self._batchItems = []
+            self._batchChanged = True
+            if self._nodeNames is not None:
+                self._nodeNames.clear()
         
         super(XNodeScene, self).clear()
     
@@ -568,6 +721,15 @@ class XNodeScene(QGraphicsScene):
         
         return con
     
+    def connectionDetailZoomAmount(self):
+        """
+        Returns the zoom amount below which connections will be drawn as \
+        simple straight lines without arrows or text.
+        
+        :return     <int>
+        """
+        return self._connectionDetailZoomAmount
+    
     def connections(self, hotspot=None):
         """
         Returns a list of all the connection instances that are in this scene.
@@ -757,6 +919,49 @@ class XNodeScene(QGraphicsScene):
         if ( not self.signalsBlocked() ):
             self.viewModeChanged.emit()
     
+    def endBatch(self, notify=True):
+        """
+        Restores the state suspended by beginBatch.  When the outermost \
+        batch ends, the modifiedStateChanged signal is emitted if the batch \
+        changed the scene and the itemsAdded signal is emitted once for all \
+        the items that were added.
+        
+        :param      notify | <bool>
+        
+        :return     [<QGraphicsItem>, ..] | items added during the batch
+        """
+        self._batchDepth -= 1
+        if self._batchDepth > 0:
+            return []
+        
+        blocked, loading, index_method, modified = self._batchState
+        items = self._batchItems
+        changed = bool(items) or self._batchChanged or \
+                  modified != self.isModified()
+        
+        self._batchState = None
+        self._batchItems = []
+        self._batchChanged = False
+        self._nodeNames = None
+        
+        self.setItemIndexMethod(index_method)
+        self.setLoading(loading)
+        self.blockSignals(blocked)
+        
+        if self._mainView:
+            self._mainView.setUpdatesEnabled(True)
+        
+        self.updateLevelOfDetail()
+        self.updateIsolated()
+        self.invalidate()
+        
+        if notify and changed:
+            self.emitModifiedStateChanged()
+            if items and not self.signalsBlocked():
+                self.itemsAdded.emit()
+        
+        return items
+    
     def findItems( self, cls ):
         """
         Looks up the items in the scene that inherit from the inputed class.
@@ -880,6 +1085,26 @@ class XNodeScene(QGraphicsScene):
         """
         return self._viewMode
     
+    def invalidateNodeIndex(self, node):
+        """
+        Marks the inputed node as needing to be re-indexed before the next \
+        spatial query.  This is called automatically when a node moves or \
+        is resized.
+        
+        :param      node | <XNode>
+        """
+        if node in self._nodeIndexOrder:
+            self._nodeIndexDirty.add(node)
+    
+    def isBatchEditing(self):
+        """
+        Returns whether or not a batch edit is currently active for this \
+        scene.
+        
+        :return     <bool>
+        """
+        return self._batchDepth > 0
+    
     def isConnecting( self ):
         """
         Returns whether or not there is an active connection \
@@ -980,6 +1205,92 @@ class XNodeScene(QGraphicsScene):
         """
         return self._layers[:]
     
+    def loadSnapshot(self, filename, classes=None):
+        """
+        Loads the nodes, layers and connections from the inputed snapshot \
+        file into this scene, replacing its current contents.  The items \
+        are created within a batch edit, and connections are restored by \
+        looking up their nodes from the snapshot's index, so large graphs \
+        can be loaded in a single pass.
+        
+        :sa         saveSnapshot
+        
+        :param      filename | <str>
+                    classes  | {<str> name: <type>, ..} || None
+        
+        :return     [<XNode> || <XNodeConnection>, ..] | loaded items
+        """
+        classes = dict(classes or {})
+        
+        with open(filename, 'r') as f:
+            header = json.loads(f.readline())
+            if header.get('format') != 'XNodeScene':
+                raise ValueError('%s is not a node scene snapshot' % filename)
+            
+            records = [json.loads(line) for line in f if line.strip()]
+        
+        self.beginBatch()
+        
+        try:
+            self.clear()
+            
+            # restore the layers
+            layers = []
+            for data in header.get('layers', []):
+                cls = classes.get(data.get('class'), self.defaultLayerClass())
+                layer = cls(self)
+                layer.restoreSnapshotData(data)
+                layers.append(layer)
+            
+            for layer, data in zip(layers, header.get('layers', [])):
+                if data.get('parent') is not None:
+                    layer._parent = layers[data['parent']]
+                    layers[data['parent']]._children.append(layer)
+            
+            self._layers = layers
+            current = header.get('currentLayer')
+            if current is not None:
+                self._currentLayer = layers[current]
+            
+            # restore the nodes and connections
+            nodes = []
+            items = []
+            
+            for data in records:
+                if data.get('layer') is not None:
+                    layer = layers[data['layer']]
+                else:
+                    layer = None
+                
+                if data['type'] == 'node':
+                    cls = classes.get(data.get('class'),
+                                      self.defaultNodeClass())
+                    item = cls(self)
+                    item.setLayer(layer)
+                    item.restoreSnapshotData(data)
+                    nodes.append(item)
+                else:
+                    cls = classes.get(data.get('class'),
+                                      self.defaultConnectionClass())
+                    item = cls(self)
+                    item.setLayer(layer)
+                    
+                    if data.get('output') is not None:
+                        item.setOutputNode(nodes[data['output']])
+                    if data.get('input') is not None:
+                        item.setInputNode(nodes[data['input']])
+                    
+                    item.restoreSnapshotData(data)
+                
+                self.addItem(item)
+                items.append(item)
+        
+        finally:
+            self.endBatch()
+        
+        self.setModified(False)
+        return items
+    
     def mainView( self ):
         """
         Return the main view that is linked to this scene.
@@ -996,6 +1307,16 @@ class XNodeScene(QGraphicsScene):
         """
         return self._maxZoomAmount
     
+    def maxAnimatedNodeCount(self):
+        """
+        Returns the maximum number of nodes that will be animated when \
+        laying out the scene.  Layouts affecting more nodes than this will \
+        move the nodes instantly.
+        
+        :return     <int>
+        """
+        return self._maxAnimatedNodeCount
+    
     def minZoomAmount( self ):
         """
         Returns the minimum amount that a user can zoom into to.
@@ -1104,18 +1425,54 @@ class XNodeScene(QGraphicsScene):
         """
         return self.findItems(XNode)
     
+    def nodeDetailZoomAmount(self):
+        """
+        Returns the zoom amount below which nodes will be drawn as simplified \
+        boxes without their titles, icons, hotspots or highlight shadows.
+        
+        :return     <int>
+        """
+        return self._nodeDetailZoomAmount
+    
     def nodeAt( self, point ):
         """
         Returns the node at the inputed positions.
         
         :return     <XNode>
         """
-        items = self.items(point)
-        for item in items:
-            if ( isinstance(item, XNode) ):
-                return item
+        nodes = self.nodesAt(point)
+        if nodes:
+            return nodes[0]
         return None
     
+    def nodesAt(self, point):
+        """
+        Returns the visible nodes at the inputed scene position, topmost \
+        first.  This looks up candidates from the scene's node index, so \
+        only nodes are tested rather than every item at the point.
+        
+        :param      point | <QPointF>
+        
+        :return     [<XNode>, ..]
+        """
+        if self._nodeIndexDirty:
+            self._updateNodeIndex()
+        
+        size = float(self.NodeIndexCellSize)
+        cell = (int(math.floor(point.x() / size)),
+                int(math.floor(point.y() / size)))
+        
+        output = []
+        for node in self._nodeIndex.get(cell, ()):
+            if not node.isVisibleTo(None):
+                continue
+            if node.contains(node.mapFromScene(point)):
+                output.append(node)
+        
+        order = self._nodeIndexOrder
+        output.sort(key=lambda x: (x.zValue(), order.get(x, 0)), reverse=True)
+        return output
+    
     def palette(self):
         """
         Returns the palette coloring for this instance.
@@ -1215,6 +1572,16 @@ class XNodeScene(QGraphicsScene):
         except KeyError:
             pass
         
+        if isinstance(item, XNode):
+            self._unindexNode(item)
+            self._nodeIndexDirty.discard(item)
+            self._nodeIndexOrder.pop(item, None)
+            if self._nodeNames is not None:
+                self._nodeNames.discard(item.objectName())
+        
+        if self._batchDepth:
+            self._batchChanged = True
+        
         # mark the scene as modified
         self.setModified(True)
         super(XNodeScene, self).removeItem(item)
@@ -1277,6 +1644,67 @@ class XNodeScene(QGraphicsScene):
         self.emitSelectionFinished()
         return results
     
+    def saveSnapshot(self, filename):
+        """
+        Saves the layers, nodes and connections for this scene to the \
+        inputed filename.  The snapshot is stored as JSON lines - a header \
+        line describing the layers followed by one line per node and \
+        connection, with connections referencing their nodes by index.
+        
+        :sa         loadSnapshot
+        
+        :param      filename | <str>
+        
+        :return     <int> | number of items saved
+        """
+        layers = self.layers()
+        layer_index = dict((layer, i) for i, layer in enumerate(layers))
+        
+        layer_data = []
+        for layer in layers:
+            data = layer.snapshotData()
+            data['class'] = type(layer).__name__
+            data['parent'] = layer_index.get(layer.parent())
+            layer_data.append(data)
+        
+        header = {'format': 'XNodeScene',
+                  'version': 1,
+                  'layers': layer_data,
+                  'currentLayer': layer_index.get(self.currentLayer())}
+        
+        nodes = []
+        connections = []
+        for item in self.items():
+            if isinstance(item, XNode):
+                nodes.append(item)
+            elif isinstance(item, XNodeConnection) and \
+                 item != self._activeConnection:
+                connections.append(item)
+        
+        node_index = dict((node, i) for i, node in enumerate(nodes))
+        dump = lambda x: json.dumps(x, separators=(',', ':'))
+        
+        with open(filename, 'w') as f:
+            f.write(dump(header) + '\n')
+            
+            for node in nodes:
+                data = node.snapshotData()
+                data['type'] = 'node'
+                data['class'] = type(node).__name__
+                data['layer'] = layer_index.get(node.layer())
+                f.write(dump(data) + '\n')
+            
+            for con in connections:
+                data = con.snapshotData()
+                data['type'] = 'connection'
+                data['class'] = type(con).__name__
+                data['layer'] = layer_index.get(con.layer())
+                data['output'] = node_index.get(con.outputNode())
+                data['input'] = node_index.get(con.inputNode())
+                f.write(dump(data) + '\n')
+        
+        return len(nodes) + len(connections)
+    
     def selectAll( self ):
         """
         Selects all the items in the scene.
@@ -1379,6 +1807,18 @@ class XNodeScene(QGraphicsScene):
         palette = self.palette()
         palette.setColor(palette.GridCenterline, QColor(color))
     
+    def setConnectionDetailZoomAmount(self, amount):
+        """
+        Sets the zoom amount below which connections will be drawn as \
+        simple straight lines.  Setting this to 0 will always draw the full \
+        connection.
+        
+        :param      amount | <int>
+        """
+        self._connectionDetailZoomAmount = amount
+        self.updateLevelOfDetail()
+        self.update()
+    
     def setCurrentLayer(self, layer):
         """
         Sets the current layer for this scene to the inputed layer.
@@ -1513,6 +1953,15 @@ class XNodeScene(QGraphicsScene):
         self.updateIsolated(force = True)
         self.update()
     
+    def setMaxAnimatedNodeCount(self, count):
+        """
+        Sets the maximum number of nodes that will be animated when laying \
+        out the scene.  Default is 500.
+        
+        :param      count | <int>
+        """
+        self._maxAnimatedNodeCount = count
+    
     def setMaxZoomAmount( self, amount ):
         """
         Sets the maximum amount that a user can zoom into to.  Default is 100.
@@ -1535,6 +1984,18 @@ class XNodeScene(QGraphicsScene):
         if view:
             view.minZoomAmountChanged.emit(amount)
     
+    def setNodeDetailZoomAmount(self, amount):
+        """
+        Sets the zoom amount below which nodes will be drawn as simplified \
+        boxes.  Setting this to 0 will always draw the full node.
+        
+        :param      amount | <int>
+        """
+        self._nodeDetailZoomAmount = amount
+        self._simplifiedPixmaps.clear()
+        self.updateLevelOfDetail()
+        self.update()
+    
     def setPalette(self, palette):
         """
         Sets the palette for this instance to the inputed palette.
@@ -1542,6 +2003,7 @@ class XNodeScene(QGraphicsScene):
         :param      palette | <XNodePalette>
         """
         self._palette = XNodePalette(palette)
+        self._simplifiedPixmaps.clear()
     
     def setSceneRect(self, *args):
         """
@@ -1596,6 +2058,7 @@ class XNodeScene(QGraphicsScene):
         # assign the new transform to all of the views
         view = self.mainView()
         view.setTransform(QTransform.fromScale(scale, scale))
+        self.updateLevelOfDetail()
         
         # emit the value changed signal for the scene
         if not (self.signalsBlocked() or view.signalsBlocked()):
@@ -1610,6 +2073,32 @@ class XNodeScene(QGraphicsScene):
         """
         return self._showGrid
     
+    def simplifiedPixmap(self, node):
+        """
+        Returns the cached pixmap used to draw the inputed node when it is \
+        below the node detail threshold.  Pixmaps are shared between all \
+        nodes with the same style, size and coloring, and are rendered at \
+        the threshold's scale so they are never drawn magnified.
+        
+        :param      node | <XNode>
+        
+        :return     <QPixmap>
+        """
+        key = node.simplifiedCacheKey()
+        try:
+            return self._simplifiedPixmaps[key]
+        except KeyError:
+            pass
+        
+        # keep the cache from growing unbounded with one-off styles
+        if len(self._simplifiedPixmaps) > 512:
+            self._simplifiedPixmaps.clear()
+        
+        scale = min(self.nodeDetailZoomAmount(), 100) / 100.0
+        pixmap = node.renderSimplified(scale)
+        self._simplifiedPixmaps[key] = pixmap
+        return pixmap
+    
     def startConnection( self, point, cls=None, output=True ):
         """
         Starts creating a new connection from the given output point.  \
@@ -1644,10 +2133,14 @@ class XNodeScene(QGraphicsScene):
         
         :param      name    <str>
         """
-        nodenames   = []
-        for node in self.items():
-            if ( isinstance(node, XNode) ):
-                nodenames.append( node.objectName() )
+        # use the name index while bulk loading
+        if self._nodeNames is not None:
+            nodenames = self._nodeNames
+        else:
+            nodenames = set()
+            for node in self.items():
+                if ( isinstance(node, XNode) ):
+                    nodenames.add( node.objectName() )
         
         basename    = nativestring(name)
         index       = 1
@@ -1688,6 +2181,20 @@ class XNodeScene(QGraphicsScene):
         for node in self.nodes():
             node.setIsolateHidden(not node in isolated_nodes)
     
+    def updateLevelOfDetail(self):
+        """
+        Syncs the level of detail information for all the nodes and \
+        connections in the scene with the current zoom amount.  This is \
+        called automatically when the zoom amount changes.
+        """
+        if not self._mainView:
+            return
+        
+        zoom = self.zoomAmount()
+        for item in self.items():
+            if isinstance(item, (XNode, XNodeConnection)):
+                item.syncLevelOfDetail(zoom)
+    
     def visibleItemsBoundingRect(self):
         """
         Returns the bounding rect for the visible items in the scene.
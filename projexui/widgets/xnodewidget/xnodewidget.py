@@ -309,6 +309,7 @@ class XNodeWidget(QGraphicsView):
                 self.scene().setSceneRect(scene_rect)
             
             self.fitInView(rect, Qt.KeepAspectRatio)
+            self.scene().updateLevelOfDetail()
         
         if not self.signalsBlocked():
             self.zoomAmountChanged.emit(self.zoomAmount())
@@ -15,7 +15,12 @@ __license__         = 'LGPL'
 __maintainer__      = 'Projex Software'
 __email__           = 'team@projexsoftware.com'
 
+import collections
 import logging
+import threading
+import time
+
+from projex.enum import enum
 from xqt import QtCore
 
 class XLoggingDispatch(QtCore.QObject):
@@ -27,10 +32,14 @@ class XLoggingDispatch(QtCore.QObject):
     infoLogged = QtCore.Signal(str)
     warningLogged = QtCore.Signal(str)
     recordLogged = QtCore.Signal(logging.LogRecord)
+    recordsLogged = QtCore.Signal(list)
 
 #----------------------------------------------------------------------
 
 class XLoggingHandler(logging.Handler):
+    BackPressure = enum('DropOldest', 'DropNewest', 'Block')
+    LevelCacheSize = 1024
+    
     def __init__(self, parent):
         logging.Handler.__init__(self)
         
@@ -39,13 +48,82 @@ class XLoggingHandler(logging.Handler):
         self._formatter = logging.Formatter()
         self._formatter._fmt = '[%(levelname)s] %(name)s: %(message)s'
         
+        # define the batching properties
+        self._batched = False
+        self._buffer = collections.deque()
+        self._bufferSize = 10000
+        self._backPressure = XLoggingHandler.BackPressure.DropOldest
+        self._blockTimeout = 1.0
+        self._drained = threading.Condition(self.lock)
+        self._droppedCount = 0
+        self._overflowCount = 0
+        
+        # define the logger level and duplicate record tracking
+        self._loggerLevels = {}
+        self._levelTrie = {}
+        self._levelCache = {}
+        self._recentRecords = collections.deque()
+        self._recentIds = set()
+        self._recentSize = 10
+        
+        # the flush timer lives in the dispatch's thread, so records that
+        # are logged from worker threads never post events to the gui
+        self._timer = QtCore.QTimer(self._dispatch)
+        self._timer.setInterval(50)
+        
         # create connections
         self._dispatch.destroyed.connect(self.close)
-
+        self._timer.timeout.connect(self.flushBatch)
+    
+    def backPressure(self):
+        """
+        Returns the policy used when the batch buffer is full.
+        
+        :return     <XLoggingHandler.BackPressure>
+        """
+        return self._backPressure
+    
+    def batchInterval(self):
+        """
+        Returns the interval in milliseconds between batch flushes.
+        
+        :return     <int>
+        """
+        return self._timer.interval()
+    
+    def blockTimeout(self):
+        """
+        Returns the number of seconds a logging thread will wait for the \
+        buffer to drain when using the Block policy before dropping the \
+        record.
+        
+        :return     <float>
+        """
+        return self._blockTimeout
+    
+    def bufferSize(self):
+        """
+        Returns the maximum number of records that will be buffered between \
+        batch flushes.
+        
+        :return     <int>
+        """
+        return self._bufferSize
+    
     def close(self):
         """
-        Closes down this handler.
+        Closes down this handler.  Buffered records are only dispatched \
+        when closing from the dispatch's thread.
         """
+        if self._dispatch is not None:
+            try:
+                if self.isDispatchThread():
+                    self.flushBatch()
+                    self._timer.stop()
+            except RuntimeError:
+                # the dispatch has already been deleted
+                pass
+        
         self._dispatch = None
         
         super(XLoggingHandler, self).close()
@@ -57,11 +135,21 @@ class XLoggingHandler(logging.Handler):
         :return     <projexui.xlogginghandler.XLoggingDispatch>
         """
         return self._dispatch
-
+    
+    def droppedCount(self):
+        """
+        Returns the number of records that have been discarded because the \
+        batch buffer was full.
+        
+        :return     <int>
+        """
+        return self._droppedCount
+    
     def emit(self, record):
         """
         Emits the signal for this record through the dispatch
-        element.
+        element.  When batching, the record is buffered until the next
+        flush instead.
         
         :param      record | <logging.LogRecord>
         """
@@ -71,6 +159,22 @@ class XLoggingHandler(logging.Handler):
         
         msg = self.format(record)
         
+        if self._batched:
+            self.enqueue(record, msg)
+        else:
+            self.emitRecord(record, msg)
+    
+    def emitRecord(self, record, msg):
+        """
+        Emits the per record signals through the dispatch element.
+        
+        :param      record | <logging.LogRecord>
+                    msg    | <str>
+        """
+        disp = self.dispatch()
+        if disp is None:
+            return
+        
         # emit the dispatch signals
         disp.recordLogged.emit(record)
         disp.messageLogged.emit(record.levelno, msg)
@@ -85,7 +189,78 @@ class XLoggingHandler(logging.Handler):
             disp.errorLogged.emit(msg)
         elif record.levelno == logging.CRITICAL:
             disp.criticalLogged.emit(msg)
-
+    
+    def enqueue(self, record, msg):
+        """
+        Adds the inputed record to the batch buffer, applying the back \
+        pressure policy when the buffer is full.  This method is safe to \
+        call from any thread.
+        
+        :param      record | <logging.LogRecord>
+                    msg    | <str>
+        """
+        buff = self._buffer
+        
+        self.acquire()
+        try:
+            if len(buff) >= self._bufferSize:
+                self._overflowCount += 1
+                policy = self._backPressure
+                
+                if policy == XLoggingHandler.BackPressure.Block:
+                    # flushing in place avoids deadlocking the gui thread
+                    if self.isDispatchThread():
+                        self.flushBatch()
+                    else:
+                        # waiting releases the lock for the flush
+                        deadline = time.time() + self._blockTimeout
+                        while len(buff) >= self._bufferSize:
+                            remaining = deadline - time.time()
+                            if remaining <= 0:
+                                break
+                            self._drained.wait(remaining)
+                    
+                    if len(buff) >= self._bufferSize:
+                        self._droppedCount += 1
+                        return
+                
+                elif policy == XLoggingHandler.BackPressure.DropNewest:
+                    self._droppedCount += 1
+                    return
+                
+                elif buff:
+                    buff.popleft()
+                    self._droppedCount += 1
+            
+            buff.append((record, msg))
+        finally:
+            self.release()
+    
+    def flushBatch(self):
+        """
+        Emits all of the buffered records through the dispatch element as \
+        a single recordsLogged batch, followed by the per record signals. \
+        This should be called from the dispatch's thread.
+        """
+        disp = self.dispatch()
+        if disp is None:
+            return
+        
+        self.acquire()
+        try:
+            batch = list(self._buffer)
+            self._buffer.clear()
+            self._drained.notify_all()
+        finally:
+            self.release()
+        
+        if not batch:
+            return
+        
+        disp.recordsLogged.emit([record for record, msg in batch])
+        for record, msg in batch:
+            self.emitRecord(record, msg)
+    
     def format(self, record):
         """
         Formats the inputed log record to the return string.
@@ -102,6 +277,139 @@ class XLoggingHandler(logging.Handler):
         """
         return self._formatter._fmt
     
+    def isBatched(self):
+        """
+        Returns whether or not records are buffered and dispatched in \
+        batches from the dispatch's thread.
+        
+        :return     <bool>
+        """
+        return self._batched
+    
+    def isDispatchThread(self):
+        """
+        Returns whether or not the current thread is the thread that the \
+        dispatch element lives in.
+        
+        :return     <bool>
+        """
+        disp = self.dispatch()
+        if disp is None:
+            return False
+        return QtCore.QThread.currentThread() == disp.thread()
+    
+    def loggerLevel(self, logger):
+        """
+        Returns the level for the inputed logger.  If the logger has not \
+        been given a level directly, then the level for its closest dotted \
+        parent will be used.
+        
+        :param      logger | <str>
+        
+        :return     <int>
+        """
+        try:
+            return self._levelCache[logger]
+        except KeyError:
+            pass
+        
+        lvl = self._loggerLevels.get(logger)
+        if lvl is None:
+            lvl = logging.NOTSET
+            node = self._levelTrie
+            for part in logger.split('.'):
+                try:
+                    node = node[part]
+                except KeyError:
+                    break
+                lvl = node.get(None, lvl)
+        
+        cache = self._levelCache
+        if len(cache) >= XLoggingHandler.LevelCacheSize:
+            cache.clear()
+        cache[logger] = lvl
+        return lvl
+    
+    def loggerLevels(self):
+        """
+        Returns the logger levels for this handler.
+        
+        :return     {<str> logger: <int> level, ..}
+        """
+        return self._loggerLevels
+    
+    def overflowCount(self):
+        """
+        Returns the number of times a record was logged while the batch \
+        buffer was full.
+        
+        :return     <int>
+        """
+        return self._overflowCount
+    
+    def resetCounters(self):
+        """
+        Resets the dropped and overflow counters for this handler.
+        """
+        self.acquire()
+        try:
+            self._droppedCount = 0
+            self._overflowCount = 0
+        finally:
+            self.release()
+    
+    def setBackPressure(self, policy):
+        """
+        Sets the policy used when the batch buffer is full.  DropOldest \
+        discards the oldest buffered record, DropNewest discards the \
+        incoming record and Block waits up to the block timeout for the \
+        buffer to drain.
+        
+        :param      policy | <XLoggingHandler.BackPressure>
+        """
+        self._backPressure = policy
+    
+    def setBatched(self, state):
+        """
+        Sets whether or not records are buffered and dispatched in batches. \
+        This should be called from the dispatch's thread.
+        
+        :param      state | <bool>
+        """
+        self._batched = state
+        
+        if state:
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.flushBatch()
+    
+    def setBatchInterval(self, msecs):
+        """
+        Sets the interval in milliseconds between batch flushes.
+        
+        :param      msecs | <int>
+        """
+        self._timer.setInterval(msecs)
+    
+    def setBlockTimeout(self, seconds):
+        """
+        Sets the number of seconds a logging thread will wait for the \
+        buffer to drain when using the Block policy.
+        
+        :param      seconds | <float>
+        """
+        self._blockTimeout = seconds
+    
+    def setBufferSize(self, size):
+        """
+        Sets the maximum number of records that will be buffered between \
+        batch flushes.
+        
+        :param      size | <int>
+        """
+        self._bufferSize = max(1, size)
+    
     def setFormatText(self, text):
         """
         Sets the format string to be used with this handler.
@@ -109,4 +417,60 @@ class XLoggingHandler(logging.Handler):
         :param      text | <str>
         """
         self._formatter._fmt = text
+    
+    def setLoggerLevel(self, logger, level):
+        """
+        Sets the level to log the inputed logger at.
+        
+        :param      logger | <str>
+                    level  | <int>
+        """
+        if logger == 'root':
+            _log = logging.getLogger()
+        else:
+            _log = logging.getLogger(logger)
+        
+        _log.setLevel(level)
+        
+        if level == logging.NOTSET:
+            self._loggerLevels.pop(logger, None)
+        else:
+            self._loggerLevels[logger] = level
+        
+        # rebuild the lookup trie for the dotted logger names
+        trie = {}
+        for key, lvl in self._loggerLevels.items():
+            node = trie
+            for part in key.split('.'):
+                node = node.setdefault(part, {})
+            node[None] = lvl
+        
+        self._levelTrie = trie
+        self._levelCache = {}
+    
+    def trackRecord(self, record):
+        """
+        Tracks the inputed record as processed, returning False if it has \
+        already been tracked.  Only the most recent records are remembered.
+        
+        :param      record | <logging.LogRecord>
+        
+        :return     <bool> | whether or not the record is new
+        """
+        key = id(record)
+        
+        self.acquire()
+        try:
+            if key in self._recentIds:
+                return False
+            
+            # hold a reference so the id cannot be reused while it is tracked
+            self._recentRecords.append(record)
+            self._recentIds.add(key)
+            if len(self._recentRecords) > self._recentSize:
+                self._recentIds.discard(id(self._recentRecords.popleft()))
+        finally:
+            self.release()
+        
+        return True
 